@@ -1,5 +1,5 @@
 """API routers package."""
 
-from . import auth, reports
+from . import auth, metrics, reports
 
-__all__ = ["auth", "reports"]
+__all__ = ["auth", "metrics", "reports"]
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from backend.api.reports import parser
+from backend.core.parse_cache import get_parse_cache
+from backend.core.services.report_builder import aggregate_cache
+from backend.core.session_sweeper import get_session_sweeper
+from backend.core.sessions import get_session_store, session_lookups
+from backend.core.workers import get_worker_pool
+
+router = APIRouter()
+
+
+@router.get("")
+async def read_metrics() -> JSONResponse:
+    return JSONResponse(
+        {
+            "workers": get_worker_pool().snapshot(),
+            "parse_cache": get_parse_cache().stats(),
+            "parser": parser.stats.snapshot(),
+            "report_aggregates": aggregate_cache.stats(),
+            "sessions": {
+                **get_session_store().stats(),
+                "lookups": session_lookups.snapshot(),
+                "sweeper": get_session_sweeper().snapshot(),
+            },
+        }
+    )
@@ -1,20 +1,37 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import os
 from datetime import date
 from io import BytesIO
-from typing import Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, TypeVar, Union
 
-from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
-from backend.core.models import CurrentReportOptions
+from backend.core.jobs import STATUS_RUNNING, get_job_store
+from backend.core.models import CurrentReportOptions, ParsedWorkbook, ReportSessionPayload, StudentLabel
+from backend.core.parse_cache import get_parse_cache, parse_cache_key
 from backend.core.parsing.quarter_parser import QuarterReportParser
-from backend.core.sessions import create_session_id, delete_session, get_session, store_session
-from backend.core.services.report_builder import build_session_payload
+from backend.core.progress import ProgressCallback
+from backend.core.sessions import (
+    SessionTooLarge,
+    adelete_session,
+    aget_session_parts,
+    astore_session,
+    create_session_id,
+)
+from backend.core.services.report_builder import aggregate_cache, build_session_payload, warning_page
 from backend.core.services import pdf_renderer, xlsx_renderer
+from backend.core.uploads import SpooledUpload, UploadError, UploadReceiver
+from backend.core.workers import WorkerPoolSaturated, get_worker_pool, worker_pool_kind
 
 router = APIRouter()
-parser = QuarterReportParser()
+logger = logging.getLogger(__name__)
+T = TypeVar("T")
+_background_tasks: Set[asyncio.Task] = set()
 
 
 def _to_bool(value, default=True):
@@ -25,39 +42,188 @@ def _to_bool(value, default=True):
     return str(value).strip().lower() in {"1", "true", "yes", "on"}
 
 
-@router.post("/current/upload")
-async def upload_report(
-    request: Request,
-    file: UploadFile = File(...),
-    date_from: str = Form(...),
-    date_to: str = Form(...),
-    weak_threshold: float = Form(2.5),
-    show_weak_subjects: Optional[bool] = Form(True),
-    subject_sort: str = Form("alpha"),
-    show_guides: Optional[bool] = Form(False),
-) -> JSONResponse:
-    if not file.filename or not file.filename.lower().endswith(".xlsx"):
-        raise HTTPException(status_code=400, detail="Требуется файл XLSX")
-    content = await file.read()
-    if len(content) > 10 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="Файл слишком большой")
+def _parser_workers() -> int:
+    # Every process of a process worker pool imports this module and gets its
+    # own parser; the pool already runs WORKER_POOL_SIZE parses side by side,
+    # so section pools there would only oversubscribe the CPUs. With threads
+    # all parses share the one section pool of the parser below.
+    if worker_pool_kind() == "process":
+        return 1
+    return min(int(os.getenv("PARSER_WORKERS", "1")), os.cpu_count() or 1)
+
+
+parser = QuarterReportParser(read_only=_to_bool(os.getenv("PARSER_READ_ONLY"), True), workers=_parser_workers())
+
+
+def _parse_and_build(
+    source: Optional[Union[bytes, str]],
+    options: CurrentReportOptions,
+    session_id: str,
+    progress: Optional[ProgressCallback] = None,
+    cached: Optional[ParsedWorkbook] = None,
+) -> ReportSessionPayload:
+    workbook = cached if cached is not None else parser.parse_workbook(source, progress)
+    return build_session_payload(workbook, options, session_id=session_id, progress=progress)
+
+
+async def _lookup_parsed(upload: SpooledUpload) -> Optional[ParsedWorkbook]:
+    return await run_in_threadpool(get_parse_cache().get, parse_cache_key(upload.sha256))
+
+
+async def _remember_parsed(upload_sha256: str, payload: ReportSessionPayload) -> None:
+    await run_in_threadpool(get_parse_cache().set, parse_cache_key(upload_sha256), payload.workbook)
+
+
+def _render_export(
+    renderer: Callable[[List[StudentLabel], CurrentReportOptions, BytesIO], None],
+    labels: List[StudentLabel],
+    options: CurrentReportOptions,
+) -> bytes:
+    # Returns bytes rather than filling a caller's buffer so that it also works
+    # with a process pool.
+    buffer = BytesIO()
+    renderer(labels, options, buffer)
+    return buffer.getvalue()
 
+
+def _submit(fn: Callable[..., T], *args: Any, on_start: Optional[Callable[[], None]] = None) -> Awaitable[T]:
     try:
-        options = CurrentReportOptions(
-            date_from=date.fromisoformat(date_from),
-            date_to=date.fromisoformat(date_to),
-            weak_threshold=float(weak_threshold),
-            show_weak_subjects=_to_bool(show_weak_subjects, True),
-            subject_sort=subject_sort,
-            show_guides=_to_bool(show_guides, False),
+        return get_worker_pool().submit(fn, *args, on_start=on_start)
+    except WorkerPoolSaturated as exc:
+        raise HTTPException(
+            status_code=503,
+            detail="Сервер перегружен, повторите попытку позже",
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
+
+
+async def _offload(fn: Callable[..., T], *args: Any) -> T:
+    return await _submit(fn, *args)
+
+
+def _start_upload_job(
+    upload: SpooledUpload, options: CurrentReportOptions, cached: Optional[ParsedWorkbook] = None
+) -> str:
+    """Queue parsing of ``upload`` and return the job id; the job closes the upload."""
+    jobs = get_job_store()
+    job = jobs.create()
+    # Progress callbacks cannot cross a process boundary; with a process pool
+    # the job only reports that it is running and when it is done.
+    progress = jobs.progress_callback(job.job_id) if get_worker_pool().kind == "thread" else None
+    source = upload.source() if cached is None else None
+    # the job stays queued until a worker is free for it
+    try:
+        pending = _submit(
+            _parse_and_build,
+            source,
+            options,
+            create_session_id(),
+            progress,
+            cached,
+            on_start=lambda: jobs.update(job.job_id, status=STATUS_RUNNING),
         )
+    except HTTPException as exc:
+        jobs.fail(job.job_id, str(exc.detail))
+        raise
+    task = asyncio.create_task(_complete_upload_job(job.job_id, upload, pending, cache_miss=cached is None))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return job.job_id
+
+
+async def _complete_upload_job(
+    job_id: str, upload: SpooledUpload, pending: Awaitable[ReportSessionPayload], cache_miss: bool = True
+) -> None:
+    jobs = get_job_store()
+    try:
+        payload = await pending
     except ValueError as exc:
+        await run_in_threadpool(jobs.fail, job_id, str(exc))
+        return
+    except Exception:
+        logger.exception("Upload job %s failed", job_id)
+        await run_in_threadpool(jobs.fail, job_id, "Не удалось обработать файл")
+        return
+    finally:
+        upload.close()
+    if cache_miss:
+        await _remember_parsed(upload.sha256, payload)
+    try:
+        session_token = await astore_session(payload)
+    except SessionTooLarge as exc:
+        await run_in_threadpool(jobs.fail, job_id, str(exc))
+        return
+    await run_in_threadpool(jobs.finish, job_id, session_token)
+
+
+async def _store(payload: ReportSessionPayload) -> str:
+    try:
+        return await astore_session(payload)
+    except SessionTooLarge as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+
+
+def _options_fields(options: CurrentReportOptions) -> Dict[str, str]:
+    return {
+        "date_from": options.date_from.isoformat(),
+        "date_to": options.date_to.isoformat(),
+        "weak_threshold": str(options.weak_threshold),
+        "show_weak_subjects": str(options.show_weak_subjects),
+        "subject_sort": options.subject_sort,
+        "show_guides": str(options.show_guides),
+    }
+
+
+def _parse_options(fields: Dict[str, str]) -> CurrentReportOptions:
+    try:
+        return CurrentReportOptions(
+            date_from=date.fromisoformat(fields["date_from"]),
+            date_to=date.fromisoformat(fields["date_to"]),
+            weak_threshold=float(fields.get("weak_threshold") or 2.5),
+            show_weak_subjects=_to_bool(fields.get("show_weak_subjects"), True),
+            subject_sort=fields.get("subject_sort") or "alpha",
+            show_guides=_to_bool(fields.get("show_guides"), False),
+        )
+    except (KeyError, ValueError) as exc:
         raise HTTPException(status_code=400, detail="Некорректные параметры периода") from exc
 
-    workbook = parser.parse_workbook(content)
-    session_id = create_session_id()
-    payload = build_session_payload(workbook, options, session_id=session_id)
-    session_id = store_session(payload)
+
+@router.post("/current/upload")
+async def upload_report(request: Request) -> JSONResponse:
+    """Accept ``multipart/form-data`` with ``file`` and the report options.
+
+    The body is streamed into a spooled temp file and rejected as soon as it
+    exceeds the size limit, so oversized uploads are never buffered in full.
+    Form fields: ``date_from``, ``date_to``, ``weak_threshold``,
+    ``show_weak_subjects``, ``subject_sort``, ``show_guides``, ``async_job``.
+    """
+    receiver = UploadReceiver()
+    try:
+        upload = await receiver.receive(request)
+    except UploadError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    try:
+        if not upload.filename.lower().endswith(".xlsx"):
+            raise HTTPException(status_code=400, detail="Требуется файл XLSX")
+        options = _parse_options(receiver.fields)
+        cached = await _lookup_parsed(upload)
+        if _to_bool(receiver.fields.get("async_job"), False):
+            job_id = _start_upload_job(upload, options, cached)
+            upload = None
+            return JSONResponse(
+                {"job_id": job_id, "status_url": f"/reports/current/jobs/{job_id}"},
+                status_code=202,
+            )
+        session_id = create_session_id()
+        source = upload.source() if cached is None else None
+        payload = await _offload(_parse_and_build, source, options, session_id, None, cached)
+        if cached is None:
+            await _remember_parsed(upload.sha256, payload)
+    finally:
+        if upload is not None:
+            upload.close()
+    session_id = await _store(payload)
 
     preview = payload.preview.dict()
     preview["session_id"] = session_id
@@ -69,24 +235,73 @@ async def upload_report(
     return JSONResponse({"session_token": session_id, "preview": preview})
 
 
+@router.post("/current/options")
+async def update_options(request: Request, session: str) -> JSONResponse:
+    """Rebuild labels and preview of ``session`` for new report options.
+
+    Accepts the same option fields as the upload (form-encoded); omitted
+    fields keep their current values. The stored workbook is reused, so no
+    re-upload or re-parse is needed.
+    """
+    parts = await aget_session_parts(session, "workbook", "options", purpose="options")
+    if not parts:
+        raise HTTPException(status_code=404, detail="Сессия не найдена или истекла")
+    form = await request.form()
+    fields = _options_fields(parts["options"])
+    fields.update({name: value for name, value in form.items() if isinstance(value, str) and value != ""})
+    options = _parse_options(fields)
+
+    payload = await _offload(build_session_payload, parts["workbook"], options, session)
+    await _store(payload)
+    return JSONResponse({"session_token": session, "preview": payload.preview.dict()})
+
+
+@router.get("/current/jobs/{job_id}")
+async def get_upload_job(job_id: str) -> JSONResponse:
+    # jobs started by other workers are read from the shared session backend
+    job = await run_in_threadpool(get_job_store().get, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Задача не найдена или истекла")
+    return JSONResponse(job.to_dict())
+
+
 @router.get("/current/preview")
 async def get_preview(session: str) -> JSONResponse:
-    payload = get_session(session)
-    if not payload:
+    parts = await aget_session_parts(session, "preview", purpose="preview")
+    if not parts:
         raise HTTPException(status_code=404, detail="Сессия не найдена или истекла")
-    return JSONResponse(payload.preview.dict())
+    return JSONResponse(parts["preview"].dict())
+
+
+@router.get("/current/warnings")
+async def get_warnings(
+    session: str,
+    student: int,
+    code: Optional[str] = None,
+    offset: int = 0,
+    limit: int = 100,
+) -> JSONResponse:
+    """Messages behind the preview's per-code warning counts, rendered on request."""
+    parts = await aget_session_parts(session, "workbook", purpose="warnings")
+    if not parts:
+        raise HTTPException(status_code=404, detail="Сессия не найдена или истекла")
+    workbook = parts["workbook"]
+    if not 0 <= student < len(workbook.students):
+        raise HTTPException(status_code=404, detail="Ученик не найден")
+    if offset < 0 or not 1 <= limit <= 1000:
+        raise HTTPException(status_code=400, detail="Некорректные параметры страницы")
+    return JSONResponse(warning_page(workbook, student, code, offset, limit))
 
 
 @router.get("/current/export/pdf")
 async def export_pdf(session: str) -> StreamingResponse:
-    payload = get_session(session)
-    if not payload:
+    parts = await aget_session_parts(session, "labels", "options", purpose="export")
+    if not parts:
         raise HTTPException(status_code=404, detail="Сессия не найдена")
-    buffer = BytesIO()
-    pdf_renderer.render_labels_pdf(payload.labels, payload.options, buffer)
-    buffer.seek(0)
-    klass = payload.labels[0].klass if payload.labels else "klass"
-    filename = f"uspevaemost_{klass}_{payload.options.date_from.isoformat()}_{payload.options.date_to.isoformat()}.pdf"
+    labels, options = parts["labels"], parts["options"]
+    buffer = BytesIO(await _offload(_render_export, pdf_renderer.render_labels_pdf, labels, options))
+    klass = labels[0].klass if labels else "klass"
+    filename = f"uspevaemost_{klass}_{options.date_from.isoformat()}_{options.date_to.isoformat()}.pdf"
     return StreamingResponse(
         buffer,
         media_type="application/pdf",
@@ -96,14 +311,15 @@ async def export_pdf(session: str) -> StreamingResponse:
 
 @router.get("/current/export/xlsx")
 async def export_xlsx(session: str) -> StreamingResponse:
-    payload = get_session(session)
-    if not payload:
+    parts = await aget_session_parts(session, "labels", "options", purpose="export")
+    if not parts:
         raise HTTPException(status_code=404, detail="Сессия не найдена")
-    buffer = BytesIO()
-    xlsx_renderer.render_labels_workbook(payload.labels, payload.options, buffer)
-    buffer.seek(0)
-    klass = payload.labels[0].klass if payload.labels else "klass"
-    filename = f"uspevaemost_{klass}_{payload.options.date_from.isoformat()}_{payload.options.date_to.isoformat()}.xlsx"
+    labels, options = parts["labels"], parts["options"]
+    buffer = BytesIO(
+        await _offload(_render_export, xlsx_renderer.render_labels_workbook, labels, options)
+    )
+    klass = labels[0].klass if labels else "klass"
+    filename = f"uspevaemost_{klass}_{options.date_from.isoformat()}_{options.date_to.isoformat()}.xlsx"
     return StreamingResponse(
         buffer,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
@@ -113,5 +329,6 @@ async def export_xlsx(session: str) -> StreamingResponse:
 
 @router.post("/current/discard")
 async def discard_session(session: str) -> JSONResponse:
-    delete_session(session)
+    await adelete_session(session)
+    aggregate_cache.discard(session)
     return JSONResponse({"status": "ok"})
@@ -1,5 +1,6 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,14 +9,28 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from backend.api import auth as auth_api  # type: ignore
+from backend.api import metrics as metrics_api  # type: ignore
 from backend.api import reports as reports_api  # type: ignore
 from backend.core.security import get_current_user_optional
+from backend.core.session_sweeper import get_session_sweeper
+from backend.core.workers import shutdown_worker_pool
 
 BASE_DIR = Path(__file__).resolve().parent
 
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 
-app = FastAPI(title="Quarter Labels", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    sweeper = get_session_sweeper()
+    sweeper.start()
+    yield
+    await sweeper.stop()
+    shutdown_worker_pool()
+    reports_api.parser.shutdown()
+
+
+app = FastAPI(title="Quarter Labels", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,6 +45,7 @@ app.add_middleware(
 
 app.include_router(auth_api.router, prefix="/auth", tags=["auth"])
 app.include_router(reports_api.router, prefix="/reports", tags=["reports"])
+app.include_router(metrics_api.router, prefix="/metrics", tags=["metrics"])
 
 static_dir = BASE_DIR / "static"
 if static_dir.exists():
@@ -0,0 +1,4 @@
+"""Standalone performance benchmarks for the backend.
+
+Run from the repository root, e.g. ``python -m backend.benchmarks.bench_parse_modes``.
+"""
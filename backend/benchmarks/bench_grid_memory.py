@@ -0,0 +1,79 @@
+"""Memory footprint of the sparse parser grid versus the old dense matrix.
+
+The dense variant reproduces the previous ``_expand_grid``: a
+``(max_row + 1) x (max_col + 1)`` list of lists with merged values copied into
+every covered cell::
+
+    python -m backend.benchmarks.bench_grid_memory --students 500 2000 --months 9
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from io import BytesIO
+from typing import Callable, Dict, List, Optional
+
+from openpyxl import load_workbook
+
+from backend.benchmarks.synthetic import build_report_workbook
+from backend.core.parsing.grid import SparseGrid
+from backend.core.parsing.quarter_parser import QuarterReportParser
+
+
+def build_dense_grid(parser: QuarterReportParser, values, merged_ranges) -> List[List[Optional[str]]]:
+    max_row = len(values)
+    max_col = max((len(row) for row in values), default=0)
+    for _, _, merge_max_row, merge_max_col in merged_ranges:
+        max_row = max(max_row, merge_max_row)
+        max_col = max(max_col, merge_max_col)
+    grid: List[List[Optional[str]]] = [[None for _ in range(max_col + 1)] for _ in range(max_row + 1)]
+    for row_index, row_values in enumerate(values, start=1):
+        for col, value in enumerate(row_values, start=1):
+            grid[row_index][col] = parser._normalize_value(value)
+    for min_row, min_col, merge_max_row, merge_max_col in merged_ranges:
+        value = grid[min_row][min_col]
+        for row in range(min_row, merge_max_row + 1):
+            for col in range(min_col, merge_max_col + 1):
+                grid[row][col] = value
+    return grid
+
+
+def measure(factory: Callable[[], object]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    grid = factory()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del grid
+    return current / 2**20
+
+
+def main() -> None:
+    cli = argparse.ArgumentParser(description=__doc__)
+    cli.add_argument("--students", type=int, nargs="+", default=[500, 2000])
+    cli.add_argument("--months", type=int, default=9)
+    args = cli.parse_args()
+
+    parser = QuarterReportParser(read_only=True)
+    print(f"{'students':>9} {'rows':>7} {'cols':>5} {'dense MB':>9} {'sparse MB':>10}")
+    for students in args.students:
+        data = build_report_workbook(students, months=args.months)
+        wb = load_workbook(BytesIO(data), read_only=True)
+        sheet = wb.worksheets[0]
+        values = list(parser._iter_sheet_rows(sheet))
+        merged = parser._merged_ranges(sheet, BytesIO(data))
+        wb.close()
+
+        def build_sparse() -> SparseGrid:
+            interned: Dict[str, str] = {}
+            return SparseGrid([parser._normalize_row(row, interned) for row in values], merged)
+
+        sparse_mb = measure(build_sparse)
+        dense_mb = measure(lambda: build_dense_grid(parser, values, merged))
+        grid = build_sparse()
+        print(f"{students:>9} {grid.max_row:>7} {grid.max_col:>5} {dense_mb:>9.1f} {sparse_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Cost of rebuilding labels when only display options change.
+
+Compares a full :func:`build_current_report` run with a rebuild that reuses
+cached window aggregates (threshold, sort order and visibility changed)::
+
+    python -m backend.benchmarks.bench_label_rebuild --students 2000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date
+from typing import Callable
+
+from backend.benchmarks.synthetic import build_report_workbook
+from backend.core.models import CurrentReportOptions
+from backend.core.parsing.quarter_parser import QuarterReportParser
+from backend.core.services.report_builder import aggregate_cache, build_current_report
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    cli = argparse.ArgumentParser(description=__doc__)
+    cli.add_argument("--students", type=int, default=2000)
+    cli.add_argument("--months", type=int, default=2)
+    cli.add_argument("--repeat", type=int, default=5)
+    args = cli.parse_args()
+
+    workbook = QuarterReportParser(read_only=True).parse_workbook(
+        build_report_workbook(args.students, months=args.months)
+    )
+    entries = sum(len(section.entries) for section in workbook.students)
+    base = CurrentReportOptions(date_from=date(2025, 9, 1), date_to=date(2026, 5, 31))
+    changed = base.copy(update={"weak_threshold": 4.0, "subject_sort": "avg_desc", "show_weak_subjects": False})
+
+    full = best_of(args.repeat, lambda: build_current_report(workbook, changed))
+    build_current_report(workbook, base, cache_key="bench")
+    projected = best_of(args.repeat, lambda: build_current_report(workbook, changed, cache_key="bench"))
+    aggregate_cache.discard("bench")
+
+    print(f"students: {len(workbook.students)}, entries: {entries}")
+    print(f"full rebuild:      {full * 1000:8.1f} ms")
+    print(f"display options:   {projected * 1000:8.1f} ms  ({full / projected:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Scaling of the section phase of the parser with the number of worker processes.
+
+The grid of a synthetic export is built once; the sections are then parsed
+serially and with ``--workers`` processes. The parser keeps its process pool
+between parses, so the pool is started by an untimed first parse; shipping
+the grid windows and merging the results is included. Every parallel result
+is checked against the serial one::
+
+    python -m backend.benchmarks.bench_parallel_sections --students 5000 --workers 1 2 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from io import BytesIO
+
+from openpyxl import load_workbook
+
+from backend.benchmarks.synthetic import build_report_workbook
+from backend.core.models import ParsedWorkbook
+from backend.core.parsing.grid import SparseGrid
+from backend.core.parsing.quarter_parser import QuarterReportParser
+
+
+def load_grid(data: bytes) -> SparseGrid:
+    workbook = load_workbook(BytesIO(data), read_only=True, data_only=True)
+    try:
+        return QuarterReportParser(read_only=True)._load_target_grid(workbook.worksheets, source=BytesIO(data))
+    finally:
+        workbook.close()
+
+
+def parse_sections(parser: QuarterReportParser, grid: SparseGrid) -> str:
+    if parser.workers == 1:
+        result = parser._parse_rows(grid, 1, len(grid), (None, None), {})
+    else:
+        result = parser._parse_rows_parallel(grid, None, parser._count_sections(grid))
+    return ParsedWorkbook(
+        school_name=result.school_name,
+        academic_year_start=result.academic_year_start,
+        academic_year_end=result.academic_year_end,
+        students=result.students,
+        global_warnings=result.global_warnings,
+    ).json()
+
+
+def main() -> None:
+    cli = argparse.ArgumentParser(description=__doc__)
+    cli.add_argument("--students", type=int, default=5000)
+    cli.add_argument("--months", type=int, default=3)
+    cli.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = cli.parse_args()
+
+    grid = load_grid(build_report_workbook(args.students, months=args.months, fill_ratio=0.5))
+    print(f"students: {args.students}, grid rows: {len(grid) - 1}, CPUs: {os.cpu_count()}")
+    started = time.perf_counter()
+    expected = parse_sections(QuarterReportParser(), grid)
+    serial = time.perf_counter() - started
+
+    print(f"{'workers':>7}{'sections, s':>13}{'speedup':>9}")
+    for workers in args.workers:
+        if workers == 1:
+            print(f"{workers:>7}{serial:>13.2f}{1:>8.2f}x")
+            continue
+        parser = QuarterReportParser(workers=workers)
+        try:
+            parse_sections(parser, grid)
+            started = time.perf_counter()
+            output = parse_sections(parser, grid)
+            elapsed = time.perf_counter() - started
+        finally:
+            parser.shutdown()
+        assert output == expected, f"{workers} workers: output differs from the serial parse"
+        print(f"{workers:>7}{elapsed:>13.2f}{serial / elapsed:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare peak RSS and wall time of the full and read-only parse modes.
+
+Each (size, mode) pair runs in a fresh interpreter so that peak RSS is not
+polluted by earlier runs::
+
+    python -m backend.benchmarks.bench_parse_modes --students 1000 5000 20000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _run_child(path: str, read_only: bool) -> dict:
+    from backend.core.parsing.quarter_parser import QuarterReportParser
+
+    data = Path(path).read_bytes()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    workbook = QuarterReportParser(read_only=read_only).parse_workbook(data)
+    elapsed = time.perf_counter() - started
+    return {
+        "seconds": elapsed,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "baseline_rss_mb": rss_before / 1024,
+        "students": len(workbook.students),
+    }
+
+
+def main() -> None:
+    cli = argparse.ArgumentParser(description=__doc__)
+    cli.add_argument("--students", type=int, nargs="+", default=[1000, 5000, 20000])
+    cli.add_argument("--months", type=int, default=2)
+    cli.add_argument("--child", nargs=2, metavar=("PATH", "MODE"), help=argparse.SUPPRESS)
+    args = cli.parse_args()
+
+    if args.child:
+        path, mode = args.child
+        print(json.dumps(_run_child(path, mode == "read_only")))
+        return
+
+    from backend.benchmarks.synthetic import build_report_workbook
+
+    print(f"{'students':>9} {'size MB':>8} {'mode':>10} {'seconds':>9} {'peak RSS MB':>12}")
+    for students in args.students:
+        data = build_report_workbook(students, months=args.months)
+        with tempfile.NamedTemporaryFile(suffix=".xlsx") as handle:
+            handle.write(data)
+            handle.flush()
+            for mode in ("full", "read_only"):
+                output = subprocess.run(
+                    [sys.executable, "-m", "backend.benchmarks.bench_parse_modes", "--child", handle.name, mode],
+                    cwd=ROOT,
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                result = json.loads(output)
+                print(
+                    f"{students:>9} {len(data) / 2**20:>8.1f} {mode:>10} "
+                    f"{result['seconds']:>9.2f} {result['peak_rss_mb']:>12.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Period filtering: linear scan over all entries versus the per-subject date index.
+
+A full-year workbook is sliced into windows of growing length; the indexed
+path should scale with the entries in range, the scan with the total::
+
+    python -m backend.benchmarks.bench_period_filter --students 500
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date, timedelta
+from typing import Callable, List
+
+from backend.benchmarks.synthetic import build_report_workbook
+from backend.core.models import ParsedWorkbook
+from backend.core.parsing.quarter_parser import QuarterReportParser
+
+YEAR_START = date(2025, 9, 1)
+WINDOWS = [("day", 1), ("week", 7), ("month", 30), ("quarter", 60), ("year", 273)]
+
+
+def scan(workbook: ParsedWorkbook, date_from: date, date_to: date) -> int:
+    touched = 0
+    for section in workbook.students:
+        for entry in section.entries:
+            if entry.date < date_from or entry.date > date_to:
+                continue
+            if entry.subject.strip():
+                touched += len(entry.grades)
+    return touched
+
+
+def indexed(workbook: ParsedWorkbook, date_from: date, date_to: date) -> int:
+    touched = 0
+    for section in workbook.students:
+        entries = section.entries
+        for _, positions in section.date_index().select(date_from, date_to):
+            for position in positions:
+                touched += len(entries[position].grades)
+    return touched
+
+
+def best_of(repeat: int, fn: Callable[[], int]) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    cli = argparse.ArgumentParser(description=__doc__)
+    cli.add_argument("--students", type=int, default=500)
+    cli.add_argument("--repeat", type=int, default=5)
+    args = cli.parse_args()
+
+    workbook = QuarterReportParser(read_only=True).parse_workbook(
+        build_report_workbook(args.students, months=9)
+    )
+    total = sum(len(section.entries) for section in workbook.students)
+    print(f"students: {len(workbook.students)}, entries: {total}")
+    print(f"{'window':>8} {'in range':>9} {'scan ms':>8} {'index ms':>9}")
+    for name, days in WINDOWS:
+        date_from = YEAR_START + timedelta(days=30)
+        date_to = date_from + timedelta(days=days - 1)
+        in_range = sum(
+            len(positions)
+            for section in workbook.students
+            for _, positions in section.date_index().select(date_from, date_to)
+        )
+        assert scan(workbook, date_from, date_to) == indexed(workbook, date_from, date_to)
+        scan_ms = best_of(args.repeat, lambda: scan(workbook, date_from, date_to)) * 1000
+        index_ms = best_of(args.repeat, lambda: indexed(workbook, date_from, date_to)) * 1000
+        print(f"{name:>8} {in_range:>9} {scan_ms:>8.1f} {index_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Encode/decode time and size of a report session: JSON vs the binary codec.
+
+Builds a realistic session payload (compact workbook, preview and labels) and
+compares ``payload.json()`` / ``parse_raw`` with :mod:`backend.core.session_codec`
+in every available compression mode::
+
+    python -m backend.benchmarks.bench_session_codec --students 500 2000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date
+from typing import Callable, List
+
+from backend.benchmarks.synthetic import build_report_workbook
+from backend.core.models import CurrentReportOptions, ReportSessionPayload
+from backend.core.parsing.quarter_parser import QuarterReportParser
+from backend.core.services.report_builder import build_session_payload
+from backend.core.session_codec import decode_payload, encode_payload, zstandard
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    cli = argparse.ArgumentParser(description=__doc__)
+    cli.add_argument("--students", type=int, nargs="+", default=[500, 2000])
+    cli.add_argument("--months", type=int, default=2)
+    cli.add_argument("--repeat", type=int, default=3)
+    args = cli.parse_args()
+
+    modes: List[str] = ["none", "zlib"] + (["zstd"] if zstandard is not None else [])
+    options = CurrentReportOptions(date_from=date(2025, 9, 1), date_to=date(2026, 5, 31))
+    for students in args.students:
+        workbook = QuarterReportParser(read_only=True).parse_workbook(
+            build_report_workbook(students, months=args.months)
+        )
+        payload = build_session_payload(workbook, options, "bench")
+        entries = sum(len(section.entries) for section in workbook.students)
+        print(f"students: {students}, entries: {entries}")
+        print(f"{'format':<12}{'size, KB':>12}{'encode, ms':>14}{'decode, ms':>14}")
+
+        data = payload.json()
+        encode = best_of(args.repeat, payload.json)
+        decode = best_of(args.repeat, lambda: ReportSessionPayload.parse_raw(data))
+        print(f"{'json':<12}{len(data) / 1024:>12.0f}{encode * 1000:>14.1f}{decode * 1000:>14.1f}")
+        for mode in modes:
+            blob = encode_payload(payload, mode)
+            encode = best_of(args.repeat, lambda: encode_payload(payload, mode))
+            decode = best_of(args.repeat, lambda: decode_payload(blob))
+            print(f"{mode:<12}{len(blob) / 1024:>12.0f}{encode * 1000:>14.1f}{decode * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Load test of the Redis session store through its asyncio client.
+
+Every simulated user stores one report session, polls its preview a few
+times and reads the labels for an export, all concurrently. Runs against a
+real Redis given ``--url`` and against fakeredis otherwise::
+
+    python -m backend.benchmarks.bench_session_store --users 200 --students 200
+    python -m backend.benchmarks.bench_session_store --url redis://localhost:6379/0 --pool-size 32
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date
+from typing import Dict, List
+
+from backend.benchmarks.synthetic import build_report_workbook
+from backend.core.models import CurrentReportOptions, ReportSessionPayload
+from backend.core.parsing.quarter_parser import QuarterReportParser
+from backend.core.services.report_builder import build_session_payload
+from backend.core.sessions import RedisSessionStore
+
+
+def make_store(args: argparse.Namespace) -> RedisSessionStore:
+    if args.url:
+        return RedisSessionStore(args.url, ttl_seconds=300, pool_size=args.pool_size)
+    import fakeredis
+
+    server = fakeredis.FakeServer()
+    return RedisSessionStore(
+        None,
+        ttl_seconds=300,
+        client=fakeredis.FakeRedis(server=server),
+        async_client=fakeredis.aioredis.FakeRedis(server=server),
+    )
+
+
+async def user(
+    store: RedisSessionStore, index: int, payload: ReportSessionPayload, polls: int, latency: Dict[str, List[float]]
+) -> None:
+    key = f"bench-{index}"
+
+    async def timed(kind: str, operation) -> None:
+        started = time.perf_counter()
+        await operation
+        latency[kind].append(time.perf_counter() - started)
+
+    await timed("store", store.aset(key, payload))
+    for _ in range(polls):
+        await timed("preview", store.aget_parts(key, ("preview",)))
+    await timed("export", store.aget_parts(key, ("labels", "options")))
+    await store.adelete(key)
+
+
+def percentile(values: List[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+async def run(args: argparse.Namespace, payload: ReportSessionPayload) -> None:
+    store = make_store(args)
+    latency: Dict[str, List[float]] = {"store": [], "preview": [], "export": []}
+    started = time.perf_counter()
+    await asyncio.gather(*(user(store, index, payload, args.polls, latency) for index in range(args.users)))
+    elapsed = time.perf_counter() - started
+
+    operations = sum(len(values) for values in latency.values())
+    print(f"users: {args.users}, operations: {operations}, {operations / elapsed:.0f} ops/s")
+    print(f"{'operation':<10}{'p50, ms':>10}{'p95, ms':>10}{'max, ms':>10}")
+    for kind, values in latency.items():
+        print(
+            f"{kind:<10}{statistics.median(values) * 1000:>10.1f}"
+            f"{percentile(values, 0.95) * 1000:>10.1f}{max(values) * 1000:>10.1f}"
+        )
+
+
+def main() -> None:
+    cli = argparse.ArgumentParser(description=__doc__)
+    cli.add_argument("--url", help="Redis URL; fakeredis is used when omitted")
+    cli.add_argument("--users", type=int, default=100)
+    cli.add_argument("--polls", type=int, default=5)
+    cli.add_argument("--students", type=int, default=100)
+    cli.add_argument("--pool-size", type=int, default=16)
+    args = cli.parse_args()
+
+    workbook = QuarterReportParser(read_only=True).parse_workbook(build_report_workbook(args.students))
+    options = CurrentReportOptions(date_from=date(2025, 9, 1), date_to=date(2026, 5, 31))
+    asyncio.run(run(args, build_session_payload(workbook, options, "bench")))
+
+
+if __name__ == "__main__":
+    main()
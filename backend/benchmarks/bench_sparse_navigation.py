@@ -0,0 +1,91 @@
+"""Row navigation cost on sparse exports with long blank separator runs.
+
+Every section is followed by ``--blank-rows`` empty rows and has a whole
+year of day columns. The benchmark reports the full parse time and compares
+the previous navigation (scan forward for the next first-column value on
+every blank row, scan all columns for every legend candidate) with the
+per-row indexes of :class:`SparseGrid` on the same grid::
+
+    python -m backend.benchmarks.bench_sparse_navigation --students 200 --blank-rows 0 200 1000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from io import BytesIO
+from typing import Callable, Optional
+
+from openpyxl import load_workbook
+
+from backend.benchmarks.synthetic import build_report_workbook
+from backend.core.parsing.grid import SparseGrid
+from backend.core.parsing.quarter_parser import QuarterReportParser
+
+
+def timed(fn: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def load_grid(parser: QuarterReportParser, data: bytes) -> SparseGrid:
+    workbook = load_workbook(BytesIO(data), read_only=True, data_only=True)
+    try:
+        return parser._load_target_grid(workbook.worksheets, source=BytesIO(data))
+    finally:
+        workbook.close()
+
+
+def legacy_navigation(grid: SparseGrid) -> int:
+    """The scans the table loop used to do, applied to every row of the grid."""
+    max_row = len(grid) - 1
+    visited = 0
+    for row in range(1, max_row + 1):
+        if grid[row][1] and grid[row][2]:
+            visited += any(grid[row][col] for col in range(3, len(grid[row])))
+        if not grid[row][1]:
+            following: Optional[str] = None
+            for candidate in range(row + 1, max_row + 1):
+                if grid[candidate][1]:
+                    following = grid[candidate][1]
+                    break
+            visited += following is not None
+    return visited
+
+
+def indexed_navigation(grid: SparseGrid) -> int:
+    max_row = len(grid) - 1
+    visited = 0
+    row = 1
+    while row <= max_row:
+        if grid[row][1] and grid[row][2]:
+            visited += grid.nonempty_count(row) > 2
+        if not grid[row][1]:
+            following = grid.next_first_col_row(row + 1)
+            visited += following is not None
+            row = following or max_row + 1
+            continue
+        row += 1
+    return visited
+
+
+def main() -> None:
+    cli = argparse.ArgumentParser(description=__doc__)
+    cli.add_argument("--students", type=int, default=200)
+    cli.add_argument("--months", type=int, default=9)
+    cli.add_argument("--blank-rows", type=int, nargs="+", default=[0, 200, 1000])
+    args = cli.parse_args()
+
+    print(f"{'blank rows':>10}{'grid rows':>11}{'parse, s':>10}{'legacy scan, s':>16}{'indexed, s':>12}")
+    for blank_rows in args.blank_rows:
+        data = build_report_workbook(args.students, months=args.months, blank_rows=blank_rows)
+        parser = QuarterReportParser(read_only=True)
+        parse = timed(lambda: parser.parse_workbook(data))
+        grid = load_grid(parser, data)
+        legacy = timed(lambda: legacy_navigation(grid))
+        indexed = timed(lambda: indexed_navigation(grid))
+        print(f"{blank_rows:>10}{len(grid) - 1:>11}{parse:>10.2f}{legacy:>16.2f}{indexed:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Per-cell cost of grade cell tokenization, memoized versus uncached.
+
+Draws ``--cells`` cell texts with the value mix of the synthetic exports
+(plus a sprinkle of odd values producing warnings) and tokenizes all of them
+once with the uncached tokenizer and once through the ``tokenize_cell`` memo::
+
+    python -m backend.benchmarks.bench_tokenize --cells 500000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from backend.benchmarks.synthetic import CELL_VALUES
+from backend.core.parsing.quarter_parser import ATTENDANCE_DEFAULT, tokenize_cell
+
+ODD_VALUES = ("0", "7", "5-", "Б/5", "н", "2 2 2")
+
+
+def build_cells(count: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    # cells read from a sheet are distinct str objects, not shared literals
+    return ["".join(rng.choice(ODD_VALUES if rng.random() < 0.01 else CELL_VALUES)) for _ in range(count)]
+
+
+def per_cell_ns(cells: List[str], tokenize: Callable) -> float:
+    codes = frozenset(ATTENDANCE_DEFAULT)
+    started = time.perf_counter()
+    for cell in cells:
+        tokenize(cell, codes)
+    return (time.perf_counter() - started) / len(cells) * 1e9
+
+
+def main() -> None:
+    cli = argparse.ArgumentParser(description=__doc__)
+    cli.add_argument("--cells", type=int, default=500_000)
+    args = cli.parse_args()
+
+    cells = build_cells(args.cells)
+    uncached = per_cell_ns(cells, tokenize_cell.__wrapped__)
+    tokenize_cell.cache_clear()
+    cached = per_cell_ns(cells, tokenize_cell)
+    info = tokenize_cell.cache_info()
+    print(f"cells: {len(cells)}, distinct texts: {len(set(cells))}, cache hits: {info.hits}")
+    print(f"uncached: {uncached:8.0f} ns/cell")
+    print(f"memoized: {cached:8.0f} ns/cell  ({uncached / cached:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Per-entry aggregation loop versus the NumPy ``WorkbookFrame`` for many periods.
+
+The whole-school workbook is sliced into every month, both halves and the
+full year; both engines must return identical aggregates::
+
+    python -m backend.benchmarks.bench_vector_aggregation --students 2000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date
+from typing import List, Tuple
+
+from backend.benchmarks.synthetic import build_report_workbook
+from backend.core.parsing.quarter_parser import QuarterReportParser
+from backend.core.services.report_builder import aggregate_workbook
+from backend.core.services.vector_aggregation import WorkbookFrame
+
+
+def school_periods() -> List[Tuple[date, date]]:
+    months = [(2025, month) for month in range(9, 13)] + [(2026, month) for month in range(1, 6)]
+    periods = []
+    for year, month in months:
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+        periods.append((date(year, month, 1), date.fromordinal(date(next_year, next_month, 1).toordinal() - 1)))
+    periods += [(date(2025, 9, 1), date(2025, 12, 31)), (date(2026, 1, 1), date(2026, 5, 31))]
+    periods.append((date(2025, 9, 1), date(2026, 5, 31)))
+    return periods
+
+
+def main() -> None:
+    cli = argparse.ArgumentParser(description=__doc__)
+    cli.add_argument("--students", type=int, default=2000)
+    args = cli.parse_args()
+
+    workbook = QuarterReportParser(read_only=True).parse_workbook(build_report_workbook(args.students, months=9))
+    entries = sum(len(section.entries) for section in workbook.students)
+    periods = school_periods()
+
+    started = time.perf_counter()
+    looped = [aggregate_workbook(workbook, date_from, date_to) for date_from, date_to in periods]
+    loop_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    frame = WorkbookFrame(workbook)
+    frame_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    vectorized = [frame.aggregate(date_from, date_to) for date_from, date_to in periods]
+    vector_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for date_from, date_to in periods:
+        frame.pair_stats(date_from, date_to, weak_threshold=3.5)
+    stats_seconds = time.perf_counter() - started
+
+    assert looped == vectorized
+    print(f"students: {len(workbook.students)}, entries: {entries}, periods: {len(periods)}")
+    print(f"loop aggregate_workbook:   {loop_seconds * 1000:8.0f} ms")
+    print(f"WorkbookFrame build:       {frame_seconds * 1000:8.0f} ms")
+    print(f"WorkbookFrame.aggregate:   {vector_seconds * 1000:8.0f} ms")
+    print(f"WorkbookFrame.pair_stats:  {stats_seconds * 1000:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
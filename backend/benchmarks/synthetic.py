@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import random
+from io import BytesIO
+from typing import Sequence
+
+import xlsxwriter
+
+SUBJECTS = (
+    "Алгебра",
+    "Геометрия",
+    "Русский язык",
+    "Литература",
+    "История",
+    "Физика",
+    "Химия",
+    "Биология",
+    "Английский язык",
+    "Информатика",
+)
+MONTHS = (
+    ("Сентябрь", 30),
+    ("Октябрь", 31),
+    ("Ноябрь", 30),
+    ("Декабрь", 31),
+    ("Январь", 31),
+    ("Февраль", 28),
+    ("Март", 31),
+    ("Апрель", 30),
+    ("Май", 31),
+)
+CELL_VALUES = ("5", "4", "3", "2", "Н", "5/4", "Н 3", "4", "5")
+
+
+def build_report_workbook(
+    students: int,
+    subjects: Sequence[str] = SUBJECTS,
+    months: int = 2,
+    fill_ratio: float = 0.3,
+    blank_rows: int = 1,
+    seed: int = 42,
+) -> bytes:
+    """Build an export shaped like the school system's quarterly report.
+
+    Every student gets a header block, a ``Предмет`` row with merged month
+    names, a day row and one row per subject; ``months`` controls how many
+    day columns the sheet has (9 months is a whole academic year).
+    """
+    rng = random.Random(seed)
+    stream = BytesIO()
+    workbook = xlsxwriter.Workbook(stream, {"in_memory": True})
+    sheet = workbook.add_worksheet("Отчёт")
+
+    row = 0
+    sheet.write(row, 0, "Школа: МБОУ СОШ №1")
+    sheet.write(row + 1, 0, "Учебный год: 2025/2026")
+    sheet.write(row + 2, 0, "Период: с 01.09.2025 по 31.05.2026")
+    row += 3
+    for index in range(students):
+        sheet.write(row, 0, f"Ученик: Ученик{index:05d} Имя Отчество")
+        sheet.write(row + 1, 0, f"Класс: {5 + index % 7}{'АБВГ'[index % 4]}")
+        row += 2 + blank_rows
+        sheet.write(row, 0, "Предмет")
+        col = 1
+        for name, days in MONTHS[:months]:
+            if days > 1:
+                sheet.merge_range(row, col, row, col + days - 1, name)
+            else:
+                sheet.write(row, col, name)
+            for day in range(1, days + 1):
+                sheet.write_number(row + 1, col + day - 1, day)
+            col += days
+        row += 2
+        for subject in subjects:
+            sheet.write(row, 0, subject)
+            for cell_col in range(1, col):
+                if rng.random() < fill_ratio:
+                    sheet.write_string(row, cell_col, rng.choice(CELL_VALUES))
+            row += 1
+        row += blank_rows
+    sheet.write(row, 0, "Н")
+    sheet.write(row, 1, "Неуважительная причина")
+    sheet.write(row + 1, 0, "У")
+    sheet.write(row + 1, 1, "Уважительная причина")
+    workbook.close()
+    return stream.getvalue()
+
+
+__all__ = ["build_report_workbook", "SUBJECTS", "MONTHS"]
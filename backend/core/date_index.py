@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+
+
+class EntryDateIndex:
+    """Positions of a student's entries grouped by subject and sorted by date.
+
+    For every (stripped, non-empty) subject the index keeps a bisect-able
+    array of date ordinals and a parallel array of entry positions, so a period query costs two bisections per
+    subject plus the entries actually in range. The entries themselves are
+    not reordered and must not change once the index is built.
+    """
+
+    __slots__ = ("subjects", "ordinals", "positions")
+
+    def __init__(self, keys: Iterable[Tuple[str, int]]) -> None:
+        """Build the index from ``(subject, date ordinal)`` of every entry, in entry order."""
+        by_subject: Dict[str, List[Tuple[int, int]]] = {}
+        for position, (subject, ordinal) in enumerate(keys):
+            subject = subject.strip()
+            if not subject:
+                continue
+            by_subject.setdefault(subject, []).append((ordinal, position))
+
+        self.subjects: Tuple[str, ...] = tuple(by_subject)
+        self.ordinals: List["array[int]"] = []
+        self.positions: List["array[int]"] = []
+        for pairs in by_subject.values():
+            pairs.sort()
+            self.ordinals.append(array("l", [ordinal for ordinal, _ in pairs]))
+            self.positions.append(array("I", [position for _, position in pairs]))
+
+    def select(self, date_from: date, date_to: date) -> List[Tuple[str, List[int]]]:
+        """Entry positions per subject within ``[date_from, date_to]``.
+
+        Positions are ascending and subjects come in order of their first
+        entry in range, i.e. the order a linear scan over the entries would
+        produce.
+        """
+        low = date_from.toordinal()
+        high = date_to.toordinal()
+        selected: List[Tuple[str, List[int]]] = []
+        for subject, ordinals, positions in zip(self.subjects, self.ordinals, self.positions):
+            start = bisect_left(ordinals, low)
+            stop = bisect_right(ordinals, high, start)
+            if start < stop:
+                selected.append((subject, sorted(positions[start:stop])))
+        selected.sort(key=lambda item: item[1][0])
+        return selected
+
+    def __len__(self) -> int:
+        return sum(len(positions) for positions in self.positions)
+
+
+__all__ = ["EntryDateIndex"]
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Optional, Union
+
+from cachetools import TTLCache
+
+from backend.core.progress import PHASE_DONE, PHASE_QUEUED, ProgressCallback
+from backend.core.sessions import DiskSessionStore, RedisSessionStore, TieredSessionStore, get_session_store
+from backend.core.storage import private_directory
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+JOB_KEY_PREFIX = "job:"
+# Progress of a running job reaches the shared backend at most this often;
+# status and phase changes always do.
+PROGRESS_PUBLISH_SECONDS = 0.5
+
+_JOB_ID = re.compile(r"[0-9a-f]{32}")
+_JOB_SUFFIX = ".job"
+
+
+@dataclass
+class UploadJob:
+    job_id: str
+    status: str = STATUS_PENDING
+    phase: str = PHASE_QUEUED
+    done: int = 0
+    total: int = 0
+    session_token: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class SharedJobBackend(ABC):
+    """Where the process running a job publishes it, so that a status poll
+    landing on any other worker finds it too."""
+
+    @abstractmethod
+    def save(self, job: UploadJob) -> None:
+        ...
+
+    @abstractmethod
+    def load(self, job_id: str) -> Optional[UploadJob]:
+        ...
+
+    def sweep(self) -> int:
+        return 0
+
+
+def _job_from_json(data: Union[str, bytes]) -> Optional[UploadJob]:
+    try:
+        return UploadJob(**json.loads(data))
+    except (TypeError, ValueError):
+        return None
+
+
+class RedisJobBackend(SharedJobBackend):
+    """Jobs as JSON strings next to the Redis sessions, expiring with the same TTL."""
+
+    def __init__(self, client: Any, ttl_seconds: int) -> None:
+        self.client = client
+        self.ttl = ttl_seconds
+
+    def save(self, job: UploadJob) -> None:
+        self.client.set(f"{JOB_KEY_PREFIX}{job.job_id}", json.dumps(job.to_dict()), ex=self.ttl)
+
+    def load(self, job_id: str) -> Optional[UploadJob]:
+        data = self.client.get(f"{JOB_KEY_PREFIX}{job_id}")
+        return _job_from_json(data) if data else None
+
+
+class DiskJobBackend(SharedJobBackend):
+    """Jobs as JSON files in a private directory next to the disk sessions.
+
+    Files are written atomically; a job expires ``ttl_seconds`` after its
+    last write, judged by the file's mtime like the sessions.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: int, timer: Callable[[], float] = time.time) -> None:
+        self.directory = private_directory(directory)
+        self.ttl = ttl_seconds
+        self.timer = timer
+
+    def save(self, job: UploadJob) -> None:
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(job.to_dict(), handle)
+        os.replace(tmp_name, self.directory / f"{job.job_id}{_JOB_SUFFIX}")
+
+    def load(self, job_id: str) -> Optional[UploadJob]:
+        path = self.directory / f"{job_id}{_JOB_SUFFIX}"
+        try:
+            with path.open("rb") as handle:
+                if self.timer() - os.fstat(handle.fileno()).st_mtime > self.ttl:
+                    return None
+                return _job_from_json(handle.read())
+        except FileNotFoundError:
+            return None
+
+    def sweep(self) -> int:
+        removed = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(_JOB_SUFFIX):
+                continue
+            try:
+                if self.timer() - entry.stat().st_mtime > self.ttl:
+                    os.unlink(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+
+class _LocalJob:
+    __slots__ = ("job", "version", "published_version", "published_at")
+
+    def __init__(self, job: UploadJob) -> None:
+        self.job = job
+        self.version = 0
+        self.published_version = 0
+        self.published_at = 0.0
+
+
+class JobStore:
+    """Registry of background upload jobs.
+
+    Jobs run in the process that accepted the upload, which keeps them here.
+    Progress is written from worker threads, so every access goes through the
+    lock and readers get a copy of the job. With a ``shared`` backend every
+    change is also published there, so that status polls served by other
+    workers see the job. Status and phase changes are published at once and
+    bare progress at most every ``publish_interval`` seconds. Stale
+    snapshots never overwrite newer ones.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = 1800,
+        max_entries: int = 1024,
+        shared: Optional[SharedJobBackend] = None,
+        publish_interval: float = PROGRESS_PUBLISH_SECONDS,
+    ) -> None:
+        self.cache: TTLCache[str, _LocalJob] = TTLCache(maxsize=max_entries, ttl=ttl_seconds)
+        self.lock = threading.Lock()
+        self.shared = shared
+        self.publish_interval = publish_interval
+        self.publish_lock = threading.Lock()
+
+    def create(self) -> UploadJob:
+        job = UploadJob(job_id=uuid.uuid4().hex)
+        entry = _LocalJob(job)
+        with self.lock:
+            self.cache[job.job_id] = entry
+            entry.version += 1
+            snapshot = UploadJob(**job.to_dict())
+        self._publish(entry, snapshot, entry.version)
+        return UploadJob(**job.to_dict())
+
+    def get(self, job_id: str) -> Optional[UploadJob]:
+        if not _JOB_ID.fullmatch(job_id):
+            return None
+        with self.lock:
+            entry = self.cache.get(job_id)
+            if entry is not None:
+                return UploadJob(**entry.job.to_dict())
+        return self.shared.load(job_id) if self.shared is not None else None
+
+    def update(self, job_id: str, **changes: Any) -> None:
+        with self.lock:
+            entry = self.cache.get(job_id)
+            if entry is None:
+                return
+            job = entry.job
+            milestone = any(
+                name not in ("done", "total") and getattr(job, name) != value for name, value in changes.items()
+            )
+            for name, value in changes.items():
+                setattr(job, name, value)
+            job.updated_at = time.time()
+            entry.version += 1
+            version = entry.version
+            due = milestone or time.monotonic() - entry.published_at >= self.publish_interval
+            snapshot = UploadJob(**job.to_dict()) if due else None
+        if snapshot is not None:
+            self._publish(entry, snapshot, version)
+
+    def _publish(self, entry: _LocalJob, snapshot: UploadJob, version: int) -> None:
+        if self.shared is None:
+            return
+        with self.publish_lock:
+            if version <= entry.published_version:
+                return
+            try:
+                self.shared.save(snapshot)
+            except Exception:
+                # a poll served by this process still sees the job
+                logger.warning("Could not publish upload job %s", snapshot.job_id, exc_info=True)
+                return
+            entry.published_version = version
+            entry.published_at = time.monotonic()
+
+    def progress_callback(self, job_id: str) -> ProgressCallback:
+        def report(phase: str, done: int, total: int) -> None:
+            self.update(job_id, status=STATUS_RUNNING, phase=phase, done=done, total=total)
+
+        return report
+
+    def finish(self, job_id: str, session_token: str) -> None:
+        self.update(job_id, status=STATUS_DONE, phase=PHASE_DONE, session_token=session_token)
+
+    def fail(self, job_id: str, error: str) -> None:
+        self.update(job_id, status=STATUS_FAILED, error=error)
+
+    def sweep(self) -> int:
+        """Drop expired jobs; returns how many shared ones were removed."""
+        with self.lock:
+            self.cache.expire()
+        return self.shared.sweep() if self.shared is not None else 0
+
+
+_job_store: Optional[JobStore] = None
+
+
+def get_job_store() -> JobStore:
+    """Job store sharing jobs through the configured session backend, if it is shared."""
+    global _job_store
+    if _job_store is None:
+        store = get_session_store()
+        remote = store.remote if isinstance(store, TieredSessionStore) else store
+        shared: Optional[SharedJobBackend] = None
+        if isinstance(remote, RedisSessionStore):
+            shared = RedisJobBackend(remote.client, remote.ttl)
+        elif isinstance(remote, DiskSessionStore):
+            shared = DiskJobBackend(str(remote.directory / "jobs"), remote.ttl)
+        _job_store = JobStore(ttl_seconds=int(os.getenv("SESSION_TTL_MIN", "45")) * 60, shared=shared)
+    return _job_store
+
+
+__all__ = [
+    "UploadJob",
+    "JobStore",
+    "SharedJobBackend",
+    "RedisJobBackend",
+    "DiskJobBackend",
+    "get_job_store",
+    "STATUS_PENDING",
+    "STATUS_RUNNING",
+    "STATUS_DONE",
+    "STATUS_FAILED",
+]
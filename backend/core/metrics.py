@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict
+
+
+class TimingStats:
+    """Running count/total/max of durations in seconds."""
+
+    __slots__ = ("count", "total", "max", "_lock")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        seconds = max(seconds, 0.0)
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "count": self.count,
+                "total_seconds": round(self.total, 6),
+                "mean_seconds": round(self.total / self.count, 6) if self.count else 0.0,
+                "max_seconds": round(self.max, 6),
+            }
+
+
+__all__ = ["TimingStats"]
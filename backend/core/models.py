@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+from array import array
+from collections.abc import Sequence
 from datetime import date
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
 
 from pydantic import BaseModel, Field
 
+from backend.core.date_index import EntryDateIndex
+
 
 class ParsedEntry(BaseModel):
     student_fio_raw: str
@@ -19,15 +23,489 @@ class ParsedEntry(BaseModel):
     col: int
 
 
+class EntryTable(Sequence):
+    """Columnar storage for the parsed entries of one student.
+
+    Instead of one :class:`ParsedEntry` model per grade cell, every attribute
+    is a column: subjects and attendance codes are indices into small interned
+    tables, dates are ordinals, grades and attendance are packed arrays with
+    offsets (CSR layout). Student strings are stored once for the table.
+
+    The table is a read-only sequence of :class:`ParsedEntry`; items are built
+    on access, so ``section.entries[i]`` and iteration keep working. Hot paths
+    should read the columns (``grades_at``, ``attendance_at``, ``date_index``).
+
+    ``raw_text``, ``rows`` and ``cols`` are diagnostics only; :meth:`compact`
+    drops them (entries then report ``""`` and ``0``).
+    """
+
+    __slots__ = (
+        "student_fio_raw",
+        "student_fio_norm",
+        "klass",
+        "subjects",
+        "subject_idx",
+        "dates",
+        "grade_offsets",
+        "grades",
+        "codes",
+        "attendance_offsets",
+        "attendance",
+        "raw_text",
+        "rows",
+        "cols",
+        "_subject_lookup",
+        "_code_lookup",
+        "_date_index",
+    )
+
+    def __init__(self, student_fio_raw: str = "", student_fio_norm: str = "", klass: str = "") -> None:
+        self.student_fio_raw = student_fio_raw
+        self.student_fio_norm = student_fio_norm
+        self.klass = klass
+        self.subjects: List[str] = []
+        self.subject_idx = array("H")
+        self.dates = array("l")
+        self.grade_offsets = array("I", [0])
+        self.grades = array("h")
+        self.codes: List[str] = []
+        self.attendance_offsets = array("I", [0])
+        self.attendance = array("H")
+        self.raw_text: Optional[List[str]] = []
+        self.rows: Optional["array[int]"] = array("I")
+        self.cols: Optional["array[int]"] = array("I")
+        self._subject_lookup: Dict[str, int] = {}
+        self._code_lookup: Dict[str, int] = {}
+        self._date_index: Optional[EntryDateIndex] = None
+
+    def append(
+        self,
+        subject: str,
+        entry_date: date,
+        grades: Iterable[int],
+        attendance: Iterable[str],
+        raw_text: str,
+        row: int,
+        col: int,
+    ) -> None:
+        if not self.has_details:
+            raise ValueError("compact entry tables are read-only")
+        subject_index = self._subject_lookup.get(subject)
+        if subject_index is None:
+            subject_index = self._subject_lookup[subject] = len(self.subjects)
+            self.subjects.append(subject)
+        self.subject_idx.append(subject_index)
+        self.dates.append(entry_date.toordinal())
+        self.grades.extend(grades)
+        self.grade_offsets.append(len(self.grades))
+        for code in attendance:
+            code_index = self._code_lookup.get(code)
+            if code_index is None:
+                code_index = self._code_lookup[code] = len(self.codes)
+                self.codes.append(code)
+            self.attendance.append(code_index)
+        self.attendance_offsets.append(len(self.attendance))
+        self.raw_text.append(raw_text)
+        self.rows.append(row)
+        self.cols.append(col)
+        self._date_index = None
+
+    @property
+    def has_details(self) -> bool:
+        return self.raw_text is not None
+
+    def compact(self) -> "EntryTable":
+        """Read-only table without the diagnostic columns, sharing the remaining ones."""
+        table = EntryTable(self.student_fio_raw, self.student_fio_norm, self.klass)
+        for name in (
+            "subjects",
+            "subject_idx",
+            "dates",
+            "grade_offsets",
+            "grades",
+            "codes",
+            "attendance_offsets",
+            "attendance",
+            "_subject_lookup",
+            "_code_lookup",
+            "_date_index",
+        ):
+            setattr(table, name, getattr(self, name))
+        table.raw_text = table.rows = table.cols = None
+        return table
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Union["ParsedEntry", Dict[str, Any]]]) -> "EntryTable":
+        table = cls()
+        for position, entry in enumerate(entries):
+            if not isinstance(entry, ParsedEntry):
+                entry = ParsedEntry.parse_obj(entry)
+            if position == 0:
+                table.student_fio_raw = entry.student_fio_raw
+                table.student_fio_norm = entry.student_fio_norm
+                table.klass = entry.klass
+            table.append(
+                entry.subject, entry.date, entry.grades, entry.attendance, entry.raw_text, entry.row, entry.col
+            )
+        return table
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready columns; the inverse of :meth:`from_dict`."""
+        data = {
+            "student": [self.student_fio_raw, self.student_fio_norm, self.klass],
+            "subjects": self.subjects,
+            "subject_idx": self.subject_idx.tolist(),
+            "dates": self.dates.tolist(),
+            "grade_offsets": self.grade_offsets.tolist(),
+            "grades": self.grades.tolist(),
+            "codes": self.codes,
+            "attendance_offsets": self.attendance_offsets.tolist(),
+            "attendance": self.attendance.tolist(),
+        }
+        if self.has_details:
+            data.update(raw_text=self.raw_text, rows=self.rows.tolist(), cols=self.cols.tolist())
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EntryTable":
+        table = cls(*data["student"])
+        table.subjects = list(data["subjects"])
+        table.subject_idx = array("H", data["subject_idx"])
+        table.dates = array("l", data["dates"])
+        table.grade_offsets = array("I", data["grade_offsets"])
+        table.grades = array("h", data["grades"])
+        table.codes = list(data["codes"])
+        table.attendance_offsets = array("I", data["attendance_offsets"])
+        table.attendance = array("H", data["attendance"])
+        if "raw_text" in data:
+            table.raw_text = list(data["raw_text"])
+            table.rows = array("I", data["rows"])
+            table.cols = array("I", data["cols"])
+        else:
+            table.raw_text = table.rows = table.cols = None
+        table._subject_lookup = {subject: index for index, subject in enumerate(table.subjects)}
+        table._code_lookup = {code: index for index, code in enumerate(table.codes)}
+        lengths = {
+            len(table.subject_idx),
+            len(table.dates),
+            len(table.grade_offsets) - 1,
+            len(table.attendance_offsets) - 1,
+        }
+        if table.has_details:
+            lengths.update((len(table.raw_text), len(table.rows), len(table.cols)))
+        if len(lengths) != 1:
+            raise ValueError("inconsistent entry table columns")
+        return table
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value: Any) -> "EntryTable":
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, dict):
+            return cls.from_dict(value)
+        if isinstance(value, (list, tuple)):
+            return cls.from_entries(value)
+        raise TypeError("entry table, column dict or list of entries expected")
+
+    def subject_at(self, position: int) -> str:
+        return self.subjects[self.subject_idx[position]]
+
+    def date_at(self, position: int) -> date:
+        return date.fromordinal(self.dates[position])
+
+    def grades_at(self, position: int) -> "array[int]":
+        return self.grades[self.grade_offsets[position] : self.grade_offsets[position + 1]]
+
+    def attendance_at(self, position: int) -> List[str]:
+        codes = self.codes
+        start = self.attendance_offsets[position]
+        stop = self.attendance_offsets[position + 1]
+        return [codes[index] for index in self.attendance[start:stop]]
+
+    def date_index(self) -> EntryDateIndex:
+        """Index of the entries by subject and date, built on first use."""
+        if self._date_index is None:
+            subjects = self.subjects
+            self._date_index = EntryDateIndex(
+                (subjects[index], ordinal) for index, ordinal in zip(self.subject_idx, self.dates)
+            )
+        return self._date_index
+
+    def _entry(self, position: int) -> "ParsedEntry":
+        return ParsedEntry.construct(
+            student_fio_raw=self.student_fio_raw,
+            student_fio_norm=self.student_fio_norm,
+            klass=self.klass,
+            subject=self.subject_at(position),
+            date=self.date_at(position),
+            grades=self.grades_at(position).tolist(),
+            attendance=self.attendance_at(position),
+            raw_text=self.raw_text[position] if self.has_details else "",
+            row=self.rows[position] if self.has_details else 0,
+            col=self.cols[position] if self.has_details else 0,
+        )
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._entry(index) for index in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return self._entry(position)
+
+    def __iter__(self) -> Iterator["ParsedEntry"]:
+        for position in range(len(self)):
+            yield self._entry(position)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, EntryTable):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"EntryTable({len(self)} entries, {len(self.subjects)} subjects)"
+
+
+WARNING_UNKNOWN_TOKEN = "unknown_token"
+WARNING_INVALID_GRADE = "invalid_grade"
+WARNING_MULTIPLE_TOKENS = "multiple_tokens_in_cell"
+WARNING_DATE_OUT_OF_PERIOD = "date_out_of_period"
+WARNING_MISSING_SUBJECT_TABLE = "missing_subject_table"
+WARNING_UNKNOWN_MONTH = "unknown_month"
+WARNING_INVALID_DAY = "invalid_day"
+WARNING_UNRESOLVED_YEAR = "unresolved_year"
+WARNING_INVALID_DATE = "invalid_date"
+WARNING_TEXT = "text"  # free-form message kept from older sessions
+
+# How each warning code reads as text; fields: fio, subject, detail, row, col.
+WARNING_TEMPLATES: Dict[str, str] = {
+    WARNING_UNKNOWN_TOKEN: "[{fio}] {subject}: unknown_token {detail} (row={row}, col={col})",
+    WARNING_INVALID_GRADE: "[{fio}] {subject}: invalid_grade {detail} (row={row}, col={col})",
+    WARNING_MULTIPLE_TOKENS: "[{fio}] {subject}: multiple_tokens_in_cell (row={row}, col={col})",
+    WARNING_DATE_OUT_OF_PERIOD: "[{fio}] {subject}: date_out_of_period {detail}",
+    WARNING_MISSING_SUBJECT_TABLE: "Не найдена таблица предметов для ученика",
+    WARNING_UNKNOWN_MONTH: "Неизвестный месяц: {detail}",
+    WARNING_INVALID_DAY: "Некорректный день: {detail}",
+    WARNING_UNRESOLVED_YEAR: "Не удалось определить год для {detail}",
+    WARNING_INVALID_DATE: "Некорректная дата: {detail}",
+    WARNING_TEXT: "{detail}",
+}
+
+
+class WarningRecord(NamedTuple):
+    code: str
+    subject: Optional[str]
+    row: int
+    col: int
+    detail: str
+
+
+class WarningTable(Sequence):
+    """Columnar storage for the parse warnings of one student.
+
+    A warning is a record ``(code, subject, row, col, detail)``: codes,
+    subjects and details are indices into small interned tables, rows and
+    columns are packed arrays. Nothing is formatted while parsing; the table
+    is a read-only sequence of message strings rendered from
+    :data:`WARNING_TEMPLATES` on access, so ``list(section.warnings)`` reads
+    as before. Summaries should use :meth:`counts` and :meth:`record`.
+    """
+
+    __slots__ = (
+        "fio",
+        "codes",
+        "code_idx",
+        "subjects",
+        "subject_idx",
+        "rows",
+        "cols",
+        "details",
+        "detail_idx",
+        "_code_lookup",
+        "_subject_lookup",
+        "_detail_lookup",
+    )
+
+    def __init__(self, fio: str = "") -> None:
+        self.fio = fio
+        self.codes: List[str] = []
+        self.code_idx = array("B")
+        self.subjects: List[str] = []
+        self.subject_idx = array("h")  # -1: not tied to a subject
+        self.rows = array("I")
+        self.cols = array("I")
+        self.details: List[str] = []
+        self.detail_idx = array("I")
+        self._code_lookup: Dict[str, int] = {}
+        self._subject_lookup: Dict[str, int] = {}
+        self._detail_lookup: Dict[str, int] = {}
+
+    @staticmethod
+    def _intern(value: str, values: List[str], lookup: Dict[str, int]) -> int:
+        index = lookup.get(value)
+        if index is None:
+            index = lookup[value] = len(values)
+            values.append(value)
+        return index
+
+    def add(self, code: str, subject: Optional[str] = None, row: int = 0, col: int = 0, detail: str = "") -> None:
+        self.code_idx.append(self._intern(code, self.codes, self._code_lookup))
+        self.subject_idx.append(-1 if subject is None else self._intern(subject, self.subjects, self._subject_lookup))
+        self.rows.append(row)
+        self.cols.append(col)
+        self.detail_idx.append(self._intern(detail, self.details, self._detail_lookup))
+
+    def code_at(self, position: int) -> str:
+        return self.codes[self.code_idx[position]]
+
+    def record(self, position: int) -> WarningRecord:
+        subject_index = self.subject_idx[position]
+        return WarningRecord(
+            self.code_at(position),
+            self.subjects[subject_index] if subject_index >= 0 else None,
+            self.rows[position],
+            self.cols[position],
+            self.details[self.detail_idx[position]],
+        )
+
+    def render(self, position: int) -> str:
+        record = self.record(position)
+        return WARNING_TEMPLATES.get(record.code, "{detail}").format(
+            fio=self.fio,
+            subject=record.subject or "",
+            detail=record.detail,
+            row=record.row,
+            col=record.col,
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """Number of warnings per code, in order of first occurrence."""
+        per_index = [0] * len(self.codes)
+        for index in self.code_idx:
+            per_index[index] += 1
+        return {code: count for code, count in zip(self.codes, per_index) if count}
+
+    def positions(self, code: Optional[str] = None) -> List[int]:
+        if code is None:
+            return list(range(len(self)))
+        index = self._code_lookup.get(code)
+        if index is None:
+            return []
+        return [position for position, value in enumerate(self.code_idx) if value == index]
+
+    @classmethod
+    def from_messages(cls, messages: Iterable[str], fio: str = "") -> "WarningTable":
+        table = cls(fio)
+        for message in messages:
+            table.add(WARNING_TEXT, detail=message)
+        return table
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready columns; the inverse of :meth:`from_dict`."""
+        return {
+            "fio": self.fio,
+            "codes": self.codes,
+            "code_idx": self.code_idx.tolist(),
+            "subjects": self.subjects,
+            "subject_idx": self.subject_idx.tolist(),
+            "rows": self.rows.tolist(),
+            "cols": self.cols.tolist(),
+            "details": self.details,
+            "detail_idx": self.detail_idx.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WarningTable":
+        table = cls(data.get("fio", ""))
+        table.codes = list(data["codes"])
+        table.code_idx = array("B", data["code_idx"])
+        table.subjects = list(data["subjects"])
+        table.subject_idx = array("h", data["subject_idx"])
+        table.rows = array("I", data["rows"])
+        table.cols = array("I", data["cols"])
+        table.details = list(data["details"])
+        table.detail_idx = array("I", data["detail_idx"])
+        table.reindex()
+        lengths = {len(table.code_idx), len(table.subject_idx), len(table.rows), len(table.cols), len(table.detail_idx)}
+        if len(lengths) != 1:
+            raise ValueError("inconsistent warning table columns")
+        return table
+
+    def reindex(self) -> None:
+        """Rebuild the interning lookups after the columns were assigned directly."""
+        self._code_lookup = {code: index for index, code in enumerate(self.codes)}
+        self._subject_lookup = {subject: index for index, subject in enumerate(self.subjects)}
+        self._detail_lookup = {detail: index for index, detail in enumerate(self.details)}
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value: Any) -> "WarningTable":
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, dict):
+            return cls.from_dict(value)
+        if isinstance(value, (list, tuple)):
+            return cls.from_messages(value)
+        raise TypeError("warning table, column dict or list of messages expected")
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self.render(index) for index in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return self.render(position)
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(len(self)):
+            yield self.render(position)
+
+    def __len__(self) -> int:
+        return len(self.code_idx)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, WarningTable):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"WarningTable({len(self)} warnings, {len(self.codes)} codes)"
+
+
 class StudentSection(BaseModel):
     fio_raw: str
     fio_norm: str
     klass: str
     period_from: Optional[date]
     period_to: Optional[date]
-    entries: List[ParsedEntry] = Field(default_factory=list)
+    entries: EntryTable = Field(default_factory=EntryTable)
     attendance_legend: Dict[str, str] = Field(default_factory=dict)
-    warnings: List[str] = Field(default_factory=list)
+    warnings: WarningTable = Field(default_factory=WarningTable)
+
+    class Config:
+        json_encoders = {EntryTable: EntryTable.to_dict, WarningTable: WarningTable.to_dict}
+
+    def date_index(self) -> EntryDateIndex:
+        return self.entries.date_index()
+
+    def compact(self) -> "StudentSection":
+        return self.copy(update={"entries": self.entries.compact()})
 
 
 class ParsedWorkbook(BaseModel):
@@ -37,6 +515,13 @@ class ParsedWorkbook(BaseModel):
     students: List[StudentSection] = Field(default_factory=list)
     global_warnings: List[str] = Field(default_factory=list)
 
+    class Config:
+        json_encoders = {EntryTable: EntryTable.to_dict, WarningTable: WarningTable.to_dict}
+
+    def compact(self) -> "ParsedWorkbook":
+        """Copy for report sessions: entries keep only what re-filtering needs."""
+        return self.copy(update={"students": [section.compact() for section in self.students]})
+
 
 class SubjectSummary(BaseModel):
     name: str
@@ -53,7 +538,7 @@ class StudentLabel(BaseModel):
     period_to: Optional[date]
     subjects: List[SubjectSummary] = Field(default_factory=list)
     weak_subjects: List[str] = Field(default_factory=list)
-    warnings: List[str] = Field(default_factory=list)
+    warnings: List[str] = Field(default_factory=list)  # first WARNING_SAMPLES messages
 
 
 class StudentPreview(BaseModel):
@@ -63,13 +548,17 @@ class StudentPreview(BaseModel):
     average_score: Optional[float]
     has_weak_subjects: bool
     weak_subjects: List[str] = Field(default_factory=list)
-    warnings: List[str] = Field(default_factory=list)
+    warnings: List[str] = Field(default_factory=list)  # first WARNING_SAMPLES messages
+    warning_counts: Dict[str, int] = Field(default_factory=dict)
+    warning_total: int = 0
 
 
 class CurrentReportPreview(BaseModel):
     session_id: str
     students: List[StudentPreview] = Field(default_factory=list)
-    warnings: List[str] = Field(default_factory=list)
+    warnings: List[str] = Field(default_factory=list)  # workbook-level messages
+    warning_counts: Dict[str, int] = Field(default_factory=dict)  # per code, over all students
+    warning_total: int = 0
 
 
 class CurrentReportOptions(BaseModel):
@@ -86,3 +575,6 @@ class ReportSessionPayload(BaseModel):
     options: CurrentReportOptions
     preview: CurrentReportPreview
     labels: List[StudentLabel]
+
+    class Config:
+        json_encoders = {EntryTable: EntryTable.to_dict, WarningTable: WarningTable.to_dict}
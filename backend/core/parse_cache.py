@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from cachetools import LRUCache
+
+from backend.core.models import ParsedWorkbook
+from backend.core.parsing.quarter_parser import PARSER_VERSION
+from backend.core.session_codec import SessionCodecError, decode_part, encode_part
+from backend.core.storage import private_directory
+
+# Measured on synthetic exports: with the columnar EntryTable a parsed entry
+# costs ~80 bytes including its date index (it was ~1.3 KB as a pydantic model);
+# ~30 of them once compacted for a report session (no raw text / row / col).
+# A structured warning is ~15 bytes of columns (a rendered message was ~240).
+ENTRY_BYTES = 80
+COMPACT_ENTRY_BYTES = 30
+WARNING_BYTES = 20
+STUDENT_BYTES = 2000
+
+_CACHE_SUFFIX = ".workbook"
+
+
+def parse_cache_key(content_sha256: str) -> str:
+    return f"v{PARSER_VERSION}-{content_sha256}"
+
+
+def estimate_workbook_bytes(workbook: ParsedWorkbook) -> int:
+    size = STUDENT_BYTES
+    for section in workbook.students:
+        entry_bytes = ENTRY_BYTES if section.entries.has_details else COMPACT_ENTRY_BYTES
+        size += STUDENT_BYTES + entry_bytes * len(section.entries) + WARNING_BYTES * len(section.warnings)
+    return size
+
+
+class ParseCacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[ParsedWorkbook]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, workbook: ParsedWorkbook) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        ...
+
+
+class _CountingLRUCache(LRUCache):
+    def __init__(self, maxsize: int, getsizeof) -> None:
+        super().__init__(maxsize=maxsize, getsizeof=getsizeof)
+        self.evictions = 0
+
+    def popitem(self):
+        self.evictions += 1
+        return super().popitem()
+
+
+class MemoryParseCache(ParseCacheBackend):
+    """LRU of parsed workbooks bounded by their estimated size in bytes."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.cache = _CountingLRUCache(maxsize=max_bytes, getsizeof=estimate_workbook_bytes)
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[ParsedWorkbook]:
+        with self.lock:
+            return self.cache.get(key)
+
+    def set(self, key: str, workbook: ParsedWorkbook) -> None:
+        with self.lock:
+            try:
+                self.cache[key] = workbook
+            except ValueError:
+                # larger than the whole budget
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "entries": len(self.cache),
+                "bytes": int(self.cache.currsize),
+                "max_bytes": int(self.cache.maxsize),
+                "evictions": self.cache.evictions,
+            }
+
+
+class DiskParseCache(ParseCacheBackend):
+    """Workbooks in the session binary codec in a local directory, evicted least-recently-used first.
+
+    Files are written atomically and touched on every hit, so several worker
+    processes on one host can share the directory. The directory is private
+    to the user running the app, and decoding a file never runs code from it.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = private_directory(directory)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.evictions = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_CACHE_SUFFIX}"
+
+    def get(self, key: str) -> Optional[ParsedWorkbook]:
+        path = self._path(key)
+        try:
+            workbook = decode_part("workbook", path.read_bytes())
+            os.utime(path)
+        except (FileNotFoundError, SessionCodecError):
+            return None
+        return workbook
+
+    def set(self, key: str, workbook: ParsedWorkbook) -> None:
+        data = encode_part("workbook", workbook)
+        if len(data) > self.max_bytes:
+            return
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, self._path(key))
+        self._evict()
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_CACHE_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self) -> None:
+        with self.lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        entries = self._entries()
+        return {
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+class ParseCache:
+    """Cache of :class:`ParsedWorkbook` keyed by upload hash and parser version."""
+
+    def __init__(self, backend: Optional[ParseCacheBackend]) -> None:
+        self.backend = backend
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[ParsedWorkbook]:
+        if self.backend is None:
+            return None
+        workbook = self.backend.get(key)
+        with self.lock:
+            if workbook is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return workbook
+
+    def set(self, key: str, workbook: ParsedWorkbook) -> None:
+        if self.backend is not None:
+            self.backend.set(key, workbook)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            lookups = self.hits + self.misses
+            result: Dict[str, Any] = {
+                "backend": type(self.backend).__name__ if self.backend else None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+        if self.backend is not None:
+            result.update(self.backend.stats())
+        return result
+
+
+_parse_cache: Optional[ParseCache] = None
+
+
+def get_parse_cache() -> ParseCache:
+    global _parse_cache
+    if _parse_cache is None:
+        kind = os.getenv("PARSE_CACHE_BACKEND", "memory").strip().lower()
+        max_bytes = int(os.getenv("PARSE_CACHE_MAX_MB", "256")) * 1024 * 1024
+        backend: Optional[ParseCacheBackend] = None
+        if kind == "memory":
+            backend = MemoryParseCache(max_bytes)
+        elif kind == "disk":
+            directory = os.getenv(
+                "PARSE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "quarter-labels-parse-cache")
+            )
+            backend = DiskParseCache(directory, max_bytes)
+        _parse_cache = ParseCache(backend)
+    return _parse_cache
+
+
+__all__ = [
+    "ParseCache",
+    "ParseCacheBackend",
+    "MemoryParseCache",
+    "DiskParseCache",
+    "get_parse_cache",
+    "parse_cache_key",
+    "estimate_workbook_bytes",
+]
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+MergedRange = Tuple[int, int, int, int]
+RowCells = Tuple["array[int]", Tuple[str, ...]]
+
+# Kinds of rows by their first-column value; a classifier passed to
+# SparseGrid may return further (non-zero, < 256) kinds for non-empty values.
+ROW_BLANK = 0
+ROW_TEXT = 1
+
+
+def pack_row(cells: Dict[int, str]) -> RowCells:
+    """Pack a ``{col: value}`` mapping into the compact form stored by :class:`SparseGrid`."""
+    cols = sorted(cells)
+    return array("I", cols), tuple(cells[col] for col in cols)
+
+
+class GridRow:
+    """Read-only view of one sheet row with ``row[col]`` access.
+
+    Only non-empty cells are stored, as a packed array of column numbers and a
+    parallel tuple of values. Merged ranges crossing the row are kept as sorted
+    ``(min_col, max_col, value)`` spans and resolved by bisection, so a month
+    header merged over thirty day columns costs one span, not thirty cells.
+    """
+
+    __slots__ = ("cols", "values", "width", "_span_starts", "_spans")
+
+    def __init__(self, cols: "array[int]", values: Tuple[str, ...], width: int) -> None:
+        self.cols = cols
+        self.values = values
+        self.width = width
+        self._span_starts: List[int] = []
+        self._spans: List[Tuple[int, Optional[str]]] = []
+
+    def add_span(self, min_col: int, max_col: int, value: Optional[str]) -> None:
+        index = bisect_right(self._span_starts, min_col)
+        self._span_starts.insert(index, min_col)
+        self._spans.insert(index, (max_col, value))
+
+    def __getitem__(self, col: int) -> Optional[str]:
+        if self._span_starts:
+            index = bisect_right(self._span_starts, col) - 1
+            if index >= 0:
+                max_col, value = self._spans[index]
+                if col <= max_col:
+                    return value
+        cols = self.cols
+        index = bisect_left(cols, col)
+        if index < len(cols) and cols[index] == col:
+            return self.values[index]
+        return None
+
+    def __len__(self) -> int:
+        return self.width
+
+    def signature(self) -> Tuple[bytes, Tuple[str, ...], Tuple[int, ...], Tuple[Tuple[int, Optional[str]], ...]]:
+        """Hashable key; rows with equal signatures read the same in every column."""
+        return self.cols.tobytes(), self.values, tuple(self._span_starts), tuple(self._spans)
+
+    def _covered(self, col: int) -> bool:
+        index = bisect_right(self._span_starts, col) - 1
+        return index >= 0 and col <= self._spans[index][0]
+
+    def nonempty_count(self) -> int:
+        """Number of columns with a value, counting every column of a merged span."""
+        if not self._span_starts:
+            return len(self.cols)
+        count = sum(
+            max_col - min_col + 1 for min_col, (max_col, value) in zip(self._span_starts, self._spans) if value
+        )
+        return count + sum(1 for col in self.cols if not self._covered(col))
+
+
+class SparseGrid:
+    """Sparse replacement for the dense ``grid[row][col]`` matrix used by the parser.
+
+    Rows and columns are 1-based like in Excel; ``len(grid)`` and
+    ``len(grid[row])`` keep the ``max + 1`` semantics of the old list-of-lists.
+
+    Per-row indexes are built once with the grid, so navigation is O(1):
+    the kind of every row (``classify`` applied to its first-column value,
+    :data:`ROW_BLANK` for an empty one), the next row with a first-column
+    value, and the number of non-empty columns of every row.
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[RowCells],
+        merged_ranges: Iterable[MergedRange] = (),
+        classify: Optional[Callable[[str], int]] = None,
+    ) -> None:
+        cells_by_row = {index: cells for index, cells in enumerate(rows, start=1) if cells[0]}
+        merged_ranges = list(merged_ranges)
+        max_row = max(cells_by_row, default=1)
+        max_col = max((cols[-1] for cols, _ in cells_by_row.values()), default=1)
+        for _, _, merge_max_row, merge_max_col in merged_ranges:
+            max_row = max(max_row, merge_max_row)
+            max_col = max(max_col, merge_max_col)
+
+        self.max_row = max_row
+        self.max_col = max_col
+        width = max_col + 1
+        self._rows: Dict[int, GridRow] = {
+            index: GridRow(cols, values, width) for index, (cols, values) in cells_by_row.items()
+        }
+        self._empty_row = GridRow(array("I"), (), width)
+
+        for min_row, min_col, merge_max_row, merge_max_col in merged_ranges:
+            value = self[min_row][min_col] if min_row <= max_row else None
+            for row in range(min_row, merge_max_row + 1):
+                view = self._rows.get(row)
+                if view is None:
+                    view = self._rows[row] = GridRow(array("I"), (), width)
+                view.add_span(min_col, merge_max_col, value)
+        self._build_row_indexes(classify)
+
+    def _build_row_indexes(self, classify: Optional[Callable[[str], int]]) -> None:
+        size = self.max_row + 2
+        self.row_kinds = array("B", bytes(size))
+        self.nonempty_counts = array("I", [0]) * size
+        self.next_first_col_rows = array("I", [0]) * size
+        for index, view in self._rows.items():
+            self.nonempty_counts[index] = view.nonempty_count()
+            value = view[1]
+            if value:
+                self.row_kinds[index] = classify(value) if classify else ROW_TEXT
+        following = 0
+        for index in range(self.max_row, 0, -1):
+            if self.row_kinds[index]:
+                following = index
+            self.next_first_col_rows[index] = following
+
+    def window(self, first_row: int, last_row: int) -> "SparseGrid":
+        """Grid with only rows ``first_row..last_row`` but the size and row indexes of the whole sheet.
+
+        Rows outside the window read as empty. Used to ship a run of sections
+        to another process without pickling the rest of the sheet.
+        """
+        grid = SparseGrid.__new__(SparseGrid)
+        grid.max_row = self.max_row
+        grid.max_col = self.max_col
+        grid._empty_row = self._empty_row
+        rows = self._rows
+        grid._rows = {row: rows[row] for row in range(first_row, min(last_row, self.max_row) + 1) if row in rows}
+        grid.row_kinds = self.row_kinds
+        grid.nonempty_counts = self.nonempty_counts
+        grid.next_first_col_rows = self.next_first_col_rows
+        return grid
+
+    def row_kind(self, row: int) -> int:
+        return self.row_kinds[row]
+
+    def next_first_col_row(self, row: int) -> Optional[int]:
+        """First row at or after ``row`` with a value in column 1, if any."""
+        if row > self.max_row:
+            return None
+        return self.next_first_col_rows[row] or None
+
+    def nonempty_count(self, row: int) -> int:
+        return self.nonempty_counts[row]
+
+    def __getitem__(self, row: int) -> GridRow:
+        if not 0 <= row <= self.max_row:
+            raise IndexError(row)
+        return self._rows.get(row, self._empty_row)
+
+    def __len__(self) -> int:
+        return self.max_row + 1
+
+
+__all__ = ["GridRow", "SparseGrid", "MergedRange", "RowCells", "pack_row", "ROW_BLANK", "ROW_TEXT"]
@@ -1,15 +1,72 @@
 from __future__ import annotations
 
+import logging
+import multiprocessing
+import posixpath
 import re
-from dataclasses import dataclass
+import threading
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
 from datetime import date, datetime
+from functools import lru_cache
 from io import BytesIO
-from typing import Dict, List, Optional, Tuple
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Any,
+    BinaryIO,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+from xml.etree.ElementTree import iterparse
+from zipfile import ZipFile
 
 from openpyxl import load_workbook
+from openpyxl.utils.cell import range_boundaries
 from openpyxl.worksheet.worksheet import Worksheet
-
-from backend.core.models import ParsedEntry, ParsedWorkbook, StudentSection
+from openpyxl.xml.constants import ARC_WORKBOOK, ARC_WORKBOOK_RELS, PKG_REL_NS, REL_NS, SHEET_MAIN_NS
+
+from backend.core.models import (
+    WARNING_DATE_OUT_OF_PERIOD,
+    WARNING_INVALID_DATE,
+    WARNING_INVALID_DAY,
+    WARNING_INVALID_GRADE,
+    WARNING_MISSING_SUBJECT_TABLE,
+    WARNING_MULTIPLE_TOKENS,
+    WARNING_UNKNOWN_MONTH,
+    WARNING_UNKNOWN_TOKEN,
+    WARNING_UNRESOLVED_YEAR,
+    EntryTable,
+    ParsedWorkbook,
+    StudentSection,
+    WarningTable,
+)
+from backend.core.parsing.grid import ROW_TEXT, MergedRange, RowCells, SparseGrid
+from backend.core.progress import (
+    PHASE_GRID,
+    PHASE_READING,
+    PHASE_SECTIONS,
+    READING_REPORT_EVERY,
+    ProgressCallback,
+)
+
+if TYPE_CHECKING:
+    from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the parsed output can change for the same input file: it is
+# part of the parse cache key.
+PARSER_VERSION = "3.1"
 
 MONTH_ALIASES = {
     "январь": 1,
@@ -38,7 +95,82 @@ MONTH_ALIASES = {
 
 ATTENDANCE_DEFAULT = {"Н", "У", "Б", "О"}
 META_PREFIXES = {"школа", "учебный год", "класс", "период"}
+
+# Row kinds assigned to the first column by _classify_header (see SparseGrid).
+# ROW_BARE_META is or-ed in when the cell is exactly a meta label, no value.
+ROW_STUDENT = 2
+ROW_SUBJECT_HEADER = 3
+ROW_SCHOOL = 4
+ROW_ACADEMIC_YEAR = 5
+ROW_CLASS = 6
+ROW_PERIOD = 7
+ROW_BARE_META = 0x80
+META_ROW_KINDS = (
+    ("школа", ROW_SCHOOL),
+    ("учебный год", ROW_ACADEMIC_YEAR),
+    ("класс", ROW_CLASS),
+    ("период", ROW_PERIOD),
+)
 TOKEN_SPLIT_RE = re.compile(r"[\s,;]+")
+MERGE_CELL_TAG = f"{{{SHEET_MAIN_NS}}}mergeCell"
+SHEET_TAG = f"{{{SHEET_MAIN_NS}}}sheet"
+SHEET_REL_ID = f"{{{REL_NS}}}id"
+RELATIONSHIP_TAG = f"{{{PKG_REL_NS}}}Relationship"
+
+
+# Column -> date, plus header warnings as (WARNING_* code, col, detail).
+DateMapping = Tuple[Dict[int, date], Tuple[Tuple[str, int, str], ...]]
+
+TOKEN_UNKNOWN = WARNING_UNKNOWN_TOKEN
+TOKEN_INVALID_GRADE = WARNING_INVALID_GRADE
+# Distinct (cell text, attendance codes) pairs remembered by tokenize_cell;
+# real exports use a few dozen cell texts.
+TOKEN_CACHE_SIZE = 4096
+# Below this many sections a process pool costs more than it saves.
+PARALLEL_MIN_SECTIONS = 64
+
+YearPair = Tuple[Optional[int], Optional[int]]
+
+
+class CellTokens(NamedTuple):
+    grades: Tuple[int, ...]
+    attendance: Tuple[str, ...]
+    warnings: Tuple[Tuple[str, str], ...]  # (TOKEN_* code, offending token)
+    multiple: bool
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def tokenize_cell(raw_text: str, attendance_codes: FrozenSet[str]) -> CellTokens:
+    """Split a grade cell into grades, attendance codes and warnings.
+
+    Memoized: the vocabulary of a sheet is tiny, so almost every cell is a
+    cache hit returning the same shared, immutable result.
+    """
+    cleaned = raw_text.replace("/", " ")
+    tokens = [tok for tok in TOKEN_SPLIT_RE.split(cleaned) if tok]
+    grades: List[int] = []
+    attendance: List[str] = []
+    warnings: List[Tuple[str, str]] = []
+    for token in tokens:
+        token = token.strip()
+        if not token:
+            continue
+        if token in attendance_codes:
+            attendance.append(token)
+            continue
+        if token.isdigit():
+            try:
+                value = int(token)
+            except ValueError:
+                warnings.append((TOKEN_UNKNOWN, token))
+                continue
+            if 2 <= value <= 5:
+                grades.append(value)
+            else:
+                warnings.append((TOKEN_INVALID_GRADE, token))
+            continue
+        warnings.append((TOKEN_UNKNOWN, token))
+    return CellTokens(tuple(grades), tuple(attendance), tuple(warnings), len(tokens) > 1)
 
 
 @dataclass
@@ -49,100 +181,400 @@ class SectionParseResult:
     updated_academic_year_end: Optional[int]
 
 
-class QuarterReportParser:
-    """Parser for quarterly performance reports according to v2 specification."""
+@dataclass
+class RowsParseResult:
+    """Sections of a run of rows and the workbook metadata it leaves behind."""
+
+    students: List[StudentSection] = field(default_factory=list)
+    global_warnings: List[str] = field(default_factory=list)
+    school_name: Optional[str] = None
+    academic_year_start: Optional[int] = None
+    academic_year_end: Optional[int] = None
+    date_mapping_hits: int = 0
+    date_mapping_misses: int = 0
+
+
+class ParserStats:
+    """Counters of a parser instance; one instance is shared by worker threads."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.date_mapping_hits = 0
+        self.date_mapping_misses = 0
+
+    def record_date_mapping(self, hit: bool) -> None:
+        with self.lock:
+            if hit:
+                self.date_mapping_hits += 1
+            else:
+                self.date_mapping_misses += 1
+
+    def add_date_mappings(self, hits: int, misses: int) -> None:
+        """Fold in the counts of a parser that ran in another process."""
+        with self.lock:
+            self.date_mapping_hits += hits
+            self.date_mapping_misses += misses
+
+    def snapshot(self) -> Dict[str, Any]:
+        tokens = tokenize_cell.cache_info()  # process-wide, shared by all parsers
+        token_lookups = tokens.hits + tokens.misses
+        with self.lock:
+            lookups = self.date_mapping_hits + self.date_mapping_misses
+            return {
+                "date_mapping_hits": self.date_mapping_hits,
+                "date_mapping_misses": self.date_mapping_misses,
+                "date_mapping_hit_rate": round(self.date_mapping_hits / lookups, 4) if lookups else 0.0,
+                "token_cache_entries": tokens.currsize,
+                "token_cache_hit_rate": round(tokens.hits / token_lookups, 4) if token_lookups else 0.0,
+            }
+
 
-    def parse_workbook(self, xlsx_bytes: bytes) -> ParsedWorkbook:
-        wb = load_workbook(filename=BytesIO(xlsx_bytes), data_only=True)
-        sheet = self._find_target_sheet(wb.worksheets)
-        if sheet is None:
+class QuarterReportParser:
+    """Parser for quarterly performance reports according to v2 specification.
+
+    With ``read_only=True`` the workbook is streamed through openpyxl's read-only
+    reader: cells are never materialised as objects and merged ranges are read
+    straight from the sheet XML. The parsed result is identical in both modes.
+
+    With ``workers > 1`` the sections of large sheets are parsed in a process
+    pool (see :meth:`_parse_rows_parallel`); the result is again identical.
+    The pool is started on the first parallel parse, shared by all threads
+    parsing with this parser and stopped by :meth:`shutdown`.
+    """
+
+    def __init__(self, read_only: bool = False, workers: int = 1) -> None:
+        self.read_only = read_only
+        self.workers = max(1, workers)
+        self.stats = ParserStats()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _section_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn: forking a multithreaded server process is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def shutdown(self) -> None:
+        """Stop the section worker processes; a later parallel parse starts new ones."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _drop_broken_pool(self, pool: ProcessPoolExecutor) -> None:
+        # a worker died (OOM killer, crash): the executor is unusable for good,
+        # so the next parallel parse must start a fresh one
+        logger.warning("Section worker pool broke; finishing the parse serially")
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def parse_workbook(
+        self, source: Union[bytes, str, BinaryIO], progress: Optional[ProgressCallback] = None
+    ) -> ParsedWorkbook:
+        """Parse an export given as raw bytes, a file path or a binary file object."""
+        if progress:
+            progress(PHASE_READING, 0, 0)
+        if isinstance(source, (bytes, bytearray)):
+            source = BytesIO(source)
+        wb = load_workbook(filename=source, data_only=True, read_only=self.read_only)
+        try:
+            grid = self._load_target_grid(wb.worksheets, progress, source)
+        finally:
+            wb.close()
+        if grid is None:
             raise ValueError("Не удалось найти лист с данными (отсутствует строка 'Предмет').")
+        total_sections = self._count_sections(grid)
+        if progress:
+            progress(PHASE_SECTIONS, 0, total_sections)
+        if self.workers > 1 and total_sections >= PARALLEL_MIN_SECTIONS:
+            result = self._parse_rows_parallel(grid, progress, total_sections)
+        else:
+            # date mappings are memoized per workbook: sections of one class share their header rows
+            result = self._parse_rows(grid, 1, len(grid), (None, None), {}, progress, total_sections)
 
-        grid = self._expand_grid(sheet)
-        max_row = len(grid) - 1
+        return ParsedWorkbook(
+            school_name=result.school_name,
+            academic_year_start=result.academic_year_start,
+            academic_year_end=result.academic_year_end,
+            students=result.students,
+            global_warnings=result.global_warnings,
+        )
+
+    def _parse_rows(
+        self,
+        grid: SparseGrid,
+        start_row: int,
+        stop_row: int,
+        academic_year: YearPair,
+        date_mappings: Dict[Hashable, DateMapping],
+        progress: Optional[ProgressCallback] = None,
+        total_sections: int = 0,
+    ) -> RowsParseResult:
+        """Parse rows ``start_row`` up to (not including) ``stop_row``.
+
+        ``academic_year`` is the year in effect at ``start_row``; the result
+        carries the one in effect after the last row. ``stop_row`` must be a
+        "Ученик" row or the end of the sheet: a section never crosses one.
+        """
+        result = RowsParseResult()
         workbook_meta = {
             "school_name": None,
-            "academic_year_start": None,
-            "academic_year_end": None,
+            "academic_year_start": academic_year[0],
+            "academic_year_end": academic_year[1],
         }
-        students: List[StudentSection] = []
-        global_warnings: List[str] = []
+        students = result.students
 
-        row = 1
-        while row <= max_row:
+        row = grid.next_first_col_row(start_row)
+        while row is not None and row < stop_row:
             cell_value = grid[row][1]
+            kind = grid.row_kind(row) & ~ROW_BARE_META
             if cell_value:
-                normalized = self._normalize_header(cell_value)
-                if normalized.startswith("школа"):
+                if kind == ROW_SCHOOL:
                     workbook_meta["school_name"] = self._extract_value(cell_value)
-                elif normalized.startswith("учебный год"):
+                elif kind == ROW_ACADEMIC_YEAR:
                     year_pair = self._parse_academic_year(cell_value)
                     if year_pair:
                         workbook_meta["academic_year_start"], workbook_meta["academic_year_end"] = year_pair
-                elif normalized.startswith("класс"):
+                elif kind == ROW_CLASS:
                     # class meta maintained, but handled inside sections
                     pass
-                elif normalized.startswith("период"):
+                elif kind == ROW_PERIOD:
                     pass
-                elif normalized.startswith("ученик"):
-                    result = self._parse_student_section(
+                elif kind == ROW_STUDENT:
+                    section_result = self._parse_student_section(
                         grid,
                         start_row=row,
                         base_meta=workbook_meta,
-                        global_warnings=global_warnings,
+                        global_warnings=result.global_warnings,
+                        date_mappings=date_mappings,
                     )
-                    students.append(result.section)
-                    if result.updated_academic_year_start is not None:
-                        workbook_meta["academic_year_start"] = result.updated_academic_year_start
-                    if result.updated_academic_year_end is not None:
-                        workbook_meta["academic_year_end"] = result.updated_academic_year_end
-                    row = result.end_row
-                # fall-through to increment row below
-            row += 1
-
-        return ParsedWorkbook(
-            school_name=workbook_meta.get("school_name"),
-            academic_year_start=workbook_meta.get("academic_year_start"),
-            academic_year_end=workbook_meta.get("academic_year_end"),
-            students=students,
-            global_warnings=global_warnings,
-        )
+                    students.append(section_result.section)
+                    if progress:
+                        progress(PHASE_SECTIONS, len(students), total_sections)
+                    if section_result.updated_academic_year_start is not None:
+                        workbook_meta["academic_year_start"] = section_result.updated_academic_year_start
+                    if section_result.updated_academic_year_end is not None:
+                        workbook_meta["academic_year_end"] = section_result.updated_academic_year_end
+                    row = section_result.end_row
+                # fall-through to the next row with a first-column value
+            row = grid.next_first_col_row(row + 1)
+
+        result.school_name = workbook_meta["school_name"]
+        result.academic_year_start = workbook_meta["academic_year_start"]
+        result.academic_year_end = workbook_meta["academic_year_end"]
+        return result
+
+    def _plan_chunks(self, grid: SparseGrid, count: int) -> List[Tuple[int, int, YearPair]]:
+        """Split the sheet at "Ученик" rows into ``count`` runs of whole sections.
+
+        Each run gets the academic year of the last parsable "Учебный год" row
+        above it. That is the year the serial parse carries into the run unless
+        such a row sits inside a grade table; :meth:`_parse_rows_parallel`
+        checks every guess against the previous run and re-parses on a miss.
+        """
+        student_rows: List[int] = []
+        year_rows: List[int] = []
+        for row, kind in enumerate(grid.row_kinds):
+            if kind == ROW_STUDENT:
+                student_rows.append(row)
+            elif kind == ROW_ACADEMIC_YEAR:
+                year_rows.append(row)
+        starts = sorted({1, *(student_rows[len(student_rows) * index // count] for index in range(1, count))})
+        plan: List[Tuple[int, int, YearPair]] = []
+        year: YearPair = (None, None)
+        years = iter(year_rows)
+        year_row = next(years, None)
+        for start, stop in zip(starts, starts[1:] + [len(grid)]):
+            while year_row is not None and year_row < start:
+                year = self._parse_academic_year(grid[year_row][1]) or year
+                year_row = next(years, None)
+            plan.append((start, stop, year))
+        return plan
+
+    def _parse_rows_parallel(
+        self, grid: SparseGrid, progress: Optional[ProgressCallback], total_sections: int
+    ) -> RowsParseResult:
+        """:meth:`_parse_rows` over the whole sheet, one run of sections per worker process.
+
+        Runs are merged in sheet order, so the result matches the serial parse;
+        date mappings are memoized per run, not across runs. If the pool breaks,
+        it is dropped and the runs not merged yet are parsed serially.
+        """
+        plan = self._plan_chunks(grid, self.workers)
+        merged = RowsParseResult()
+        pool = self._section_pool()
+        futures: List[Future] = []
+        broken = False
+        try:
+            for start, stop, year in plan:
+                futures.append(pool.submit(_parse_rows_chunk, grid.window(start, stop), start, stop, year))
+        except BrokenProcessPool:
+            broken = True
+            self._drop_broken_pool(pool)
+        try:
+            for index, (start, stop, year) in enumerate(plan):
+                chunk: Optional[RowsParseResult] = None
+                if not broken:
+                    try:
+                        chunk = futures[index].result()
+                    except BrokenProcessPool:
+                        broken = True
+                        self._drop_broken_pool(pool)
+                carried = (merged.academic_year_start, merged.academic_year_end)
+                if chunk is None or year != carried:
+                    chunk = self._parse_rows(grid, start, stop, carried, {})
+                else:
+                    self.stats.add_date_mappings(chunk.date_mapping_hits, chunk.date_mapping_misses)
+                merged.students.extend(chunk.students)
+                merged.global_warnings.extend(chunk.global_warnings)
+                if chunk.school_name is not None:
+                    merged.school_name = chunk.school_name
+                merged.academic_year_start = chunk.academic_year_start
+                merged.academic_year_end = chunk.academic_year_end
+                if progress:
+                    progress(PHASE_SECTIONS, len(merged.students), total_sections)
+        finally:
+            # the pool is shared: leave no runs of a failed parse queued in it
+            for future in futures:
+                future.cancel()
+        return merged
 
     # ------------------------------------------------------------------
     # Sheet preparation helpers
     # ------------------------------------------------------------------
-    def _find_target_sheet(self, sheets: List[Worksheet]) -> Optional[Worksheet]:
+    def _load_target_grid(
+        self,
+        sheets: List[Union[Worksheet, ReadOnlyWorksheet]],
+        progress: Optional[ProgressCallback] = None,
+        source: Union[str, BinaryIO, None] = None,
+    ) -> Optional[SparseGrid]:
+        """Find the data sheet and build its grid in a single pass over the rows.
+
+        Each sheet is read only until its ``Предмет`` row turns up; the rows read
+        so far become the top of the grid and the rest of the sheet is appended
+        from the same iterator, so the data sheet is never read twice.
+        ``source`` is the file the sheets were loaded from; read-only sheets
+        need it for their merged cells.
+        """
         for sheet in sheets:
-            for row in sheet.iter_rows(values_only=True):
-                if row and any(self._normalize_header(str(cell)) == "предмет" for cell in row if cell is not None):
-                    return sheet
+            values_iter = self._iter_sheet_rows(sheet)
+            interned: Dict[str, str] = {}
+            rows: List[RowCells] = []
+            for values in values_iter:
+                row = self._normalize_row(values, interned)
+                rows.append(row)
+                if self._is_table_header_row(row):
+                    for rest in values_iter:
+                        rows.append(self._normalize_row(rest, interned))
+                        if progress and len(rows) % READING_REPORT_EVERY == 0:
+                            progress(PHASE_READING, len(rows), 0)
+                    if progress:
+                        progress(PHASE_GRID, len(rows), len(rows))
+                    return SparseGrid(rows, self._merged_ranges(sheet, source), classify=self._classify_header)
         return None
 
-    def _expand_grid(self, sheet: Worksheet) -> List[List[Optional[str]]]:
-        max_row = sheet.max_row
-        max_col = sheet.max_column
-        grid: List[List[Optional[str]]] = [[None for _ in range(max_col + 1)] for _ in range(max_row + 1)]
-        for row in range(1, max_row + 1):
-            for col in range(1, max_col + 1):
-                value = sheet.cell(row=row, column=col).value
-                grid[row][col] = self._normalize_value(value)
-        for merged in sheet.merged_cells.ranges:
-            min_row, min_col, max_row, max_col = merged.min_row, merged.min_col, merged.max_row, merged.max_col
-            value = grid[min_row][min_col]
-            for row in range(min_row, max_row + 1):
-                for col in range(min_col, max_col + 1):
-                    grid[row][col] = value
-        return grid
+    def _count_sections(self, grid: SparseGrid) -> int:
+        return grid.row_kinds.count(ROW_STUDENT)
+
+    def _classify_header(self, value: str) -> int:
+        """Row kind of a non-empty first-column value, computed once per row."""
+        normalized = self._normalize_header(value)
+        if normalized.startswith("ученик"):
+            return ROW_STUDENT
+        if normalized == "предмет":
+            return ROW_SUBJECT_HEADER
+        for prefix, kind in META_ROW_KINDS:
+            if normalized.startswith(prefix):
+                return kind | ROW_BARE_META if normalized == prefix else kind
+        return ROW_TEXT
+
+    def _normalize_row(self, values: Tuple[object, ...], interned: Dict[str, str]) -> RowCells:
+        # Empty strings are dropped along with None: every grid consumer treats
+        # both as a blank cell. Values are interned per workbook because grade
+        # cells repeat a tiny vocabulary ("5", "4", "Н", ...).
+        cols = array("I")
+        cells: List[str] = []
+        for col, value in enumerate(values, start=1):
+            if value is not None:
+                normalized = self._normalize_value(value)
+                if normalized:
+                    cols.append(col)
+                    cells.append(interned.setdefault(normalized, normalized))
+        return cols, tuple(cells)
+
+    def _is_table_header_row(self, row: RowCells) -> bool:
+        return any(value.lower() == "предмет" for value in row[1])
+
+    def _iter_sheet_rows(self, sheet: Union[Worksheet, ReadOnlyWorksheet]) -> Iterator[Tuple[object, ...]]:
+        if hasattr(sheet, "reset_dimensions"):  # read-only worksheet
+            # The <dimension> tag is optional and often wrong in exported files;
+            # without it rows are returned as stored instead of being truncated.
+            sheet.reset_dimensions()
+        return sheet.iter_rows(values_only=True)
+
+    def _merged_ranges(
+        self, sheet: Union[Worksheet, ReadOnlyWorksheet], source: Union[str, BinaryIO, None] = None
+    ) -> List[MergedRange]:
+        merged_cells = getattr(sheet, "merged_cells", None)
+        if merged_cells is not None:
+            return [(rng.min_row, rng.min_col, rng.max_row, rng.max_col) for rng in merged_cells.ranges]
+        if source is None:
+            raise ValueError("merged cells of a read-only sheet are read from the workbook source")
+        return self._read_merged_ranges(sheet.title, source)
+
+    def _read_merged_ranges(self, title: str, source: Union[str, BinaryIO]) -> List[MergedRange]:
+        """Collect ``<mergeCell ref="B5:C5"/>`` elements from the raw sheet XML.
+
+        Read-only worksheets do not expose merged cells, so the sheet part is
+        looked up through the workbook relationships and streamed once more
+        straight from the zip archive, discarding every element as soon as it
+        has been seen.
+        """
+        ranges: List[MergedRange] = []
+        with ZipFile(source) as archive:
+            with archive.open(self._sheet_part(archive, title)) as stream:
+                for _, element in iterparse(stream, events=("end",)):
+                    if element.tag == MERGE_CELL_TAG:
+                        ref = element.get("ref")
+                        if ref:
+                            min_col, min_row, max_col, max_row = range_boundaries(ref)
+                            ranges.append((min_row, min_col, max_row, max_col))
+                    element.clear()
+        return ranges
+
+    def _sheet_part(self, archive: ZipFile, title: str) -> str:
+        """Path of the worksheet ``title`` inside the XLSX archive."""
+        with archive.open(ARC_WORKBOOK_RELS) as stream:
+            targets = {
+                element.get("Id"): element.get("Target", "")
+                for _, element in iterparse(stream)
+                if element.tag == RELATIONSHIP_TAG
+            }
+        with archive.open(ARC_WORKBOOK) as stream:
+            for _, element in iterparse(stream):
+                if element.tag == SHEET_TAG and element.get("name") == title:
+                    target = targets.get(element.get(SHEET_REL_ID), "")
+                    if target.startswith("/"):
+                        return target[1:]
+                    return posixpath.normpath(posixpath.join(posixpath.dirname(ARC_WORKBOOK), target))
+        raise ValueError(f"Лист {title!r} не найден в книге")
 
     # ------------------------------------------------------------------
     # Parsing helpers
     # ------------------------------------------------------------------
     def _parse_student_section(
         self,
-        grid: List[List[Optional[str]]],
+        grid: SparseGrid,
         start_row: int,
         base_meta: Dict[str, Optional[str]],
         global_warnings: List[str],
+        date_mappings: Optional[Dict[Hashable, DateMapping]] = None,
     ) -> SectionParseResult:
         max_row = len(grid) - 1
         header = grid[start_row][1] or ""
@@ -159,46 +591,46 @@ class QuarterReportParser:
         row_header_months = -1
         row_days = -1
         attendance_legend: Dict[str, str] = {}
-        entries: List[ParsedEntry] = []
-        warnings: List[str] = []
+        warnings = WarningTable(fio_norm)
 
         while row <= max_row:
             first_col = grid[row][1]
-            normalized = self._normalize_header(first_col) if first_col else ""
+            kind = grid.row_kind(row) & ~ROW_BARE_META
             if not first_col:
-                row += 1
+                row = grid.next_first_col_row(row) or max_row + 1
                 continue
 
-            if normalized.startswith("ученик") and row != start_row:
+            if kind == ROW_STUDENT and row != start_row:
                 row -= 1
                 break
-            if normalized.startswith("учебный год"):
+            if kind == ROW_ACADEMIC_YEAR:
                 year_pair = self._parse_academic_year(first_col)
                 if year_pair:
                     academic_year_start, academic_year_end = year_pair
                 row += 1
                 continue
-            if normalized.startswith("класс"):
+            if kind == ROW_CLASS:
                 klass = self._extract_value(first_col)
                 row += 1
                 continue
-            if normalized.startswith("период"):
+            if kind == ROW_PERIOD:
                 p = self._parse_period(first_col)
                 if p:
                     period_from, period_to = p
                 row += 1
                 continue
-            if normalized.startswith("школа"):
+            if kind == ROW_SCHOOL:
                 row += 1
                 continue
-            if normalized == "предмет":
+            if kind == ROW_SUBJECT_HEADER:
                 row_header_months = row
                 row_days = row + 1
                 break
             row += 1
 
+        entries = EntryTable(fio_raw, fio_norm, klass)
         if row_header_months == -1 or row_days == -1 or row_days > max_row:
-            warnings.append("Не найдена таблица предметов для ученика")
+            warnings.add(WARNING_MISSING_SUBJECT_TABLE)
             section = StudentSection(
                 fio_raw=fio_raw,
                 fio_norm=fio_norm,
@@ -211,7 +643,8 @@ class QuarterReportParser:
             )
             return SectionParseResult(section, row, academic_year_start, academic_year_end)
 
-        col_date_map, mapping_warnings = self._build_date_mapping(
+        col_date_map, mapping_warnings = self._date_mapping(
+            date_mappings,
             grid,
             row_header_months,
             row_days,
@@ -220,32 +653,35 @@ class QuarterReportParser:
             period_from,
             period_to,
         )
-        warnings.extend(mapping_warnings)
+        for code, col, detail in mapping_warnings:
+            header_row = row_header_months if code == WARNING_UNKNOWN_MONTH else row_days
+            warnings.add(code, row=header_row, col=col, detail=detail)
 
-        attendance_codes = set(ATTENDANCE_DEFAULT)
+        attendance_codes = frozenset(ATTENDANCE_DEFAULT)
         current_row = row_days + 1
         while current_row <= max_row:
             first_col = grid[current_row][1]
-            normalized = self._normalize_header(first_col) if first_col else ""
+            kind = grid.row_kind(current_row)
 
             if self._is_legend_row(grid, current_row):
                 code = (grid[current_row][1] or "").strip()
                 description = (grid[current_row][2] or "").strip()
                 if code:
                     attendance_legend[code] = description
-                    attendance_codes.add(code)
+                    attendance_codes = attendance_codes | {code}
                 current_row += 1
                 continue
 
             if not first_col:
-                # potential end of table, but continue scanning for legend/new sections
-                next_nonempty = self._find_next_nonempty(grid, current_row + 1)
-                if next_nonempty and self._normalize_header(next_nonempty).startswith("ученик"):
+                # potential end of table, but continue scanning for legend/new sections;
+                # blank rows up to the next first-column value change nothing
+                next_nonempty = grid.next_first_col_row(current_row + 1)
+                if next_nonempty and grid.row_kind(next_nonempty) == ROW_STUDENT:
                     break
-                current_row += 1
+                current_row = next_nonempty or max_row + 1
                 continue
 
-            if normalized in META_PREFIXES or normalized.startswith("ученик"):
+            if kind & ROW_BARE_META or kind == ROW_STUDENT:
                 current_row -= 1
                 break
 
@@ -255,37 +691,20 @@ class QuarterReportParser:
                 continue
 
             subject_entries_found = False
+            row_cells = grid[current_row]
             for col, mapped_date in col_date_map.items():
-                raw = grid[current_row][col]
+                raw = row_cells[col]
                 if raw is None or str(raw).strip() == "":
                     continue
                 raw_text = str(raw)
-                grades, attendance, token_warnings, multi_flag = self._tokenize_cell(raw_text, attendance_codes)
-                for warning in token_warnings:
-                    warnings.append(
-                        f"[{fio_norm}] {subject_name}: {warning} (row={current_row}, col={col})"
-                    )
-                if multi_flag:
-                    warnings.append(
-                        f"[{fio_norm}] {subject_name}: multiple_tokens_in_cell (row={current_row}, col={col})"
-                    )
-                entry = ParsedEntry(
-                    student_fio_raw=fio_raw,
-                    student_fio_norm=fio_norm,
-                    klass=klass,
-                    subject=subject_name,
-                    date=mapped_date,
-                    grades=grades,
-                    attendance=attendance,
-                    raw_text=raw_text,
-                    row=current_row,
-                    col=col,
-                )
+                tokens = tokenize_cell(raw_text, attendance_codes)
+                for code, token in tokens.warnings:
+                    warnings.add(code, subject_name, current_row, col, token)
+                if tokens.multiple:
+                    warnings.add(WARNING_MULTIPLE_TOKENS, subject_name, current_row, col)
                 if period_from and period_to and not (period_from <= mapped_date <= period_to):
-                    warnings.append(
-                        f"[{fio_norm}] {subject_name}: date_out_of_period {mapped_date.isoformat()}"
-                    )
-                entries.append(entry)
+                    warnings.add(WARNING_DATE_OUT_OF_PERIOD, subject_name, current_row, col, mapped_date.isoformat())
+                entries.append(subject_name, mapped_date, tokens.grades, tokens.attendance, raw_text, current_row, col)
                 subject_entries_found = True
             if not subject_entries_found:
                 # still allow as subject with no entries
@@ -302,19 +721,45 @@ class QuarterReportParser:
             attendance_legend=attendance_legend,
             warnings=warnings,
         )
+        section.date_index()
         return SectionParseResult(section, current_row, academic_year_start, academic_year_end)
 
+    def _date_mapping(
+        self,
+        memo: Optional[Dict[Hashable, DateMapping]],
+        grid: SparseGrid,
+        row_months: int,
+        row_days: int,
+        academic_year_start: Optional[int],
+        academic_year_end: Optional[int],
+        period_from: Optional[date],
+        period_to: Optional[date],
+    ) -> DateMapping:
+        """:meth:`_build_date_mapping`, memoized by the header rows and the year/period context.
+
+        The cached map and warnings are shared between sections and only read.
+        """
+        context = (academic_year_start, academic_year_end, period_from, period_to)
+        if memo is None:
+            return self._build_date_mapping(grid, row_months, row_days, *context)
+        key = (grid[row_months].signature(), grid[row_days].signature(), context)
+        mapping = memo.get(key)
+        self.stats.record_date_mapping(mapping is not None)
+        if mapping is None:
+            mapping = memo[key] = self._build_date_mapping(grid, row_months, row_days, *context)
+        return mapping
+
     def _build_date_mapping(
         self,
-        grid: List[List[Optional[str]]],
+        grid: SparseGrid,
         row_months: int,
         row_days: int,
         academic_year_start: Optional[int],
         academic_year_end: Optional[int],
         period_from: Optional[date],
         period_to: Optional[date],
-    ) -> Tuple[Dict[int, date], List[str]]:
-        warnings: List[str] = []
+    ) -> DateMapping:
+        warnings: List[Tuple[str, int, str]] = []
         col_date_map: Dict[int, date] = {}
         max_col = len(grid[row_months]) - 1
         current_month: Optional[int] = None
@@ -325,7 +770,7 @@ class QuarterReportParser:
                 if month_number:
                     current_month = month_number
                 else:
-                    warnings.append(f"Неизвестный месяц: {header_value}")
+                    warnings.append((WARNING_UNKNOWN_MONTH, col, str(header_value)))
                     current_month = None
             if current_month is None:
                 continue
@@ -335,19 +780,19 @@ class QuarterReportParser:
             try:
                 day = int(str(day_raw).strip())
             except ValueError:
-                warnings.append(f"Некорректный день: {day_raw}")
+                warnings.append((WARNING_INVALID_DAY, col, str(day_raw)))
                 continue
             year = self._resolve_year(current_month, day, academic_year_start, academic_year_end, period_from, period_to)
             if year is None:
-                warnings.append(f"Не удалось определить год для {current_month}.{day}")
+                warnings.append((WARNING_UNRESOLVED_YEAR, col, f"{current_month}.{day}"))
                 continue
             try:
                 mapped_date = date(year, current_month, day)
             except ValueError:
-                warnings.append(f"Некорректная дата: {current_month}.{day}.{year}")
+                warnings.append((WARNING_INVALID_DATE, col, f"{current_month}.{day}.{year}"))
                 continue
             col_date_map[col] = mapped_date
-        return col_date_map, warnings
+        return col_date_map, tuple(warnings)
 
     def _resolve_year(
         self,
@@ -387,34 +832,12 @@ class QuarterReportParser:
         return None
 
     def _tokenize_cell(
-        self, raw_text: str, attendance_codes: set[str]
+        self, raw_text: str, attendance_codes: AbstractSet[str]
     ) -> Tuple[List[int], List[str], List[str], bool]:
-        cleaned = raw_text.replace("/", " ")
-        tokens = [tok for tok in TOKEN_SPLIT_RE.split(cleaned) if tok]
-        grades: List[int] = []
-        attendance: List[str] = []
-        warnings: List[str] = []
-        multiple = len(tokens) > 1
-        for token in tokens:
-            token = token.strip()
-            if not token:
-                continue
-            if token in attendance_codes:
-                attendance.append(token)
-                continue
-            if token.isdigit():
-                try:
-                    value = int(token)
-                except ValueError:
-                    warnings.append(f"unknown_token {token}")
-                    continue
-                if 2 <= value <= 5:
-                    grades.append(value)
-                else:
-                    warnings.append(f"invalid_grade {token}")
-                continue
-            warnings.append(f"unknown_token {token}")
-        return grades, attendance, warnings, multiple
+        """List-based form of :func:`tokenize_cell` with warnings formatted as text."""
+        tokens = tokenize_cell(raw_text, frozenset(attendance_codes))
+        warnings = [f"{code} {token}" for code, token in tokens.warnings]
+        return list(tokens.grades), list(tokens.attendance), warnings, tokens.multiple
 
     def _parse_month(self, value: Optional[str]) -> Optional[int]:
         if not value:
@@ -490,26 +913,24 @@ class QuarterReportParser:
     def _normalize_name(self, value: str) -> str:
         return " ".join(value.split())
 
-    def _is_legend_row(self, grid: List[List[Optional[str]]], row: int) -> bool:
+    def _is_legend_row(self, grid: SparseGrid, row: int) -> bool:
         code = grid[row][1] or ""
         description = grid[row][2] or ""
         if not code or not description:
             return False
-        code = code.strip()
-        description = description.strip()
-        if len(code) != 1:
-            return False
-        if any(grid[row][col] for col in range(3, len(grid[row]))):
+        if len(code.strip()) != 1:
             return False
-        return True
+        # code and description are the only non-empty columns
+        return grid.nonempty_count(row) == 2
 
-    def _find_next_nonempty(self, grid: List[List[Optional[str]]], start_row: int) -> Optional[str]:
-        max_row = len(grid) - 1
-        for row in range(start_row, max_row + 1):
-            value = grid[row][1]
-            if value:
-                return value
-        return None
+
+def _parse_rows_chunk(grid: SparseGrid, start_row: int, stop_row: int, academic_year: YearPair) -> RowsParseResult:
+    """Process-pool entry point of :meth:`QuarterReportParser._parse_rows_parallel`."""
+    parser = QuarterReportParser()
+    result = parser._parse_rows(grid, start_row, stop_row, academic_year, {})
+    result.date_mapping_hits = parser.stats.date_mapping_hits
+    result.date_mapping_misses = parser.stats.date_mapping_misses
+    return result
 
 
-__all__ = ["QuarterReportParser"]
+__all__ = ["QuarterReportParser", "ParserStats", "CellTokens", "tokenize_cell", "PARSER_VERSION"]
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Callable
+
+# (phase, done, total); total is 0 while it is not known yet.
+ProgressCallback = Callable[[str, int, int], None]
+
+PHASE_QUEUED = "queued"
+PHASE_READING = "reading"
+PHASE_GRID = "grid"
+PHASE_SECTIONS = "sections"
+PHASE_LABELS = "building_labels"
+PHASE_DONE = "done"
+
+READING_REPORT_EVERY = 1000
+
+__all__ = [
+    "ProgressCallback",
+    "PHASE_QUEUED",
+    "PHASE_READING",
+    "PHASE_GRID",
+    "PHASE_SECTIONS",
+    "PHASE_LABELS",
+    "PHASE_DONE",
+    "READING_REPORT_EVERY",
+]
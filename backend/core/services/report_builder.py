@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from statistics import mean
-from typing import Dict, List, Tuple
+import os
+import threading
+import time
+from datetime import date
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from cachetools import Cache, LRUCache, TTLCache
 
 from backend.core.models import (
     CurrentReportOptions,
@@ -11,44 +15,126 @@ from backend.core.models import (
     ReportSessionPayload,
     StudentLabel,
     StudentPreview,
+    StudentSection,
     SubjectSummary,
 )
+from backend.core.progress import PHASE_LABELS, ProgressCallback
 
+# Rendered warning messages kept per student in previews and labels; the rest
+# are summarized by code and rendered on request (see warning_page).
+WARNING_SAMPLES = 3
 
-def build_current_report(
-    workbook: ParsedWorkbook, options: CurrentReportOptions
+
+class SubjectAggregate(NamedTuple):
+    name: str
+    grades: Tuple[int, ...]  # sorted descending
+    attendance: Tuple[str, ...]
+    average: Optional[float]
+
+
+class StudentAggregate(NamedTuple):
+    """Window aggregates of one student, in :func:`ordered_sections` order.
+
+    The section itself is not kept: cached aggregates must not keep the
+    (uncompacted) workbook they were built from alive.
+    """
+
+    subjects: Tuple[SubjectAggregate, ...]  # in order of first appearance
+    average: Optional[float]
+
+
+def ordered_sections(workbook: ParsedWorkbook) -> List[StudentSection]:
+    """Students in the order of labels and preview rows."""
+    return sorted(workbook.students, key=lambda s: s.fio_norm.lower())
+
+
+def aggregate_workbook(
+    workbook: ParsedWorkbook,
+    date_from: date,
+    date_to: date,
+    progress: Optional[ProgressCallback] = None,
+) -> List[StudentAggregate]:
+    """Group grades and attendance of every student by subject within the date window.
+
+    Only the window affects this step; threshold, sort order and visibility
+    are applied afterwards by :func:`project_report`.
+    """
+    aggregates: List[StudentAggregate] = []
+    total_students = len(workbook.students)
+    for section in ordered_sections(workbook):
+        table = section.entries
+        grade_column, grade_offsets = table.grades, table.grade_offsets
+        code_column, code_offsets, codes = table.attendance, table.attendance_offsets, table.codes
+
+        subjects: List[SubjectAggregate] = []
+        grade_sum = 0
+        grade_count = 0
+        for subject, positions in table.date_index().select(date_from, date_to):
+            grades: List[int] = []
+            attendance: List[str] = []
+            for position in positions:
+                grades.extend(grade_column[grade_offsets[position] : grade_offsets[position + 1]])
+                start, stop = code_offsets[position], code_offsets[position + 1]
+                if start != stop:
+                    attendance.extend(codes[index] for index in code_column[start:stop])
+
+            # grades are ints, so sum / len is the correctly rounded mean that
+            # statistics.mean returns, without its exact-fraction arithmetic
+            avg = None
+            if grades:
+                avg = round(sum(grades) / len(grades), 1)
+                grade_sum += sum(grades)
+                grade_count += len(grades)
+            grades.sort(reverse=True)
+            subjects.append(
+                SubjectAggregate(name=subject, grades=tuple(grades), attendance=tuple(attendance), average=avg)
+            )
+
+        avg_all = None
+        if grade_count:
+            avg_all = round(grade_sum / grade_count, 1)
+        aggregates.append(StudentAggregate(subjects=tuple(subjects), average=avg_all))
+        if progress:
+            progress(PHASE_LABELS, len(aggregates), total_students)
+    return aggregates
+
+
+def project_report(
+    workbook: ParsedWorkbook,
+    aggregates: List[StudentAggregate],
+    options: CurrentReportOptions,
 ) -> Tuple[List[StudentLabel], CurrentReportPreview]:
+    """Turn window aggregates into labels and preview for the display options.
+
+    Every value here comes from an already validated :class:`ParsedWorkbook`,
+    so the models are built with ``construct()``; re-validating thousands of
+    grade lists used to cost more than the aggregation itself.
+    """
     students_labels: List[StudentLabel] = []
     preview_students: List[StudentPreview] = []
     warnings: List[str] = list(workbook.global_warnings)
+    warning_counts: Dict[str, int] = {}
 
-    for section in sorted(workbook.students, key=lambda s: s.fio_norm.lower()):
-        grouped: Dict[str, Dict[str, List]] = defaultdict(lambda: {"grades": [], "attendance": []})
-        for entry in section.entries:
-            if entry.date < options.date_from or entry.date > options.date_to:
-                continue
-            subj = entry.subject.strip()
-            if not subj:
-                continue
-            grouped[subj]["grades"].extend(entry.grades)
-            grouped[subj]["attendance"].extend(entry.attendance)
-
+    for section, aggregate in zip(ordered_sections(workbook), aggregates):
+        student_counts = section.warnings.counts()
+        for code, count in student_counts.items():
+            warning_counts[code] = warning_counts.get(code, 0) + count
+        warning_samples = section.warnings[:WARNING_SAMPLES]
         subject_summaries: List[SubjectSummary] = []
         weak_subjects: List[str] = []
-        for subject, buckets in grouped.items():
-            avg = None
-            if buckets["grades"]:
-                avg = round(mean(buckets["grades"]), 1)
-            summary = SubjectSummary(
-                name=subject,
-                grades=sorted(buckets["grades"], reverse=True),
-                attendance=buckets["attendance"],
-                average=avg,
+        for subject in aggregate.subjects:
+            is_weak = subject.average is not None and subject.average < options.weak_threshold
+            subject_summaries.append(
+                SubjectSummary.construct(
+                    name=subject.name,
+                    grades=list(subject.grades),
+                    attendance=list(subject.attendance),
+                    average=subject.average,
+                    is_weak=is_weak,
+                )
             )
-            if avg is not None and avg < options.weak_threshold:
-                summary.is_weak = True
-                weak_subjects.append(subject)
-            subject_summaries.append(summary)
+            if is_weak:
+                weak_subjects.append(subject.name)
 
         if options.subject_sort == "avg_desc":
             subject_summaries.sort(
@@ -57,50 +143,188 @@ def build_current_report(
         else:
             subject_summaries.sort(key=lambda s: s.name.lower())
 
-        label = StudentLabel(
+        label = StudentLabel.construct(
             fio=section.fio_norm or section.fio_raw,
             klass=section.klass or "",
             period_from=section.period_from,
             period_to=section.period_to,
             subjects=subject_summaries,
             weak_subjects=weak_subjects,
-            warnings=section.warnings,
+            warnings=warning_samples,
         )
         students_labels.append(label)
-
-        avg_all = None
-        all_grades = [grade for summary in subject_summaries for grade in summary.grades]
-        if all_grades:
-            avg_all = round(mean(all_grades), 1)
         preview_students.append(
-            StudentPreview(
+            StudentPreview.construct(
                 fio=label.fio,
                 klass=label.klass,
                 subject_count=len(subject_summaries),
-                average_score=avg_all,
+                average_score=aggregate.average,
                 has_weak_subjects=bool(weak_subjects) if options.show_weak_subjects else False,
-                weak_subjects=weak_subjects if options.show_weak_subjects else [],
-                warnings=section.warnings,
+                weak_subjects=list(weak_subjects) if options.show_weak_subjects else [],
+                warnings=list(warning_samples),
+                warning_counts=student_counts,
+                warning_total=len(section.warnings),
             )
         )
 
-    preview = CurrentReportPreview(
+    preview = CurrentReportPreview.construct(
         session_id="",
         students=preview_students,
         warnings=warnings,
+        warning_counts=warning_counts,
+        warning_total=sum(warning_counts.values()),
     )
     return students_labels, preview
 
 
-def build_session_payload(workbook: ParsedWorkbook, options: CurrentReportOptions, session_id: str) -> ReportSessionPayload:
-    labels, preview = build_current_report(workbook, options)
+def warning_page(
+    workbook: ParsedWorkbook,
+    student: int,
+    code: Optional[str] = None,
+    offset: int = 0,
+    limit: int = 100,
+) -> Dict[str, object]:
+    """Rendered warnings of one student, optionally of one code, a page at a time.
+
+    ``student`` is the position of the student in the preview.
+    """
+    table = ordered_sections(workbook)[student].warnings
+    positions = table.positions(code)
+    items = []
+    for position in positions[offset : offset + limit]:
+        record = table.record(position)
+        items.append({**record._asdict(), "message": table.render(position)})
+    return {"student": student, "code": code, "total": len(positions), "offset": offset, "items": items}
+
+
+class AggregateCache:
+    """LRU of :func:`aggregate_workbook` results keyed by ``(workbook key, date_from, date_to)``.
+
+    The workbook key is supplied by the caller (the session id): sessions never
+    change their workbook, so the key stays valid for the session lifetime.
+    With ``ttl_seconds`` (the session TTL) an entry expires no later than the
+    session write that accompanied it; :meth:`expire` drops such entries
+    eagerly and is called by the session sweeper.
+    """
+
+    def __init__(
+        self, max_entries: int, ttl_seconds: Optional[float] = None, timer: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.cache: LRUCache = (
+            TTLCache(maxsize=max_entries, ttl=ttl_seconds, timer=timer)
+            if ttl_seconds is not None
+            else LRUCache(maxsize=max_entries)
+        )
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[List[StudentAggregate]]:
+        with self.lock:
+            aggregates = self.cache.get(key)
+            if aggregates is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return aggregates
+
+    def set(self, key: Hashable, aggregates: List[StudentAggregate]) -> None:
+        if self.cache.maxsize <= 0:
+            return
+        with self.lock:
+            self.cache[key] = aggregates
+
+    def discard(self, cache_key: Hashable) -> None:
+        with self.lock:
+            for key in [key for key in self.cache if key[0] == cache_key]:
+                del self.cache[key]
+
+    def expire(self) -> int:
+        """Drop entries older than the session TTL; returns how many were dropped."""
+        with self.lock:
+            if not isinstance(self.cache, TTLCache):
+                return 0
+            # TTLCache.__len__ itself expires, so count with the plain Cache one
+            before = Cache.__len__(self.cache)
+            self.cache.expire()
+            return before - Cache.__len__(self.cache)
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {"entries": len(self.cache), "hits": self.hits, "misses": self.misses}
+
+
+aggregate_cache = AggregateCache(
+    int(os.getenv("REPORT_AGGREGATE_CACHE_SIZE", "32")), ttl_seconds=int(os.getenv("SESSION_TTL_MIN", "45")) * 60
+)
+AGGREGATION_ENGINE = os.getenv("REPORT_AGGREGATION_ENGINE", "loop").strip().lower()
+
+
+def _aggregate(
+    workbook: ParsedWorkbook, date_from: date, date_to: date, progress: Optional[ProgressCallback]
+) -> List[StudentAggregate]:
+    if AGGREGATION_ENGINE == "numpy":
+        from backend.core.services.vector_aggregation import WorkbookFrame
+
+        aggregates = WorkbookFrame(workbook).aggregate(date_from, date_to)
+        if progress:
+            progress(PHASE_LABELS, len(aggregates), len(aggregates))
+        return aggregates
+    return aggregate_workbook(workbook, date_from, date_to, progress)
+
+
+def build_current_report(
+    workbook: ParsedWorkbook,
+    options: CurrentReportOptions,
+    progress: Optional[ProgressCallback] = None,
+    cache_key: Optional[Hashable] = None,
+) -> Tuple[List[StudentLabel], CurrentReportPreview]:
+    """Build labels and preview; with ``cache_key`` the window aggregates are reused.
+
+    Changing only ``weak_threshold``, ``subject_sort`` or ``show_weak_subjects``
+    for the same ``cache_key`` then skips the grouping pass entirely.
+    """
+    total_students = len(workbook.students)
+    if progress:
+        progress(PHASE_LABELS, 0, total_students)
+
+    key = (cache_key, options.date_from, options.date_to) if cache_key is not None else None
+    aggregates = aggregate_cache.get(key) if key is not None else None
+    if aggregates is None:
+        aggregates = _aggregate(workbook, options.date_from, options.date_to, progress)
+        if key is not None:
+            aggregate_cache.set(key, aggregates)
+    elif progress:
+        progress(PHASE_LABELS, total_students, total_students)
+    return project_report(workbook, aggregates, options)
+
+
+def build_session_payload(
+    workbook: ParsedWorkbook,
+    options: CurrentReportOptions,
+    session_id: str,
+    progress: Optional[ProgressCallback] = None,
+) -> ReportSessionPayload:
+    labels, preview = build_current_report(workbook, options, progress, cache_key=session_id)
     preview.session_id = session_id
     return ReportSessionPayload(
-        workbook=workbook,
+        workbook=workbook.compact(),
         options=options,
         preview=preview,
         labels=labels,
     )
 
 
-__all__ = ["build_current_report", "build_session_payload"]
+__all__ = [
+    "build_current_report",
+    "build_session_payload",
+    "aggregate_workbook",
+    "project_report",
+    "warning_page",
+    "ordered_sections",
+    "WARNING_SAMPLES",
+    "aggregate_cache",
+    "AggregateCache",
+    "StudentAggregate",
+    "SubjectAggregate",
+]
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.core.models import EntryTable, ParsedWorkbook, StudentSection
+from backend.core.services.report_builder import StudentAggregate, SubjectAggregate
+
+# grade values span a handful of integers; wider ranges fall back to lexsort
+MAX_HISTOGRAM_SPAN = 64
+
+
+def _as_array(values) -> np.ndarray:
+    """Zero-copy NumPy view of a stdlib ``array.array`` column."""
+    dtype = np.dtype(values.typecode)
+    return np.frombuffer(values, dtype=dtype) if len(values) else np.empty(0, dtype=dtype)
+
+
+class WorkbookFrame:
+    """All entries of a workbook as flat NumPy columns, students in label order.
+
+    Built once per workbook; every :meth:`aggregate` / :meth:`pair_stats` call
+    is then a handful of masked ``bincount``/``lexsort`` passes over the
+    whole school instead of a Python loop per entry, which pays off when the
+    same workbook is sliced into many periods.
+    """
+
+    def __init__(self, workbook: ParsedWorkbook) -> None:
+        self.sections: List[StudentSection] = sorted(workbook.students, key=lambda s: s.fio_norm.lower())
+        self.subjects: List[str] = []
+        self.codes: List[str] = []
+        subject_ids: Dict[str, int] = {}
+        code_ids: Dict[str, int] = {}
+
+        entry_student: List[np.ndarray] = []
+        entry_subject: List[np.ndarray] = []
+        entry_dates: List[np.ndarray] = []
+        grade_counts: List[np.ndarray] = []
+        grade_values: List[np.ndarray] = []
+        code_counts: List[np.ndarray] = []
+        code_values: List[np.ndarray] = []
+        for student, section in enumerate(self.sections):
+            table: EntryTable = section.entries
+            local_subjects = np.array(
+                [
+                    self._intern(subject_ids, self.subjects, name.strip()) if name.strip() else -1
+                    for name in table.subjects
+                ]
+                or [-1],
+                dtype=np.int64,
+            )
+            local_codes = np.array(
+                [self._intern(code_ids, self.codes, code) for code in table.codes] or [0], dtype=np.int64
+            )
+            entry_student.append(np.full(len(table), student, dtype=np.int64))
+            entry_subject.append(local_subjects[_as_array(table.subject_idx)])
+            entry_dates.append(_as_array(table.dates).astype(np.int64))
+            grade_counts.append(np.diff(_as_array(table.grade_offsets)).astype(np.int64))
+            grade_values.append(_as_array(table.grades).astype(np.int64))
+            code_counts.append(np.diff(_as_array(table.attendance_offsets)).astype(np.int64))
+            code_values.append(local_codes[_as_array(table.attendance)])
+
+        empty = np.empty(0, dtype=np.int64)
+        self.entry_student = np.concatenate(entry_student) if entry_student else empty
+        self.entry_subject = np.concatenate(entry_subject) if entry_subject else empty
+        self.entry_dates = np.concatenate(entry_dates) if entry_dates else empty
+        self.grades = np.concatenate(grade_values) if grade_values else empty
+        self.codes_column = np.concatenate(code_values) if code_values else empty
+        entries = np.arange(len(self.entry_dates), dtype=np.int64)
+        self.grade_entry = np.repeat(entries, np.concatenate(grade_counts)) if grade_counts else empty
+        self.code_entry = np.repeat(entries, np.concatenate(code_counts)) if code_counts else empty
+        self.entry_key = self.entry_student * max(len(self.subjects), 1) + self.entry_subject
+
+    @staticmethod
+    def _intern(ids: Dict[str, int], names: List[str], name: str) -> int:
+        index = ids.get(name)
+        if index is None:
+            index = ids[name] = len(names)
+            names.append(name)
+        return index
+
+    def _window(self, date_from: date, date_to: date) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Pairs in range as ``(sorted pair keys, entry mask, pair order)``.
+
+        Pair order follows the first in-range entry of every pair, which keeps
+        students contiguous and subjects in the order a linear scan finds them.
+        """
+        in_window = (
+            (self.entry_dates >= date_from.toordinal())
+            & (self.entry_dates <= date_to.toordinal())
+            & (self.entry_subject >= 0)
+        )
+        positions = np.flatnonzero(in_window)
+        keys, first = np.unique(self.entry_key[positions], return_index=True)
+        order = np.argsort(positions[first], kind="stable")
+        return keys, in_window, order
+
+    def _grade_sums(self, keys: np.ndarray, in_window: np.ndarray):
+        mask = in_window[self.grade_entry]
+        pair = np.searchsorted(keys, self.entry_key[self.grade_entry[mask]])
+        values = self.grades[mask]
+        count = np.bincount(pair, minlength=len(keys))
+        total = np.bincount(pair, weights=values, minlength=len(keys)).astype(np.int64)
+        return pair, values, count, total
+
+    @staticmethod
+    def _sort_grades(pair: np.ndarray, values: np.ndarray, pairs: int) -> List[int]:
+        """Grades grouped by pair, descending within a pair."""
+        if not len(values):
+            return []
+        low, high = int(values.min()), int(values.max())
+        span = high - low + 1
+        if span > MAX_HISTOGRAM_SPAN:
+            return values[np.lexsort((-values, pair))].tolist()
+        # a per-pair histogram expanded back in descending order: no sort needed
+        histogram = np.bincount(pair * span + (high - values), minlength=pairs * span)
+        return np.repeat(np.tile(np.arange(high, low - 1, -1), pairs), histogram).tolist()
+
+    def aggregate(self, date_from: date, date_to: date) -> List[StudentAggregate]:
+        """Same result as :func:`aggregate_workbook` for the window, computed in bulk."""
+        keys, in_window, order = self._window(date_from, date_to)
+        pair, values, count, total = self._grade_sums(keys, in_window)
+
+        sorted_grades = self._sort_grades(pair, values, len(keys))
+        grade_starts = np.concatenate(([0], np.cumsum(count))).tolist()
+
+        code_mask = in_window[self.code_entry]
+        code_pair = np.searchsorted(keys, self.entry_key[self.code_entry[code_mask]])
+        code_order = np.argsort(code_pair, kind="stable")
+        sorted_codes = [self.codes[index] for index in self.codes_column[code_mask][code_order].tolist()]
+        code_starts = np.concatenate(([0], np.cumsum(np.bincount(code_pair, minlength=len(keys))))).tolist()
+
+        width = max(len(self.subjects), 1)
+        student_count = np.bincount(keys // width, weights=count, minlength=len(self.sections)).astype(np.int64)
+        student_total = np.bincount(keys // width, weights=total, minlength=len(self.sections)).astype(np.int64)
+
+        counts = count.tolist()
+        totals = total.tolist()
+        by_student: List[List[SubjectAggregate]] = [[] for _ in self.sections]
+        for index in order.tolist():
+            key = int(keys[index])
+            avg = round(totals[index] / counts[index], 1) if counts[index] else None
+            by_student[key // width].append(
+                SubjectAggregate(
+                    name=self.subjects[key % width],
+                    grades=tuple(sorted_grades[grade_starts[index] : grade_starts[index + 1]]),
+                    attendance=tuple(sorted_codes[code_starts[index] : code_starts[index + 1]]),
+                    average=avg,
+                )
+            )
+
+        aggregates: List[StudentAggregate] = []
+        for student, subjects in enumerate(by_student):
+            grades_in_range = int(student_count[student])
+            avg_all = round(int(student_total[student]) / grades_in_range, 1) if grades_in_range else None
+            aggregates.append(StudentAggregate(subjects=tuple(subjects), average=avg_all))
+        return aggregates
+
+    def pair_stats(self, date_from: date, date_to: date, weak_threshold: Optional[float] = None) -> pd.DataFrame:
+        """Grade count, sum, mean and weak flag of every (student, subject) pair in the window.
+
+        Means use the label rounding (Python ``round`` to one decimal), so
+        ``is_weak`` agrees with the labels for the same threshold.
+        """
+        keys, in_window, order = self._window(date_from, date_to)
+        _, _, count, total = self._grade_sums(keys, in_window)
+        keys, count, total = keys[order], count[order], total[order]
+        width = max(len(self.subjects), 1)
+        mean = [round(s / c, 1) if c else None for s, c in zip(total.tolist(), count.tolist())]
+        frame = pd.DataFrame(
+            {
+                "fio": [
+                    self.sections[index].fio_norm or self.sections[index].fio_raw
+                    for index in (keys // width).tolist()
+                ],
+                "subject": [self.subjects[index] for index in (keys % width).tolist()],
+                "count": count,
+                "sum": total,
+                "mean": pd.array(mean, dtype="Float64"),
+            }
+        )
+        if weak_threshold is not None:
+            frame["is_weak"] = (frame["mean"] < weak_threshold).fillna(False).astype(bool)
+        return frame
+
+
+def aggregate_periods(
+    workbook: ParsedWorkbook, periods: Iterable[Tuple[date, date]]
+) -> List[List[StudentAggregate]]:
+    """Aggregates for several date windows of one workbook, sharing a single frame."""
+    frame = WorkbookFrame(workbook)
+    return [frame.aggregate(date_from, date_to) for date_from, date_to in periods]
+
+
+__all__ = ["WorkbookFrame", "aggregate_periods"]
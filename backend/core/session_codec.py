@@ -0,0 +1,504 @@
+from __future__ import annotations
+
+import os
+import struct
+import sys
+import zlib
+from array import array
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.core.models import (
+    CurrentReportOptions,
+    CurrentReportPreview,
+    EntryTable,
+    ParsedWorkbook,
+    ReportSessionPayload,
+    StudentLabel,
+    StudentPreview,
+    StudentSection,
+    SubjectSummary,
+    WarningTable,
+)
+
+try:
+    import zstandard  # type: ignore
+except Exception:  # pragma: no cover
+    zstandard = None
+
+MAGIC = b"QLS"
+# Bump whenever the layout below or the session models change.
+CODEC_VERSION = 2
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+COMPRESSIONS = {"none": COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "zstd": COMPRESSION_ZSTD}
+
+_HEADER = struct.Struct("<3sBBB")  # magic, version, byte order, compression
+_U32 = struct.Struct("<I")
+_OPT_INT = struct.Struct("<Bq")
+_OPT_FLOAT = struct.Struct("<Bd")
+_OPTIONS = struct.Struct("<IIdBB")
+_BYTE_ORDER = 0 if sys.byteorder == "little" else 1
+_NONE = 0xFFFFFFFF
+
+# What a truncated or corrupted body makes decompression and _Reader raise.
+_CORRUPTION_ERRORS: Tuple[type, ...] = (struct.error, zlib.error, IndexError, KeyError, ValueError, OverflowError)
+if zstandard is not None:
+    _CORRUPTION_ERRORS += (zstandard.ZstdError,)
+
+
+class SessionCodecError(ValueError):
+    pass
+
+
+class _Writer:
+    """Appends fields to one buffer; strings go to a shared table and are written as indices."""
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+        self.table: Dict[str, int] = {}
+
+    def _intern(self, value: str) -> int:
+        index = self.table.get(value)
+        if index is None:
+            index = self.table[value] = len(self.table)
+        return index
+
+    def uint(self, value: int) -> None:
+        self.buffer += _U32.pack(value)
+
+    def string(self, value: Optional[str]) -> None:
+        self.buffer += _U32.pack(_NONE if value is None else self._intern(value))
+
+    def strings(self, values: List[str]) -> None:
+        self.buffer += _U32.pack(len(values))
+        self.buffer += array("I", [self._intern(value) for value in values]).tobytes()
+
+    def opt_int(self, value: Optional[int]) -> None:
+        self.buffer += _OPT_INT.pack(value is not None, value or 0)
+
+    def opt_float(self, value: Optional[float]) -> None:
+        self.buffer += _OPT_FLOAT.pack(value is not None, value or 0.0)
+
+    def opt_date(self, value: Optional[date]) -> None:
+        self.buffer += _U32.pack(value.toordinal() if value else 0)
+
+    def flags(self, *values: bool) -> None:
+        self.buffer += bytes(values)
+
+    def column(self, values: "array") -> None:
+        self.buffer += values.typecode.encode("ascii") + _U32.pack(len(values))
+        self.buffer += values.tobytes()
+
+    def finish(self) -> bytes:
+        strings = list(self.table)
+        text = "".join(strings).encode("utf-8")
+        lengths = array("I", [len(value) for value in strings]).tobytes()
+        return _U32.pack(len(strings)) + lengths + _U32.pack(len(text)) + text + bytes(self.buffer)
+
+
+class _Reader:
+    def __init__(self, data: memoryview) -> None:
+        self.data = data
+        count = _U32.unpack_from(data, 0)[0]
+        lengths = array("I")
+        lengths.frombytes(data[4 : 4 + 4 * count])
+        offset = 4 + 4 * count
+        size = _U32.unpack_from(data, offset)[0]
+        text = bytes(data[offset + 4 : offset + 4 + size]).decode("utf-8")
+        self.table: List[str] = []
+        position = 0
+        for length in lengths:
+            self.table.append(text[position : position + length])
+            position += length
+        self.offset = offset + 4 + size
+
+    def uint(self) -> int:
+        value = _U32.unpack_from(self.data, self.offset)[0]
+        self.offset += 4
+        return value
+
+    def string(self) -> Optional[str]:
+        index = self.uint()
+        return None if index == _NONE else self.table[index]
+
+    def strings(self) -> List[str]:
+        count = self.uint()
+        indices = array("I")
+        indices.frombytes(self.data[self.offset : self.offset + 4 * count])
+        self.offset += 4 * count
+        table = self.table
+        return [table[index] for index in indices]
+
+    def opt_int(self) -> Optional[int]:
+        present, value = _OPT_INT.unpack_from(self.data, self.offset)
+        self.offset += _OPT_INT.size
+        return value if present else None
+
+    def opt_float(self) -> Optional[float]:
+        present, value = _OPT_FLOAT.unpack_from(self.data, self.offset)
+        self.offset += _OPT_FLOAT.size
+        return value if present else None
+
+    def opt_date(self) -> Optional[date]:
+        ordinal = self.uint()
+        return date.fromordinal(ordinal) if ordinal else None
+
+    def flags(self, count: int) -> List[bool]:
+        values = [bool(flag) for flag in self.data[self.offset : self.offset + count]]
+        self.offset += count
+        return values
+
+    def column(self) -> "array":
+        typecode = chr(self.data[self.offset])
+        count = _U32.unpack_from(self.data, self.offset + 1)[0]
+        values = array(typecode)
+        start = self.offset + 5
+        values.frombytes(self.data[start : start + count * values.itemsize])
+        self.offset = start + count * values.itemsize
+        return values
+
+
+def _write_table(writer: _Writer, table: EntryTable) -> None:
+    writer.string(table.student_fio_raw)
+    writer.string(table.student_fio_norm)
+    writer.string(table.klass)
+    writer.strings(table.subjects)
+    writer.strings(table.codes)
+    for name in ("subject_idx", "dates", "grade_offsets", "grades", "attendance_offsets", "attendance"):
+        writer.column(getattr(table, name))
+    writer.flags(table.has_details)
+    if table.has_details:
+        writer.strings(table.raw_text)
+        writer.column(table.rows)
+        writer.column(table.cols)
+
+
+def _read_table(reader: _Reader) -> EntryTable:
+    table = EntryTable(reader.string(), reader.string(), reader.string())
+    table.subjects = reader.strings()
+    table.codes = reader.strings()
+    for name in ("subject_idx", "dates", "grade_offsets", "grades", "attendance_offsets", "attendance"):
+        setattr(table, name, reader.column())
+    table._subject_lookup = {subject: index for index, subject in enumerate(table.subjects)}
+    table._code_lookup = {code: index for index, code in enumerate(table.codes)}
+    if reader.flags(1)[0]:
+        table.raw_text = reader.strings()
+        table.rows = reader.column()
+        table.cols = reader.column()
+    else:
+        table.raw_text = table.rows = table.cols = None
+    return table
+
+
+def _write_warnings(writer: _Writer, table: WarningTable) -> None:
+    writer.string(table.fio)
+    writer.strings(table.codes)
+    writer.strings(table.subjects)
+    writer.strings(table.details)
+    for name in ("code_idx", "subject_idx", "rows", "cols", "detail_idx"):
+        writer.column(getattr(table, name))
+
+
+def _read_warnings(reader: _Reader) -> WarningTable:
+    table = WarningTable(reader.string())
+    table.codes = reader.strings()
+    table.subjects = reader.strings()
+    table.details = reader.strings()
+    for name in ("code_idx", "subject_idx", "rows", "cols", "detail_idx"):
+        setattr(table, name, reader.column())
+    table.reindex()
+    return table
+
+
+def _write_counts(writer: _Writer, counts: Dict[str, int]) -> None:
+    writer.strings(list(counts))
+    writer.column(array("I", counts.values()))
+
+
+def _read_counts(reader: _Reader) -> Dict[str, int]:
+    return dict(zip(reader.strings(), reader.column().tolist()))
+
+
+def _write_workbook(writer: _Writer, workbook: ParsedWorkbook) -> None:
+    writer.string(workbook.school_name)
+    writer.opt_int(workbook.academic_year_start)
+    writer.opt_int(workbook.academic_year_end)
+    writer.strings(workbook.global_warnings)
+    writer.uint(len(workbook.students))
+    for section in workbook.students:
+        writer.string(section.fio_raw)
+        writer.string(section.fio_norm)
+        writer.string(section.klass)
+        writer.opt_date(section.period_from)
+        writer.opt_date(section.period_to)
+        writer.strings(list(section.attendance_legend))
+        writer.strings(list(section.attendance_legend.values()))
+        _write_warnings(writer, section.warnings)
+        _write_table(writer, section.entries)
+
+
+def _write_options(writer: _Writer, options: CurrentReportOptions) -> None:
+    writer.buffer += _OPTIONS.pack(
+        options.date_from.toordinal(),
+        options.date_to.toordinal(),
+        options.weak_threshold,
+        options.show_weak_subjects,
+        options.show_guides,
+    )
+    writer.string(options.subject_sort)
+
+
+def _write_preview(writer: _Writer, preview: CurrentReportPreview) -> None:
+    writer.string(preview.session_id)
+    writer.strings(preview.warnings)
+    _write_counts(writer, preview.warning_counts)
+    writer.uint(len(preview.students))
+    for student in preview.students:
+        writer.string(student.fio)
+        writer.string(student.klass)
+        writer.uint(student.subject_count)
+        writer.opt_float(student.average_score)
+        writer.flags(student.has_weak_subjects)
+        writer.strings(student.weak_subjects)
+        writer.strings(student.warnings)
+        _write_counts(writer, student.warning_counts)
+
+
+def _write_labels(writer: _Writer, labels: List[StudentLabel]) -> None:
+    writer.uint(len(labels))
+    for label in labels:
+        writer.string(label.fio)
+        writer.string(label.klass)
+        writer.opt_date(label.period_from)
+        writer.opt_date(label.period_to)
+        writer.strings(label.weak_subjects)
+        writer.strings(label.warnings)
+        writer.uint(len(label.subjects))
+        for subject in label.subjects:
+            writer.string(subject.name)
+            writer.column(array("h", subject.grades))
+            writer.strings(subject.attendance)
+            writer.opt_float(subject.average)
+            writer.flags(subject.is_weak)
+
+
+# Readers below rebuild the models with construct(): the data was produced by
+# the writers above from validated models, so validation is skipped entirely.
+
+
+def _read_workbook(reader: _Reader) -> ParsedWorkbook:
+    school_name = reader.string()
+    year_start = reader.opt_int()
+    year_end = reader.opt_int()
+    global_warnings = reader.strings()
+    students = []
+    for _ in range(reader.uint()):
+        fio_raw, fio_norm, klass = reader.string(), reader.string(), reader.string()
+        period_from, period_to = reader.opt_date(), reader.opt_date()
+        legend = dict(zip(reader.strings(), reader.strings()))
+        students.append(
+            StudentSection.construct(
+                fio_raw=fio_raw,
+                fio_norm=fio_norm,
+                klass=klass,
+                period_from=period_from,
+                period_to=period_to,
+                attendance_legend=legend,
+                warnings=_read_warnings(reader),
+                entries=_read_table(reader),
+            )
+        )
+    return ParsedWorkbook.construct(
+        school_name=school_name,
+        academic_year_start=year_start,
+        academic_year_end=year_end,
+        students=students,
+        global_warnings=global_warnings,
+    )
+
+
+def _read_options(reader: _Reader) -> CurrentReportOptions:
+    date_from, date_to, weak_threshold, show_weak, show_guides = _OPTIONS.unpack_from(reader.data, reader.offset)
+    reader.offset += _OPTIONS.size
+    return CurrentReportOptions.construct(
+        date_from=date.fromordinal(date_from),
+        date_to=date.fromordinal(date_to),
+        weak_threshold=weak_threshold,
+        show_weak_subjects=bool(show_weak),
+        subject_sort=reader.string(),
+        show_guides=bool(show_guides),
+    )
+
+
+def _read_preview(reader: _Reader) -> CurrentReportPreview:
+    session_id = reader.string()
+    warnings = reader.strings()
+    warning_counts = _read_counts(reader)
+    students = []
+    for _ in range(reader.uint()):
+        student = StudentPreview.construct(
+            fio=reader.string(),
+            klass=reader.string(),
+            subject_count=reader.uint(),
+            average_score=reader.opt_float(),
+            has_weak_subjects=reader.flags(1)[0],
+            weak_subjects=reader.strings(),
+            warnings=reader.strings(),
+            warning_counts=_read_counts(reader),
+        )
+        student.warning_total = sum(student.warning_counts.values())
+        students.append(student)
+    return CurrentReportPreview.construct(
+        session_id=session_id,
+        students=students,
+        warnings=warnings,
+        warning_counts=warning_counts,
+        warning_total=sum(warning_counts.values()),
+    )
+
+
+def _read_labels(reader: _Reader) -> List[StudentLabel]:
+    labels = []
+    for _ in range(reader.uint()):
+        fio, klass = reader.string(), reader.string()
+        period_from, period_to = reader.opt_date(), reader.opt_date()
+        weak_subjects, warnings = reader.strings(), reader.strings()
+        subjects = []
+        for _ in range(reader.uint()):
+            subjects.append(
+                SubjectSummary.construct(
+                    name=reader.string(),
+                    grades=reader.column().tolist(),
+                    attendance=reader.strings(),
+                    average=reader.opt_float(),
+                    is_weak=reader.flags(1)[0],
+                )
+            )
+        labels.append(
+            StudentLabel.construct(
+                fio=fio,
+                klass=klass,
+                period_from=period_from,
+                period_to=period_to,
+                subjects=subjects,
+                weak_subjects=weak_subjects,
+                warnings=warnings,
+            )
+        )
+    return labels
+
+
+# Session parts in the order encode_payload writes them; each can also be
+# stored and read on its own (see encode_parts / decode_part).
+SESSION_PARTS = ("workbook", "options", "preview", "labels")
+_WRITERS = {"workbook": _write_workbook, "options": _write_options, "preview": _write_preview, "labels": _write_labels}
+_READERS = {"workbook": _read_workbook, "options": _read_options, "preview": _read_preview, "labels": _read_labels}
+
+
+def _compress(body: bytes, compression: int) -> bytes:
+    if compression == COMPRESSION_ZLIB:
+        return zlib.compress(body, 1)
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise SessionCodecError("zstd compression requires the zstandard package")
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return body
+
+
+def _decompress(body: bytes, compression: int) -> bytes:
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(body)
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise SessionCodecError("zstd compression requires the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(body)
+    if compression != COMPRESSION_NONE:
+        raise SessionCodecError(f"unknown compression {compression}")
+    return body
+
+
+def default_compression() -> str:
+    return os.getenv("SESSION_COMPRESSION", "zlib").strip().lower()
+
+
+def _encode(parts: Dict[str, Any], compression: Optional[str]) -> bytes:
+    name = compression or default_compression()
+    if name not in COMPRESSIONS:
+        raise SessionCodecError(f"unknown compression {name!r}")
+    writer = _Writer()
+    for part, value in parts.items():
+        _WRITERS[part](writer, value)
+    body = _compress(writer.finish(), COMPRESSIONS[name])
+    return _HEADER.pack(MAGIC, CODEC_VERSION, _BYTE_ORDER, COMPRESSIONS[name]) + body
+
+
+def _read_parts(body: bytes, compression: int, parts: Tuple[str, ...]) -> List[Any]:
+    reader = _Reader(memoryview(_decompress(body, compression)))
+    return [_READERS[part](reader) for part in parts]
+
+
+def _decode(data: bytes, parts: Tuple[str, ...]) -> List[Any]:
+    if len(data) < _HEADER.size:
+        raise SessionCodecError("truncated session payload")
+    magic, version, byte_order, compression = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SessionCodecError("not a session payload")
+    if version != CODEC_VERSION:
+        raise SessionCodecError(f"unsupported session codec version {version}")
+    if byte_order != _BYTE_ORDER:
+        raise SessionCodecError("session payload was written on a host with another byte order")
+    try:
+        return _read_parts(data[_HEADER.size :], compression, parts)
+    except SessionCodecError:
+        raise
+    except _CORRUPTION_ERRORS as exc:
+        reason = f"corrupted session payload: {type(exc).__name__}: {exc}"
+    # raised outside the handler, so the traceback does not keep the reader
+    # frames and their slices of ``data`` (possibly a memory-mapped file) alive
+    raise SessionCodecError(reason)
+
+
+def encode_payload(payload: ReportSessionPayload, compression: Optional[str] = None) -> bytes:
+    """Serialize a session payload into the versioned binary layout."""
+    return _encode({part: getattr(payload, part) for part in SESSION_PARTS}, compression)
+
+
+def decode_payload(data: bytes) -> ReportSessionPayload:
+    """Inverse of :func:`encode_payload`; JSON written by older versions is still accepted."""
+    if data[:1] == b"{":
+        return ReportSessionPayload.parse_raw(data)
+    return ReportSessionPayload.construct(**dict(zip(SESSION_PARTS, _decode(data, SESSION_PARTS))))
+
+
+def encode_parts(payload: ReportSessionPayload, compression: Optional[str] = None) -> Dict[str, bytes]:
+    """Every part of the payload as a separate blob, so a reader can fetch just one."""
+    return {part: _encode({part: getattr(payload, part)}, compression) for part in SESSION_PARTS}
+
+
+def encode_part(part: str, value: Any, compression: Optional[str] = None) -> bytes:
+    """One part on its own, e.g. a parsed workbook outside of any session."""
+    if part not in _READERS:
+        raise SessionCodecError(f"unknown session part {part!r}")
+    return _encode({part: value}, compression)
+
+
+def decode_part(part: str, data: bytes) -> Any:
+    if part not in _READERS:
+        raise SessionCodecError(f"unknown session part {part!r}")
+    return _decode(data, (part,))[0]
+
+
+__all__ = [
+    "CODEC_VERSION",
+    "SESSION_PARTS",
+    "SessionCodecError",
+    "decode_part",
+    "decode_payload",
+    "default_compression",
+    "encode_part",
+    "encode_parts",
+    "encode_payload",
+]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.core.jobs import get_job_store
+from backend.core.metrics import TimingStats
+from backend.core.services.report_builder import aggregate_cache
+from backend.core.sessions import get_session_store
+
+logger = logging.getLogger(__name__)
+
+
+class SessionSweeper:
+    """Periodic task that purges expired sessions from the session store.
+
+    The in-memory TTL cache only expires entries when it is touched and the
+    disk store only when a file is read or written, so without the sweeper an
+    idle worker keeps expired reports around. Sweeps run in the thread pool.
+    """
+
+    def __init__(self, interval_seconds: float) -> None:
+        self.interval = interval_seconds
+        self.task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.removed = 0
+        self.errors = 0
+        self.last_run: Optional[float] = None
+        self.duration = TimingStats()
+
+    def start(self) -> None:
+        if self.interval > 0 and self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+    async def sweep_once(self) -> int:
+        started = time.perf_counter()
+        removed = await run_in_threadpool(get_session_store().sweep)
+        # window aggregates of the swept sessions would otherwise stay until evicted
+        aggregate_cache.expire()
+        await run_in_threadpool(get_job_store().sweep)
+        self.duration.observe(time.perf_counter() - started)
+        self.runs += 1
+        self.removed += removed
+        self.last_run = time.time()
+        return removed
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep_once()
+            except Exception:
+                self.errors += 1
+                logger.exception("Session sweep failed")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "interval_seconds": self.interval,
+            "running": self.task is not None,
+            "runs": self.runs,
+            "removed": self.removed,
+            "errors": self.errors,
+            "last_run": self.last_run,
+            "duration": self.duration.snapshot(),
+        }
+
+
+_session_sweeper: Optional[SessionSweeper] = None
+
+
+def get_session_sweeper() -> SessionSweeper:
+    global _session_sweeper
+    if _session_sweeper is None:
+        _session_sweeper = SessionSweeper(float(os.getenv("SESSION_SWEEP_SECONDS", "60")))
+    return _session_sweeper
+
+
+__all__ = ["SessionSweeper", "get_session_sweeper"]
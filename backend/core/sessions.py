@@ -1,19 +1,64 @@
 from __future__ import annotations
 
+import mmap
 import os
+import re
+import struct
+import tempfile
 import threading
+import time
 import uuid
 from abc import ABC, abstractmethod
-from typing import Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-from cachetools import TTLCache
+from cachetools import Cache, TTLCache
+from starlette.concurrency import run_in_threadpool
 
 from backend.core.models import ReportSessionPayload
+from backend.core.parse_cache import estimate_workbook_bytes
+from backend.core.session_codec import (
+    SESSION_PARTS,
+    SessionCodecError,
+    decode_part,
+    decode_payload,
+    default_compression,
+    encode_parts,
+)
+from backend.core.storage import private_directory
 
 try:
     import redis  # type: ignore
+    import redis.asyncio as aioredis  # type: ignore
 except Exception:  # pragma: no cover
     redis = None
+    aioredis = None
+
+# Measured on synthetic exports: labels and preview cost ~1.5 KB per student
+# subject plus ~10 bytes per grade shown on the labels.
+LABEL_SUBJECT_BYTES = 1500
+LABEL_GRADE_BYTES = 10
+
+# Hash field of a Redis session that changes on every write.
+REVISION_FIELD = "rev"
+
+_SESSION_KEY = re.compile(r"[A-Za-z0-9_-]{1,128}")
+_SESSION_SUFFIX = ".session"
+# magic, then the byte length of every part in SESSION_PARTS order
+_DISK_MAGIC = b"QLSD"
+_DISK_INDEX = struct.Struct("<4s" + "Q" * len(SESSION_PARTS))
+
+
+def estimate_payload_bytes(payload: ReportSessionPayload) -> int:
+    size = estimate_workbook_bytes(payload.workbook)
+    for label in payload.labels:
+        size += LABEL_SUBJECT_BYTES * len(label.subjects)
+        size += LABEL_GRADE_BYTES * sum(len(subject.grades) for subject in label.subjects)
+    return size
+
+
+class SessionTooLarge(ValueError):
+    pass
 
 
 class SessionStore(ABC):
@@ -29,15 +74,92 @@ class SessionStore(ABC):
     def delete(self, key: str) -> None:
         ...
 
+    def get_parts(self, key: str, parts: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """Only the requested parts of a session (see ``SESSION_PARTS``).
+
+        Stores that keep whole payloads in memory answer from :meth:`get`;
+        remote stores override this to avoid transferring the rest.
+        """
+        payload = self.get(key)
+        if payload is None:
+            return None
+        return {part: getattr(payload, part) for part in parts}
+
+    # Async variants for request handlers. The defaults call the sync methods
+    # directly, which is right for stores without network I/O.
+
+    async def aset(self, key: str, value: ReportSessionPayload) -> None:
+        self.set(key, value)
+
+    async def aget_parts(self, key: str, parts: Sequence[str]) -> Optional[Dict[str, Any]]:
+        return self.get_parts(key, parts)
+
+    async def adelete(self, key: str) -> None:
+        self.delete(key)
+
+    def sweep(self) -> int:
+        """Purge expired sessions; returns how many were removed.
+
+        Stores whose backend expires keys by itself (Redis) have nothing to do.
+        """
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": type(self).__name__}
+
+
+class _BudgetedTTLCache(TTLCache):
+    """TTLCache bounded by the estimated payload bytes as well as by entry count.
+
+    Expired sessions go first, then the least recently used ones.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: int, timer: Callable[[], float] = time.monotonic) -> None:
+        super().__init__(maxsize=max_bytes, ttl=ttl, timer=timer, getsizeof=estimate_payload_bytes)
+        self.max_entries = max_entries
+        self.evictions = 0
+        self.expirations = 0
+
+    def expire(self, time=None) -> None:
+        # TTLCache.__len__ itself expires, so count with the plain Cache one
+        before = Cache.__len__(self)
+        super().expire(time)
+        self.expirations += before - Cache.__len__(self)
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+    def __setitem__(self, key, value) -> None:
+        if key not in self:
+            with self.timer as now:
+                self.expire(now)
+            while len(self) >= self.max_entries:
+                self.popitem()
+        super().__setitem__(key, value)
+
 
 class InMemorySessionStore(SessionStore):
-    def __init__(self, ttl_seconds: int = 1800, max_entries: int = 256) -> None:
-        self.cache: TTLCache[str, ReportSessionPayload] = TTLCache(maxsize=max_entries, ttl=ttl_seconds)
+    def __init__(
+        self,
+        ttl_seconds: int = 1800,
+        max_entries: int = 256,
+        max_bytes: Optional[int] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_bytes is None:
+            max_bytes = int(os.getenv("SESSION_MEMORY_MB", "1024")) * 1024 * 1024
+        self.cache: _BudgetedTTLCache = _BudgetedTTLCache(max_entries, max_bytes, ttl_seconds, timer)
         self.lock = threading.Lock()
 
     def set(self, key: str, value: ReportSessionPayload) -> None:
         with self.lock:
-            self.cache[key] = value
+            try:
+                self.cache[key] = value
+            except ValueError as exc:
+                # cachetools refuses a single value larger than the whole budget
+                raise SessionTooLarge("Отчёт слишком большой для хранения в сессии") from exc
 
     def get(self, key: str) -> Optional[ReportSessionPayload]:
         with self.lock:
@@ -48,27 +170,441 @@ class InMemorySessionStore(SessionStore):
             if key in self.cache:
                 del self.cache[key]
 
+    def sweep(self) -> int:
+        with self.lock:
+            before = self.cache.expirations
+            self.cache.expire()
+            return self.cache.expirations - before
 
-class RedisSessionStore(SessionStore):  # pragma: no cover - requires redis
-    def __init__(self, url: str, ttl_seconds: int) -> None:
-        if redis is None:
-            raise RuntimeError("Redis support not available - install redis-py")
-        self.client = redis.Redis.from_url(url)
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            self.cache.expire()
+            return {
+                "backend": type(self).__name__,
+                "entries": len(self.cache),
+                "bytes": int(self.cache.currsize),
+                "max_entries": self.cache.max_entries,
+                "max_bytes": int(self.cache.maxsize),
+                "evictions": self.cache.evictions,
+                "expirations": self.cache.expirations,
+            }
+
+
+class DiskSessionStore(SessionStore):
+    """Sessions as files in a local directory, shared by all workers on one host.
+
+    A file holds the encoded parts of :func:`encode_parts` behind a small
+    index of their lengths. Reads memory-map the file and decode only the
+    requested parts. Files are written atomically. A session expires
+    ``ttl_seconds`` after its last write, judged by the file's mtime.
+    Expired files are removed on access and by :meth:`sweep`, which writes
+    run at most once per ``sweep_interval`` seconds. The async methods do the
+    file I/O in the thread pool. The directory is private to the user running
+    the app (see :func:`private_directory`).
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ttl_seconds: int,
+        compression: Optional[str] = None,
+        sweep_interval: float = 60.0,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        self.directory = private_directory(directory)
         self.ttl = ttl_seconds
+        self.compression = compression or default_compression()
+        self.sweep_interval = sweep_interval
+        self.timer = timer
+        self.lock = threading.Lock()
+        self.expirations = 0
+        self._last_sweep = timer()
+
+    def _path(self, key: str) -> Optional[Path]:
+        # keys come from request parameters and must not escape the directory
+        if not _SESSION_KEY.fullmatch(key):
+            return None
+        return self.directory / f"{key}{_SESSION_SUFFIX}"
+
+    def _expired(self, mtime: float) -> bool:
+        return self.timer() - mtime > self.ttl
+
+    def _expire(self, path: Path) -> None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            return
+        with self.lock:
+            self.expirations += 1
 
     def set(self, key: str, value: ReportSessionPayload) -> None:
-        self.client.setex(key, self.ttl, value.json())
+        path = self._path(key)
+        if path is None:
+            raise ValueError(f"invalid session key {key!r}")
+        blobs = encode_parts(value, self.compression)
+        index = _DISK_INDEX.pack(_DISK_MAGIC, *(len(blobs[part]) for part in SESSION_PARTS))
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(index)
+            for part in SESSION_PARTS:
+                handle.write(blobs[part])
+        os.replace(tmp_name, path)
+        if self.timer() - self._last_sweep >= self.sweep_interval:
+            self.sweep()
 
     def get(self, key: str) -> Optional[ReportSessionPayload]:
-        payload = self.client.get(key)
-        if not payload:
+        parts = self.get_parts(key, SESSION_PARTS)
+        return ReportSessionPayload.construct(**parts) if parts is not None else None
+
+    def get_parts(self, key: str, parts: Sequence[str]) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        if path is None:
+            return None
+        try:
+            with path.open("rb") as handle:
+                expired = self._expired(os.fstat(handle.fileno()).st_mtime)
+                if not expired:
+                    with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        decoded = self._decode(memoryview(mapped), parts)
+                    if decoded is not None:
+                        return decoded
+        except FileNotFoundError:
             return None
-        return ReportSessionPayload.parse_raw(payload)
+        except ValueError:
+            # mmap refuses an empty file
+            expired = False
+        if expired:
+            self._expire(path)
+        else:
+            # a truncated or corrupted file will never decode; drop it like a miss
+            self.delete(key)
+        return None
+
+    @staticmethod
+    def _decode(view: memoryview, parts: Sequence[str]) -> Optional[Dict[str, Any]]:
+        # every slice of the mapping must be gone before it is closed, so
+        # decoding errors (the codec reports them all as SessionCodecError)
+        # are turned into a miss right here, inside the mapping
+        try:
+            magic, *lengths = _DISK_INDEX.unpack_from(view)
+            if magic != _DISK_MAGIC:
+                return None
+            offsets: Dict[str, Tuple[int, int]] = {}
+            start = _DISK_INDEX.size
+            for part, length in zip(SESSION_PARTS, lengths):
+                offsets[part] = (start, start + length)
+                start += length
+            return {part: decode_part(part, view[slice(*offsets[part])]) for part in parts}
+        except (struct.error, SessionCodecError):
+            return None
+        finally:
+            view.release()
+
+    def delete(self, key: str) -> None:
+        path = self._path(key)
+        if path is not None:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    async def aset(self, key: str, value: ReportSessionPayload) -> None:
+        await run_in_threadpool(self.set, key, value)
+
+    async def aget_parts(self, key: str, parts: Sequence[str]) -> Optional[Dict[str, Any]]:
+        return await run_in_threadpool(self.get_parts, key, parts)
+
+    async def adelete(self, key: str) -> None:
+        await run_in_threadpool(self.delete, key)
+
+    def _files(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_SESSION_SUFFIX):
+                try:
+                    yield entry.path, entry.stat()
+                except FileNotFoundError:
+                    continue
+
+    def sweep(self) -> int:
+        """Remove expired session files; returns how many were removed."""
+        self._last_sweep = self.timer()
+        removed = 0
+        for path, stat in list(self._files()):
+            if self._expired(stat.st_mtime):
+                self._expire(Path(path))
+                removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        files = [stat for _, stat in self._files() if not self._expired(stat.st_mtime)]
+        return {
+            "backend": type(self).__name__,
+            "entries": len(files),
+            "bytes": sum(stat.st_size for stat in files),
+            "expirations": self.expirations,
+        }
+
+
+class RedisSessionStore(SessionStore):  # pragma: no cover - requires redis
+    """Sessions in Redis, stored with the binary codec of :mod:`backend.core.session_codec`.
+
+    Every session is a hash with one field per part (workbook, options,
+    preview, labels) and one TTL, so the preview can be polled without
+    transferring the workbook and labels. Plain values written as JSON by
+    older versions are still readable; values of an unknown codec version are
+    treated as expired sessions.
+
+    The sync and the ``redis.asyncio`` client each use a blocking pool of at
+    most ``pool_size`` connections: under load callers wait up to
+    ``socket_timeout`` for a free connection instead of opening new ones.
+    Writes go out as one MULTI pipeline; encoding and decoding of the async
+    methods run in the thread pool. Every write also stores a new revision
+    token, which lets :class:`TieredSessionStore` validate its local copies.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str],
+        ttl_seconds: int,
+        compression: Optional[str] = None,
+        pool_size: int = 16,
+        socket_timeout: float = 5.0,
+        connect_timeout: float = 2.0,
+        client: Any = None,
+        async_client: Any = None,
+    ) -> None:
+        if client is None or async_client is None:
+            if redis is None:
+                raise RuntimeError("Redis support not available - install redis-py")
+            pool_options = {
+                "max_connections": pool_size,
+                "timeout": socket_timeout,
+                "socket_timeout": socket_timeout,
+                "socket_connect_timeout": connect_timeout,
+            }
+            if client is None:
+                client = redis.Redis(connection_pool=redis.BlockingConnectionPool.from_url(url, **pool_options))
+            if async_client is None:
+                async_client = aioredis.Redis(
+                    connection_pool=aioredis.BlockingConnectionPool.from_url(url, **pool_options)
+                )
+        self.client = client
+        self.async_client = async_client
+        self.ttl = ttl_seconds
+        self.pool_size = pool_size
+        self.compression = compression or default_compression()
+
+    def set(self, key: str, value: ReportSessionPayload, revision: Optional[str] = None) -> None:
+        fields = encode_parts(value, self.compression)
+        fields[REVISION_FIELD] = revision or uuid.uuid4().hex
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete(key)
+        pipe.hset(key, mapping=fields)
+        pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def get_revision(self, key: str) -> Optional[str]:
+        try:
+            revision = self.client.hget(key, REVISION_FIELD)
+        except redis.ResponseError:
+            return None
+        return revision.decode("ascii") if revision else None
+
+    def get(self, key: str) -> Optional[ReportSessionPayload]:
+        parts = self.get_parts(key, SESSION_PARTS)
+        return ReportSessionPayload.construct(**parts) if parts is not None else None
+
+    def get_parts(self, key: str, parts: Sequence[str]) -> Optional[Dict[str, Any]]:
+        try:
+            values = self.client.hmget(key, list(parts))
+        except redis.ResponseError:
+            return self._from_legacy(self.client.get(key), parts)
+        return self._decode(parts, values)
 
     def delete(self, key: str) -> None:
         self.client.delete(key)
 
+    async def aset(self, key: str, value: ReportSessionPayload, revision: Optional[str] = None) -> None:
+        fields = await run_in_threadpool(encode_parts, value, self.compression)
+        fields[REVISION_FIELD] = revision or uuid.uuid4().hex
+        async with self.async_client.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def aget_parts(self, key: str, parts: Sequence[str]) -> Optional[Dict[str, Any]]:
+        try:
+            values = await self.async_client.hmget(key, list(parts))
+        except redis.ResponseError:
+            data = await self.async_client.get(key)
+            return await run_in_threadpool(self._from_legacy, data, parts)
+        if any(value is None for value in values):
+            return None
+        return await run_in_threadpool(self._decode, parts, values)
+
+    async def adelete(self, key: str) -> None:
+        await self.async_client.delete(key)
+
+    async def aget_revision(self, key: str) -> Optional[str]:
+        try:
+            revision = await self.async_client.hget(key, REVISION_FIELD)
+        except redis.ResponseError:
+            return None
+        return revision.decode("ascii") if revision else None
+
+    @staticmethod
+    def _decode(parts: Sequence[str], values: List[Optional[bytes]]) -> Optional[Dict[str, Any]]:
+        if any(value is None for value in values):
+            return None
+        try:
+            return {part: decode_part(part, value) for part, value in zip(parts, values)}
+        except SessionCodecError:
+            return None
+
+    @staticmethod
+    def _from_legacy(data: Optional[bytes], parts: Sequence[str]) -> Optional[Dict[str, Any]]:
+        if not data:
+            return None
+        try:
+            payload = decode_payload(data)
+        except SessionCodecError:
+            return None
+        return {part: getattr(payload, part) for part in parts}
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": type(self).__name__, "pool_size": self.pool_size, "compression": self.compression}
+
+
+class TieredSessionStore(SessionStore):
+    """Small per-process LRU of decoded payloads in front of :class:`RedisSessionStore`.
+
+    Every local copy is tagged with the revision it was written or read with.
+    A read first fetches the current revision from Redis (one ``HGET`` of a
+    few bytes) and serves the local copy only if it still matches. Options
+    updates or deletes from other workers are therefore seen at once, and the
+    Redis TTL stays authoritative. The revision is fetched before the payload
+    when filling the cache, so a concurrent write can only cause an extra
+    miss, never a stale hit.
 
+    Only full payloads are cached: on writes and :meth:`get`. Partial reads
+    that miss go to Redis for just the requested parts.
+    """
+
+    def __init__(
+        self,
+        remote: RedisSessionStore,
+        max_entries: int = 8,
+        ttl_seconds: Optional[int] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.remote = remote
+        self.local: TTLCache = TTLCache(max_entries, ttl_seconds or remote.ttl, timer)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key: str, revision: Optional[str], value: Optional[ReportSessionPayload]) -> None:
+        if revision is None or value is None:
+            return
+        with self.lock:
+            self.local[key] = (revision, value)
+
+    def _cached(self, key: str, revision: Optional[str]) -> Optional[ReportSessionPayload]:
+        with self.lock:
+            cached = self.local.get(key)
+            if cached is not None and cached[0] == revision:
+                self.hits += 1
+                return cached[1]
+            if cached is not None:
+                del self.local[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: ReportSessionPayload) -> None:
+        revision = uuid.uuid4().hex
+        self.remote.set(key, value, revision)
+        self._remember(key, revision, value)
+
+    def get(self, key: str) -> Optional[ReportSessionPayload]:
+        revision = self.remote.get_revision(key)
+        cached = self._cached(key, revision)
+        if cached is not None:
+            return cached
+        value = self.remote.get(key)
+        self._remember(key, revision, value)
+        return value
+
+    def get_parts(self, key: str, parts: Sequence[str]) -> Optional[Dict[str, Any]]:
+        revision = self.remote.get_revision(key)
+        cached = self._cached(key, revision)
+        if cached is not None:
+            return {part: getattr(cached, part) for part in parts}
+        return self.remote.get_parts(key, parts)
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            self.local.pop(key, None)
+        self.remote.delete(key)
+
+    async def aset(self, key: str, value: ReportSessionPayload) -> None:
+        revision = uuid.uuid4().hex
+        await self.remote.aset(key, value, revision)
+        self._remember(key, revision, value)
+
+    async def aget_parts(self, key: str, parts: Sequence[str]) -> Optional[Dict[str, Any]]:
+        revision = await self.remote.aget_revision(key)
+        cached = self._cached(key, revision)
+        if cached is not None:
+            return {part: getattr(cached, part) for part in parts}
+        return await self.remote.aget_parts(key, parts)
+
+    async def adelete(self, key: str) -> None:
+        with self.lock:
+            self.local.pop(key, None)
+        await self.remote.adelete(key)
+
+    def sweep(self) -> int:
+        with self.lock:
+            self.local.expire()
+        return self.remote.sweep()
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            lookups = self.hits + self.misses
+            result: Dict[str, Any] = {
+                "backend": type(self).__name__,
+                "local_entries": len(self.local),
+                "local_max_entries": int(self.local.maxsize),
+                "local_hits": self.hits,
+                "local_misses": self.misses,
+                "local_hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+        result["remote"] = self.remote.stats()
+        return result
+
+
+class SessionLookups:
+    """Hits and misses of session reads, per purpose (``preview``, ``export``, ...).
+
+    A miss is a read of a session that expired or never existed, i.e. a 404.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.counts: Dict[str, List[int]] = {}
+
+    def record(self, purpose: str, hit: bool) -> None:
+        with self.lock:
+            counts = self.counts.setdefault(purpose, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self.lock:
+            return {purpose: {"hits": hits, "misses": misses} for purpose, (hits, misses) in self.counts.items()}
+
+
+session_lookups = SessionLookups()
 _session_store: Optional[SessionStore] = None
 
 def get_session_store() -> SessionStore:
@@ -78,7 +614,18 @@ def get_session_store() -> SessionStore:
         ttl_seconds = ttl_minutes * 60
         redis_url = os.getenv("SESSION_REDIS_URL")
         if redis_url:
-            _session_store = RedisSessionStore(redis_url, ttl_seconds)
+            remote = RedisSessionStore(
+                redis_url,
+                ttl_seconds,
+                pool_size=int(os.getenv("SESSION_REDIS_POOL_SIZE", "16")),
+                socket_timeout=float(os.getenv("SESSION_REDIS_TIMEOUT", "5")),
+                connect_timeout=float(os.getenv("SESSION_REDIS_CONNECT_TIMEOUT", "2")),
+            )
+            local_size = int(os.getenv("SESSION_LOCAL_CACHE_SIZE", "8"))
+            _session_store = TieredSessionStore(remote, local_size) if local_size > 0 else remote
+        elif os.getenv("SESSION_BACKEND", "memory").strip().lower() == "disk":
+            directory = os.getenv("SESSION_DIR", os.path.join(tempfile.gettempdir(), "quarter-labels-sessions"))
+            _session_store = DiskSessionStore(directory, ttl_seconds)
         else:
             _session_store = InMemorySessionStore(ttl_seconds=ttl_seconds)
     return _session_store
@@ -100,14 +647,50 @@ def get_session(session_id: str) -> Optional[ReportSessionPayload]:
     return get_session_store().get(session_id)
 
 
+def get_session_parts(session_id: str, *parts: str, purpose: str = "read") -> Optional[Dict[str, Any]]:
+    found = get_session_store().get_parts(session_id, parts)
+    session_lookups.record(purpose, found is not None)
+    return found
+
+
+async def astore_session(payload: ReportSessionPayload) -> str:
+    session_id = payload.preview.session_id or create_session_id()
+    payload.preview.session_id = session_id
+    await get_session_store().aset(session_id, payload)
+    return session_id
+
+
+async def aget_session_parts(session_id: str, *parts: str, purpose: str = "read") -> Optional[Dict[str, Any]]:
+    found = await get_session_store().aget_parts(session_id, parts)
+    session_lookups.record(purpose, found is not None)
+    return found
+
+
+async def adelete_session(session_id: str) -> None:
+    await get_session_store().adelete(session_id)
+
+
 def delete_session(session_id: str) -> None:
     get_session_store().delete(session_id)
 
 
 __all__ = [
+    "SessionTooLarge",
+    "SessionStore",
+    "InMemorySessionStore",
+    "DiskSessionStore",
+    "RedisSessionStore",
+    "TieredSessionStore",
+    "SessionLookups",
+    "session_lookups",
+    "estimate_payload_bytes",
     "get_session_store",
     "create_session_id",
     "store_session",
     "get_session",
+    "get_session_parts",
     "delete_session",
+    "astore_session",
+    "aget_session_parts",
+    "adelete_session",
 ]
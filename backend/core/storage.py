@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import os
+import stat
+from pathlib import Path
+
+
+def private_directory(directory: str) -> Path:
+    """Create ``directory`` readable by this user only, refusing one owned by someone else.
+
+    The disk stores keep student data and decode whatever files they find, so
+    their directories (by default at guessable paths in the shared tempdir)
+    must not be writable or readable by other local users.
+    """
+    path = Path(directory)
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    info = path.lstat()
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+        raise PermissionError(f"{directory!r} is not a directory owned by this user")
+    if stat.S_IMODE(info.st_mode) & 0o077:
+        path.chmod(0o700)
+    return path
+
+
+__all__ = ["private_directory"]
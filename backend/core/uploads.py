@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from io import BytesIO
+from typing import Dict, Optional, Union
+
+from multipart.exceptions import ParseError
+from multipart.multipart import MultipartParser, parse_options_header
+from starlette.requests import Request
+
+MAX_UPLOAD_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+SPOOL_MAX_BYTES = int(os.getenv("UPLOAD_SPOOL_BYTES", str(1024 * 1024)))
+MAX_FIELD_BYTES = 64 * 1024
+
+
+class UploadError(ValueError):
+    pass
+
+
+class UploadTooLarge(UploadError):
+    pass
+
+
+class SpooledUpload:
+    """Uploaded file kept in memory up to ``spool_bytes``, then in a named temp file.
+
+    Unlike :class:`tempfile.SpooledTemporaryFile` the file rolls over to a
+    *named* file, so :meth:`source` can hand a plain path to a worker process.
+    The SHA-256 of the content is computed while it streams in.
+    """
+
+    def __init__(self, filename: str = "", spool_bytes: int = SPOOL_MAX_BYTES) -> None:
+        self.filename = filename
+        self.spool_bytes = spool_bytes
+        self.size = 0
+        self._digest = hashlib.sha256()
+        self._buffer: Optional[BytesIO] = BytesIO()
+        self._file = None
+
+    def write(self, data: bytes) -> None:
+        self.size += len(data)
+        self._digest.update(data)
+        if self._buffer is not None and self.size > self.spool_bytes:
+            self._file = tempfile.NamedTemporaryFile(prefix="upload-", suffix=".xlsx", delete=False)
+            self._file.write(self._buffer.getbuffer())
+            self._buffer = None
+        if self._buffer is not None:
+            self._buffer.write(data)
+        else:
+            self._file.write(data)
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+    @property
+    def rolled_to_disk(self) -> bool:
+        return self._file is not None
+
+    def source(self) -> Union[bytes, str]:
+        """Bytes for small uploads, a file path once the upload was spooled to disk."""
+        if self._file is not None:
+            self._file.flush()
+            return self._file.name
+        return self._buffer.getvalue()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            try:
+                os.unlink(self._file.name)
+            except FileNotFoundError:
+                pass
+            self._file = None
+        self._buffer = None
+
+
+class UploadReceiver:
+    """Streams a ``multipart/form-data`` body into form fields and one :class:`SpooledUpload`.
+
+    The size limit is checked on every chunk, so an oversized upload is
+    rejected after at most ``max_bytes`` plus one chunk instead of being
+    buffered in full first.
+    """
+
+    def __init__(self, file_field: str = "file", max_bytes: int = MAX_UPLOAD_BYTES) -> None:
+        self.file_field = file_field
+        self.max_bytes = max_bytes
+        self.fields: Dict[str, str] = {}
+        self.upload: Optional[SpooledUpload] = None
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._part_name = ""
+        self._part_file: Optional[SpooledUpload] = None
+        self._part_data = bytearray()
+
+    async def receive(self, request: Request) -> SpooledUpload:
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        boundary = params.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            raise UploadError("Ожидается multipart/form-data")
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes + MAX_FIELD_BYTES:
+            raise UploadTooLarge("Файл слишком большой")
+
+        parser = MultipartParser(
+            boundary,
+            {
+                "on_part_begin": self._on_part_begin,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+            },
+        )
+        try:
+            async for chunk in request.stream():
+                parser.write(chunk)
+            parser.finalize()
+        except ParseError as exc:
+            self._discard()
+            raise UploadError("Некорректное тело multipart/form-data") from exc
+        except Exception:
+            self._discard()
+            raise
+        if self.upload is None:
+            raise UploadError("Требуется файл XLSX")
+        return self.upload
+
+    def _discard(self) -> None:
+        for upload in (self.upload, self._part_file):
+            if upload is not None:
+                upload.close()
+
+    def _on_part_begin(self) -> None:
+        self._disposition = b""
+        self._part_name = ""
+        self._part_file = None
+        self._part_data = bytearray()
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        self._part_name = options.get(b"name", b"").decode("utf-8", "replace")
+        if self._part_name == self.file_field and b"filename" in options:
+            if self.upload is not None:
+                raise UploadError("Допускается только один файл")
+            self._part_file = SpooledUpload(options[b"filename"].decode("utf-8", "replace"))
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._part_file is not None:
+            if self._part_file.size + (end - start) > self.max_bytes:
+                raise UploadTooLarge("Файл слишком большой")
+            self._part_file.write(data[start:end])
+            return
+        self._part_data += data[start:end]
+        if len(self._part_data) > MAX_FIELD_BYTES:
+            raise UploadError("Слишком длинное значение поля формы")
+
+    def _on_part_end(self) -> None:
+        if self._part_file is not None:
+            self.upload = self._part_file
+            self._part_file = None
+        elif self._part_name:
+            self.fields[self._part_name] = self._part_data.decode("utf-8", "replace")
+
+
+__all__ = [
+    "SpooledUpload",
+    "UploadReceiver",
+    "UploadError",
+    "UploadTooLarge",
+    "MAX_UPLOAD_BYTES",
+    "SPOOL_MAX_BYTES",
+]
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import multiprocessing
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from backend.core.metrics import TimingStats
+
+T = TypeVar("T")
+
+
+class WorkerPoolSaturated(RuntimeError):
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Worker pool is saturated")
+        self.retry_after = retry_after
+
+
+def _timed_call(fn: Callable[..., T], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[T, float, float]:
+    # Wall-clock timestamps so the measurement also works across processes.
+    started = time.time()
+    result = fn(*args, **kwargs)
+    return result, started, time.time()
+
+
+class WorkerPool:
+    """Runs CPU-bound report work off the event loop.
+
+    At most ``size`` tasks execute at once and at most ``queue_depth`` more
+    wait for a free worker; anything beyond that is rejected immediately with
+    :class:`WorkerPoolSaturated` instead of piling up behind a large upload.
+    Both executors start tasks in submission order, so the pool knows which
+    task a freed worker picks up next and can report it via ``on_start``.
+    """
+
+    def __init__(self, kind: str = "thread", size: int = 4, queue_depth: int = 16) -> None:
+        if kind not in {"thread", "process"}:
+            raise ValueError(f"Unknown worker pool kind: {kind}")
+        self.kind = kind
+        self.size = max(size, 1)
+        self.queue_depth = max(queue_depth, 0)
+        self.executor: Executor
+        if kind == "process":
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.size, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="report-worker")
+        self.lock = threading.Lock()
+        self.pending = 0
+        # queued tasks with their on_start, in the order the executor starts them
+        self.waiting: Deque[Tuple[Future, Optional[Callable[[], None]]]] = deque()
+        self.rejected = 0
+        self.failed = 0
+        self.queue_wait: Dict[str, TimingStats] = defaultdict(TimingStats)
+        self.execution: Dict[str, TimingStats] = defaultdict(TimingStats)
+
+    def submit(
+        self, fn: Callable[..., T], *args: Any, on_start: Optional[Callable[[], None]] = None, **kwargs: Any
+    ) -> Awaitable[T]:
+        """Hand the task to the executor right away and return an awaitable for its result.
+
+        Saturation is reported synchronously, so callers that want to answer
+        before the work finishes still get :class:`WorkerPoolSaturated` in time.
+        The slot is released when the executor is done with the task, not when
+        the caller stops waiting: cancelling the awaitable cancels a task that
+        has not started yet, while one that runs keeps its slot until it ends.
+        ``on_start`` is called once a worker is free for the task: right here,
+        or in the thread that finishes an earlier task.
+        """
+        name = getattr(fn, "__name__", type(fn).__name__)
+        submitted = time.time()
+        with self.lock:
+            if self.pending >= self.size + self.queue_depth:
+                self.rejected += 1
+                raise WorkerPoolSaturated(self._retry_after())
+            future = self.executor.submit(_timed_call, fn, args, kwargs)
+            self.pending += 1
+            starts_now = self.pending <= self.size
+            if not starts_now:
+                self.waiting.append((future, on_start))
+        if starts_now and on_start is not None:
+            on_start()
+        future.add_done_callback(partial(self._finish, name, submitted))
+        return self._result(future)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await self.submit(fn, *args, **kwargs)
+
+    @staticmethod
+    async def _result(future: "Future[Tuple[T, float, float]]") -> T:
+        result, _, _ = await asyncio.wrap_future(future)
+        return result
+
+    def _finish(self, name: str, submitted: float, future: "Future[Tuple[Any, float, float]]") -> None:
+        next_start: Optional[Callable[[], None]] = None
+        with self.lock:
+            self.pending -= 1
+            if future.cancelled():
+                # never started, so no worker was freed either
+                self.waiting = deque(entry for entry in self.waiting if entry[0] is not future)
+            else:
+                if self.waiting:
+                    next_start = self.waiting.popleft()[1]
+                if future.exception() is not None:
+                    self.failed += 1
+                else:
+                    _, started, finished = future.result()
+                    self.queue_wait[name].observe(started - submitted)
+                    self.execution[name].observe(finished - started)
+        if next_start is not None:
+            next_start()
+
+    def _retry_after(self) -> int:
+        # Roughly the time needed for the current backlog to drain.
+        execution_times = [stats.mean for stats in self.execution.values() if stats.count]
+        mean_execution = max(execution_times, default=1.0)
+        return max(1, math.ceil(mean_execution * self.pending / self.size))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            pending = self.pending
+        return {
+            "kind": self.kind,
+            "size": self.size,
+            "queue_depth": self.queue_depth,
+            "in_flight": min(pending, self.size),
+            "queued": max(pending - self.size, 0),
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "queue_wait": {name: stats.snapshot() for name, stats in self.queue_wait.items()},
+            "execution": {name: stats.snapshot() for name, stats in self.execution.items()},
+        }
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_worker_pool: Optional[WorkerPool] = None
+
+
+def worker_pool_kind() -> str:
+    """Kind of the pool :func:`get_worker_pool` creates, known without creating it."""
+    return os.getenv("WORKER_POOL_KIND", "thread").strip().lower()
+
+
+def get_worker_pool() -> WorkerPool:
+    global _worker_pool
+    if _worker_pool is None:
+        size = int(os.getenv("WORKER_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+        _worker_pool = WorkerPool(
+            kind=worker_pool_kind(),
+            size=size,
+            queue_depth=int(os.getenv("WORKER_QUEUE_DEPTH", str(size * 4))),
+        )
+    return _worker_pool
+
+
+def shutdown_worker_pool() -> None:
+    global _worker_pool
+    if _worker_pool is not None:
+        _worker_pool.shutdown()
+        _worker_pool = None
+
+
+__all__ = ["WorkerPool", "WorkerPoolSaturated", "get_worker_pool", "shutdown_worker_pool", "worker_pool_kind"]
@@ -0,0 +1,31 @@
+from datetime import date
+from types import SimpleNamespace
+
+from backend.core.date_index import EntryDateIndex
+
+
+def entry(subject: str, day: int, month: int = 9) -> SimpleNamespace:
+    return SimpleNamespace(subject=subject, date=date(2025, month, day))
+
+
+def test_select_matches_linear_scan_order():
+    entries = [
+        entry("Физика", 20),
+        entry("Алгебра", 3),
+        entry(" ", 5),
+        entry("Алгебра ", 25),
+        entry("Физика", 2),
+        entry("Алгебра", 3, month=10),
+        entry("История", 30),
+    ]
+    index = EntryDateIndex((e.subject, e.date.toordinal()) for e in entries)
+    assert len(index) == 6
+
+    assert index.select(date(2025, 9, 1), date(2025, 9, 30)) == [
+        ("Физика", [0, 4]),
+        ("Алгебра", [1, 3]),
+        ("История", [6]),
+    ]
+    assert index.select(date(2025, 9, 21), date(2025, 10, 3)) == [("Алгебра", [3, 5]), ("История", [6])]
+    assert index.select(date(2025, 10, 4), date(2025, 12, 31)) == []
+    assert index.select(date(2025, 9, 30), date(2025, 9, 1)) == []
@@ -0,0 +1,55 @@
+import pickle
+from datetime import date
+
+from test_sections import build_multi_student_workbook
+
+from backend.core.models import EntryTable, ParsedEntry, ParsedWorkbook, StudentSection
+from backend.core.parsing.quarter_parser import QuarterReportParser
+
+
+def make_table() -> EntryTable:
+    table = EntryTable("Иванов Иван", "Иванов И.И.", "5А")
+    table.append("Алгебра", date(2025, 9, 2), [5, 4], [], "5/4", 10, 3)
+    table.append("Физика", date(2025, 9, 3), [], ["Н"], "Н", 11, 4)
+    table.append("Алгебра", date(2025, 9, 4), [3], ["Н"], "3 Н", 10, 5)
+    return table
+
+
+def test_entries_are_views_over_columns():
+    table = make_table()
+    assert table.subjects == ["Алгебра", "Физика"]
+    assert table.codes == ["Н"]
+    assert len(table) == 3
+    assert list(table.grades_at(0)) == [5, 4]
+    assert table.attendance_at(2) == ["Н"]
+    assert table[-1] == ParsedEntry(
+        student_fio_raw="Иванов Иван",
+        student_fio_norm="Иванов И.И.",
+        klass="5А",
+        subject="Алгебра",
+        date=date(2025, 9, 4),
+        grades=[3],
+        attendance=["Н"],
+        raw_text="3 Н",
+        row=10,
+        col=5,
+    )
+    assert [entry.subject for entry in table[1:]] == ["Физика", "Алгебра"]
+
+
+def test_section_accepts_columns_and_legacy_entry_lists():
+    table = make_table()
+    from_columns = StudentSection(
+        fio_raw="Иванов Иван", fio_norm="Иванов И.И.", klass="5А", period_from=None, period_to=None,
+        entries=table.to_dict(),
+    )
+    from_list = StudentSection.parse_obj({**from_columns.dict(), "entries": [entry.dict() for entry in table]})
+    assert from_columns.entries == table
+    assert from_list.entries == table
+
+
+def test_parsed_workbook_round_trips_through_json_and_pickle():
+    workbook = QuarterReportParser().parse_workbook(build_multi_student_workbook())
+    assert isinstance(workbook.students[0].entries, EntryTable)
+    assert ParsedWorkbook.parse_raw(workbook.json()) == workbook
+    assert pickle.loads(pickle.dumps(workbook)) == workbook
@@ -0,0 +1,46 @@
+import pytest
+
+from backend.core.parsing.grid import SparseGrid, pack_row
+
+
+def test_sparse_grid_resolves_merged_ranges_on_lookup():
+    grid = SparseGrid(
+        [
+            pack_row({1: "Предмет", 2: "Сентябрь", 5: "Октябрь"}),
+            pack_row({2: "1", 3: "2", 4: "3", 5: "1"}),
+        ],
+        merged_ranges=[(1, 2, 1, 4), (3, 1, 4, 2)],
+    )
+    assert len(grid) == 5
+    assert len(grid[1]) == 6
+    assert [grid[1][col] for col in range(1, 6)] == ["Предмет", "Сентябрь", "Сентябрь", "Сентябрь", "Октябрь"]
+    assert grid[2][3] == "2"
+    assert grid[4][2] is None  # merged area anchored on an empty cell
+    assert grid[2][9] is None
+
+
+def test_sparse_grid_empty_rows_and_bounds():
+    grid = SparseGrid([pack_row({1: "Школа"}), pack_row({}), pack_row({3: "x"})])
+    assert len(grid) == 4
+    assert grid[2][1] is None
+    assert len(grid[2]) == 4
+    with pytest.raises(IndexError):
+        grid[4]
+
+
+def test_sparse_grid_row_indexes():
+    grid = SparseGrid(
+        [
+            pack_row({1: "Ученик: Иванов"}),
+            pack_row({}),
+            pack_row({2: "x"}),
+            pack_row({1: "Н", 2: "Неуважительная"}),
+            pack_row({1: "Математика", 3: "5"}),
+            pack_row({}),
+        ],
+        merged_ranges=[(5, 3, 5, 6)],
+        classify=lambda value: 2 if value.startswith("Ученик") else 1,
+    )
+    assert list(grid.row_kinds[1:6]) == [2, 0, 0, 1, 1]
+    assert [grid.next_first_col_row(row) for row in (1, 2, 5, 6, 7)] == [1, 4, 5, None, None]
+    assert [grid.nonempty_count(row) for row in range(1, 7)] == [1, 0, 1, 2, 5, 0]
@@ -0,0 +1,100 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+import pytest
+from openpyxl import Workbook, load_workbook
+from test_sections import build_multi_student_workbook
+
+from backend.api import reports
+from backend.core.parsing import quarter_parser
+from backend.core.parsing.quarter_parser import QuarterReportParser
+
+
+def build_year_in_table_workbook() -> bytes:
+    """Five students; a "Учебный год" row inside the third table is read as a subject."""
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Учебный год: 2024/2025"])
+    for index in range(5):
+        ws.append([f"Ученик: Ученик{index} И.И."])
+        ws.append(["Предмет", "Сентябрь"])
+        ws.append([None, 1, 2])
+        ws.append(["Математика", "5", "Н 4"])
+        if index == 2:
+            ws.append(["Учебный год: 2030/2031", "4"])
+    stream = BytesIO()
+    wb.save(stream)
+    return stream.getvalue()
+
+
+def test_parallel_parse_matches_serial(monkeypatch):
+    monkeypatch.setattr(quarter_parser, "PARALLEL_MIN_SECTIONS", 1)
+    for data in (build_multi_student_workbook(), build_year_in_table_workbook()):
+        serial = QuarterReportParser().parse_workbook(data)
+        for workers in (2, 4):
+            parser = QuarterReportParser(workers=workers)
+            try:
+                assert parser.parse_workbook(data).json() == serial.json()
+            finally:
+                parser.shutdown()
+
+
+def test_section_pool_is_spawned_once_and_shut_down(monkeypatch):
+    monkeypatch.setattr(quarter_parser, "PARALLEL_MIN_SECTIONS", 1)
+    parser = QuarterReportParser(workers=2)
+    data = build_multi_student_workbook()
+    try:
+        first = parser.parse_workbook(data)
+        pool = parser._pool
+        assert parser.parse_workbook(data) == first
+        assert parser._pool is pool and pool._mp_context.get_start_method() == "spawn"
+    finally:
+        parser.shutdown()
+    assert parser._pool is None
+
+
+def _die(*_):
+    os._exit(1)
+
+
+def test_broken_section_pool_is_replaced(monkeypatch):
+    monkeypatch.setattr(quarter_parser, "PARALLEL_MIN_SECTIONS", 1)
+    parser = QuarterReportParser(workers=2)
+    data = build_multi_student_workbook()
+    serial = QuarterReportParser().parse_workbook(data)
+    try:
+        # a worker dying mid-parse (e.g. OOM-killed) breaks the whole executor
+        with monkeypatch.context() as patch:
+            patch.setattr(quarter_parser, "_parse_rows_chunk", _die)
+            assert parser.parse_workbook(data).json() == serial.json()
+        assert parser._pool is None
+
+        # a pool that broke between parses is replaced as well
+        broken = parser._section_pool()
+        with pytest.raises(BrokenProcessPool):
+            broken.submit(_die).result()
+        assert parser.parse_workbook(data).json() == serial.json()
+        assert parser.parse_workbook(data).json() == serial.json()
+        assert parser._pool is not None and parser._pool is not broken
+    finally:
+        parser.shutdown()
+
+
+def test_process_worker_pool_parses_sections_serially(monkeypatch):
+    monkeypatch.setenv("PARSER_WORKERS", "4")
+    monkeypatch.setenv("WORKER_POOL_KIND", "process")
+    assert reports._parser_workers() == 1
+    monkeypatch.setenv("WORKER_POOL_KIND", "thread")
+    assert reports._parser_workers() == min(4, os.cpu_count() or 1)
+
+
+def test_plan_splits_at_student_rows_and_guesses_carried_year():
+    parser = QuarterReportParser(workers=3)
+    data = build_year_in_table_workbook()
+    grid = parser._load_target_grid(load_workbook(BytesIO(data)).worksheets)
+    plan = parser._plan_chunks(grid, 3)
+    assert [start for start, _, _ in plan] == [1, 6, 15]
+    assert [stop for _, stop, _ in plan] == [6, 15, len(grid)]
+    # the guess for the last run is wrong on purpose: the serial parse keeps 2024
+    assert [year for _, _, year in plan] == [(None, None), (2024, 2025), (2030, 2031)]
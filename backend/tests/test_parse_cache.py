@@ -0,0 +1,66 @@
+import os
+import pickle
+import stat
+
+import pytest
+from test_sections import build_multi_student_workbook
+
+from backend.core.parse_cache import DiskParseCache, MemoryParseCache, ParseCache, estimate_workbook_bytes
+from backend.core.parsing.quarter_parser import QuarterReportParser
+from backend.core.uploads import SpooledUpload
+
+
+def parsed_workbook():
+    return QuarterReportParser().parse_workbook(build_multi_student_workbook())
+
+
+def test_upload_hash_is_computed_while_streaming():
+    import hashlib
+
+    upload = SpooledUpload("a.xlsx", spool_bytes=4)
+    upload.write(b"abc")
+    upload.write(b"defgh")
+    assert upload.sha256 == hashlib.sha256(b"abcdefgh").hexdigest()
+    upload.close()
+
+
+def test_memory_cache_counts_hits_and_evicts_by_size():
+    workbook = parsed_workbook()
+    size = estimate_workbook_bytes(workbook)
+    cache = ParseCache(MemoryParseCache(max_bytes=size * 2))
+
+    assert cache.get("a") is None
+    cache.set("a", workbook)
+    cache.set("b", workbook)
+    assert cache.get("a") is workbook
+    cache.set("c", workbook)  # evicts "b", the least recently used
+
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (1, 2, 1, 2)
+
+
+def test_disk_cache_round_trip_and_eviction(tmp_path):
+    workbook = parsed_workbook()
+    backend = DiskParseCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+    backend.set("v1-abc", workbook)
+    assert backend.get("v1-abc") == workbook
+    assert backend.get("v1-missing") is None
+
+    backend.max_bytes = backend.stats()["bytes"]
+    backend.set("v1-def", workbook)
+    assert backend.stats()["entries"] == 1
+    assert backend.get("v1-def") == workbook
+
+
+def test_disk_cache_ignores_foreign_files_and_keeps_directory_private(tmp_path, monkeypatch):
+    directory = tmp_path / "cache"
+    backend = DiskParseCache(str(directory), max_bytes=10 * 1024 * 1024)
+    assert stat.S_IMODE(directory.stat().st_mode) == 0o700
+
+    (directory / "v1-abc.workbook").write_bytes(pickle.dumps(parsed_workbook()))
+    assert backend.get("v1-abc") is None
+
+    monkeypatch.setattr(os, "getuid", lambda: directory.stat().st_uid + 1)
+    with pytest.raises(PermissionError):
+        DiskParseCache(str(directory), max_bytes=1024)
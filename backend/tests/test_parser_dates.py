@@ -40,3 +40,14 @@ def test_dates_resolved_with_academic_year():
     student = workbook.students[0]
     dates = sorted({entry.date for entry in student.entries})
     assert dates == [date(2025, 9, 1), date(2025, 9, 2)]
+
+
+def test_date_mapping_is_reused_for_identical_headers():
+    from backend.benchmarks.synthetic import build_report_workbook
+
+    parser = QuarterReportParser()
+    workbook = parser.parse_workbook(build_report_workbook(4, months=2))
+    stats = parser.stats.snapshot()
+    assert (stats["date_mapping_hits"], stats["date_mapping_misses"], stats["date_mapping_hit_rate"]) == (3, 1, 0.75)
+    dates = {section.entries.date_at(i) for section in workbook.students for i in range(len(section.entries))}
+    assert min(dates) >= date(2025, 9, 1) and max(dates) <= date(2025, 10, 31)
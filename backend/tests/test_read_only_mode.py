@@ -0,0 +1,53 @@
+from io import BytesIO
+
+from openpyxl import Workbook
+
+from backend.core.parsing.quarter_parser import QuarterReportParser
+from test_legend import build_workbook_with_legend
+from test_sections import build_multi_student_workbook
+
+
+def build_workbook_with_extra_sheet() -> bytes:
+    wb = Workbook()
+    cover = wb.active
+    cover.title = "Обложка"
+    cover['A1'] = 'Сводная ведомость'
+    ws = wb.create_sheet("Данные")
+    ws['A1'] = 'Учебный год: 2024/2025'
+    ws['A2'] = 'Ученик: Орлова Мария'
+    ws['A3'] = 'Предмет'
+    ws['B3'] = 'Октябрь'
+    ws.merge_cells(start_row=3, start_column=2, end_row=3, end_column=4)
+    ws['B4'] = 7
+    ws['C4'] = 8
+    ws['D4'] = 40
+    ws['A5'] = 'Физика'
+    ws['B5'] = '5 Н'
+    ws['C5'] = 'x'
+    ws['D5'] = '4'
+
+    stream = BytesIO()
+    wb.save(stream)
+    return stream.getvalue()
+
+
+def test_read_only_mode_matches_full_mode():
+    for data in (build_workbook_with_legend(), build_multi_student_workbook(), build_workbook_with_extra_sheet()):
+        full = QuarterReportParser().parse_workbook(data)
+        streamed = QuarterReportParser(read_only=True).parse_workbook(data)
+        assert streamed == full
+
+
+def test_read_only_mode_expands_merged_headers():
+    workbook = QuarterReportParser(read_only=True).parse_workbook(build_workbook_with_extra_sheet())
+    section = workbook.students[0]
+    assert [entry.date.day for entry in section.entries] == [7, 8]
+    assert any('Некорректная дата' in warning for warning in section.warnings)
+
+
+def test_read_only_mode_reads_merged_cells_from_a_file_path(tmp_path):
+    path = tmp_path / "export.xlsx"
+    path.write_bytes(build_workbook_with_extra_sheet())
+    streamed = QuarterReportParser(read_only=True).parse_workbook(str(path))
+    assert streamed == QuarterReportParser().parse_workbook(str(path))
+    assert [entry.date.day for entry in streamed.students[0].entries] == [7, 8]
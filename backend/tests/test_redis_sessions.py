@@ -0,0 +1,110 @@
+import asyncio
+from datetime import date
+
+import pytest
+from test_sections import build_multi_student_workbook
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("redis")
+
+from backend.core.jobs import STATUS_DONE, JobStore, RedisJobBackend  # noqa: E402
+from backend.core.models import CurrentReportOptions, ReportSessionPayload  # noqa: E402
+from backend.core.parsing.quarter_parser import QuarterReportParser  # noqa: E402
+from backend.core.services.report_builder import build_session_payload  # noqa: E402
+from backend.core.sessions import RedisSessionStore, TieredSessionStore  # noqa: E402
+
+OPTIONS = CurrentReportOptions(date_from=date(2025, 9, 1), date_to=date(2025, 9, 30))
+
+
+def make_payload(session_id: str) -> ReportSessionPayload:
+    workbook = QuarterReportParser().parse_workbook(build_multi_student_workbook())
+    return build_session_payload(workbook, OPTIONS, session_id)
+
+
+def make_store() -> RedisSessionStore:
+    server = fakeredis.FakeServer()
+    return RedisSessionStore(
+        None,
+        ttl_seconds=60,
+        client=fakeredis.FakeRedis(server=server),
+        async_client=fakeredis.aioredis.FakeRedis(server=server),
+    )
+
+
+def test_sync_round_trip_and_parts():
+    store = make_store()
+    payload = make_payload("sync")
+    store.set("sync", payload)
+    assert store.get("sync") == payload
+    assert store.get_parts("sync", ("preview",)) == {"preview": payload.preview}
+    assert 0 < store.client.ttl("sync") <= 60
+    assert sorted(store.client.hkeys("sync")) == [b"labels", b"options", b"preview", b"rev", b"workbook"]
+
+    store.client.set("legacy", payload.json())
+    assert store.get("legacy") == payload
+    store.delete("sync")
+    assert store.get("sync") is None
+
+
+def test_async_store_under_concurrent_load():
+    store = make_store()
+    payload = make_payload("load")
+
+    async def client(index: int) -> bool:
+        key = f"session-{index}"
+        await store.aset(key, payload)
+        for _ in range(5):
+            parts = await store.aget_parts(key, ("preview",))
+            if parts["preview"] != payload.preview:
+                return False
+        exported = await store.aget_parts(key, ("labels", "options"))
+        await store.adelete(key)
+        return exported == {"labels": payload.labels, "options": payload.options}
+
+    async def scenario():
+        return await asyncio.gather(*(client(index) for index in range(50)))
+
+    assert all(asyncio.run(scenario()))
+    assert store.get("session-0") is None
+
+
+def test_tiered_store_serves_local_copy_until_revision_changes():
+    remote = make_store()
+    worker_a = TieredSessionStore(remote, max_entries=4)
+    worker_b = TieredSessionStore(remote, max_entries=4)
+    payload = make_payload("tiered")
+    worker_a.set("tiered", payload)
+    assert worker_a.get_parts("tiered", ("preview",))["preview"] is payload.preview
+    assert worker_b.get_parts("tiered", ("preview",)) == {"preview": payload.preview}
+    assert worker_a.stats()["local_hits"] == 1 and worker_b.stats()["local_misses"] == 1
+
+    updated = make_payload("tiered")
+    updated.options.weak_threshold = 4.0
+    worker_b.set("tiered", updated)
+    assert worker_a.get_parts("tiered", ("options",))["options"].weak_threshold == 4.0
+    assert worker_a.stats()["local_entries"] == 0
+
+    worker_b.delete("tiered")
+    assert worker_b.get("tiered") is None and worker_a.get("tiered") is None
+
+    async def scenario():
+        await worker_a.aset("async", payload)
+        parts = await worker_a.aget_parts("async", ("labels",))
+        await worker_a.adelete("async")
+        return parts, await worker_b.aget_parts("async", ("labels",))
+
+    parts, gone = asyncio.run(scenario())
+    assert parts["labels"] is payload.labels and gone is None
+
+
+def test_jobs_are_shared_through_redis():
+    store = make_store()
+    worker = JobStore(shared=RedisJobBackend(store.client, store.ttl))
+    other = JobStore(shared=RedisJobBackend(store.client, store.ttl))
+
+    job = worker.create()
+    worker.finish(job.job_id, "token")
+    shared = other.get(job.job_id)
+    assert (shared.status, shared.session_token) == (STATUS_DONE, "token")
+    assert 0 < store.client.ttl(f"job:{job.job_id}") <= 60
+    assert other.get("0" * 32) is None
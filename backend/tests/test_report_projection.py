@@ -0,0 +1,34 @@
+from datetime import date
+
+from test_sections import build_multi_student_workbook
+
+from backend.core.models import CurrentReportOptions
+from backend.core.parsing.quarter_parser import QuarterReportParser
+from backend.core.services.report_builder import AggregateCache, build_current_report
+from backend.core.services import report_builder
+
+
+def test_display_options_reuse_window_aggregates(monkeypatch):
+    cache = AggregateCache(max_entries=4)
+    monkeypatch.setattr(report_builder, "aggregate_cache", cache)
+    workbook = QuarterReportParser().parse_workbook(build_multi_student_workbook())
+    window = dict(date_from=date(2025, 9, 1), date_to=date(2025, 9, 30))
+
+    variants = [
+        CurrentReportOptions(**window),
+        CurrentReportOptions(**window, weak_threshold=4.5, subject_sort="avg_desc"),
+        CurrentReportOptions(**window, weak_threshold=4.5, show_weak_subjects=False),
+    ]
+    for options in variants:
+        labels, preview = build_current_report(workbook, options, cache_key="session")
+        expected_labels, expected_preview = build_current_report(workbook, options)
+        assert [label.json() for label in labels] == [label.json() for label in expected_labels]
+        assert preview.json() == expected_preview.json()
+
+    assert cache.stats() == {"entries": 1, "hits": 2, "misses": 1}
+
+    shifted = CurrentReportOptions(date_from=date(2025, 9, 2), date_to=date(2025, 9, 30))
+    build_current_report(workbook, shifted, cache_key="session")
+    assert cache.stats()["entries"] == 2
+    cache.discard("session")
+    assert cache.stats()["entries"] == 0
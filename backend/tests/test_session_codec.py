@@ -0,0 +1,76 @@
+from datetime import date
+
+import pytest
+from test_sections import build_multi_student_workbook
+
+from backend.core.models import CurrentReportOptions, ReportSessionPayload
+from backend.core.parsing.quarter_parser import QuarterReportParser
+from backend.core.services.report_builder import build_session_payload
+from backend.core.session_codec import (
+    CODEC_VERSION,
+    SESSION_PARTS,
+    SessionCodecError,
+    decode_part,
+    decode_payload,
+    encode_parts,
+    encode_payload,
+)
+
+OPTIONS = CurrentReportOptions(date_from=date(2025, 9, 1), date_to=date(2025, 9, 30), weak_threshold=3.5)
+
+
+def make_payload() -> ReportSessionPayload:
+    workbook = QuarterReportParser().parse_workbook(build_multi_student_workbook())
+    return build_session_payload(workbook, OPTIONS, "codec")
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib"])
+def test_round_trip_matches_json(compression):
+    payload = make_payload()
+    data = encode_payload(payload, compression)
+    restored = decode_payload(data)
+    assert restored == payload
+    assert restored.json() == payload.json()
+    assert len(data) < len(payload.json())
+    assert not restored.workbook.students[0].entries.has_details
+
+
+def test_round_trip_keeps_entry_details():
+    workbook = QuarterReportParser().parse_workbook(build_multi_student_workbook())
+    payload = build_session_payload(workbook, OPTIONS, "details").copy(update={"workbook": workbook})
+    restored = decode_payload(encode_payload(payload, "none"))
+    assert restored.workbook.students[0].entries == workbook.students[0].entries
+    assert restored.workbook.students[0].entries[0].raw_text == workbook.students[0].entries[0].raw_text
+
+
+def test_decode_accepts_legacy_json_and_rejects_other_versions():
+    payload = make_payload()
+    assert decode_payload(payload.json().encode()) == payload
+
+    data = bytearray(encode_payload(payload, "none"))
+    data[3] = CODEC_VERSION + 1
+    with pytest.raises(SessionCodecError):
+        decode_payload(bytes(data))
+    with pytest.raises(SessionCodecError):
+        decode_payload(b"garbage")
+
+
+def test_parts_decode_independently():
+    payload = make_payload()
+    blobs = encode_parts(payload, "zlib")
+    assert set(blobs) == set(SESSION_PARTS)
+    assert len(blobs["preview"]) < len(blobs["workbook"])
+    assert decode_part("preview", blobs["preview"]) == payload.preview
+    assert decode_part("options", blobs["options"]) == payload.options
+    assert decode_part("labels", blobs["labels"]) == payload.labels
+    assert decode_part("workbook", blobs["workbook"]) == payload.workbook
+    with pytest.raises(SessionCodecError):
+        decode_part("unknown", blobs["preview"])
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib"])
+def test_truncated_payload_raises_codec_error(compression):
+    data = encode_payload(make_payload(), compression)
+    for size in (len(data) // 3, len(data) // 2, len(data) - 5):
+        with pytest.raises(SessionCodecError):
+            decode_payload(data[:size])
@@ -0,0 +1,48 @@
+import asyncio
+import json
+from datetime import date
+from urllib.parse import urlencode
+
+from starlette.requests import Request
+from test_sections import build_multi_student_workbook
+
+from backend.api import reports
+from backend.core.models import CurrentReportOptions
+from backend.core.sessions import get_session, store_session
+
+
+def form_request(session: str, **fields: str) -> Request:
+    body = urlencode(fields).encode()
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/reports/current/options",
+        "query_string": urlencode({"session": session}).encode(),
+        "headers": [(b"content-type", b"application/x-www-form-urlencoded")],
+    }
+    return Request(scope, receive)
+
+
+def test_options_rebuild_labels_from_stored_workbook():
+    options = CurrentReportOptions(date_from=date(2025, 9, 1), date_to=date(2025, 9, 30))
+    payload = reports._parse_and_build(build_multi_student_workbook(), options, "opts-session")
+    session_id = store_session(payload)
+
+    response = asyncio.run(
+        reports.update_options(form_request(session_id, date_to="2025-09-01", weak_threshold="4.5"), session_id)
+    )
+    body = json.loads(response.body)
+
+    updated = get_session(session_id)
+    assert updated.options.date_to == date(2025, 9, 1)
+    assert updated.options.weak_threshold == 4.5
+    assert updated.options.date_from == options.date_from
+    assert updated.workbook == payload.workbook
+    grades = {label.fio: [s.grades for s in label.subjects] for label in updated.labels}
+    assert grades == {'Иванов И.И.': [[5]], 'Сидорова А.А.': [[4]]}
+    weak = {student["fio"]: student["has_weak_subjects"] for student in body["preview"]["students"]}
+    assert weak == {"Иванов И.И.": False, "Сидорова А.А.": True}
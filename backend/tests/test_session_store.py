@@ -0,0 +1,118 @@
+import os
+import stat
+from datetime import date
+
+import pytest
+from test_sections import build_multi_student_workbook
+
+from backend.core.models import CurrentReportOptions, ReportSessionPayload
+from backend.core.parsing.quarter_parser import QuarterReportParser
+from backend.core.services.report_builder import build_session_payload
+from backend.core.sessions import DiskSessionStore, InMemorySessionStore, SessionTooLarge, estimate_payload_bytes
+
+OPTIONS = CurrentReportOptions(date_from=date(2025, 9, 1), date_to=date(2025, 9, 30))
+
+
+def make_payload(session_id: str) -> ReportSessionPayload:
+    workbook = QuarterReportParser().parse_workbook(build_multi_student_workbook())
+    return build_session_payload(workbook, OPTIONS, session_id)
+
+
+def test_session_keeps_compact_workbook():
+    payload = make_payload("compact")
+    entries = payload.workbook.students[0].entries
+    assert not entries.has_details
+    assert (entries[0].subject, entries[0].grades, entries[0].raw_text, entries[0].row) == ("Математика", [5], "", 0)
+    assert ReportSessionPayload.parse_raw(payload.json()) == payload
+
+
+def test_store_evicts_least_recently_used_over_byte_budget():
+    payload_bytes = estimate_payload_bytes(make_payload("probe"))
+    store = InMemorySessionStore(ttl_seconds=60, max_entries=10, max_bytes=payload_bytes * 2)
+    store.set("a", make_payload("a"))
+    store.set("b", make_payload("b"))
+    assert store.get("a") is not None
+    store.set("c", make_payload("c"))
+    assert store.get("b") is None
+    assert store.get("a") is not None and store.get("c") is not None
+    stats = store.stats()
+    assert (stats["entries"], stats["bytes"], stats["evictions"]) == (2, payload_bytes * 2, 1)
+
+    with pytest.raises(SessionTooLarge):
+        InMemorySessionStore(max_bytes=payload_bytes - 1).set("big", make_payload("big"))
+
+
+def test_expired_sessions_are_not_counted_as_evictions():
+    now = [0.0]
+    store = InMemorySessionStore(ttl_seconds=10, max_entries=10, max_bytes=2**30, timer=lambda: now[0])
+    store.set("a", make_payload("a"))
+    now[0] = 11.0
+    assert store.get("a") is None
+    stats = store.stats()
+    assert (stats["entries"], stats["bytes"], stats["evictions"], stats["expirations"]) == (0, 0, 0, 1)
+
+
+def test_store_still_caps_entry_count():
+    store = InMemorySessionStore(ttl_seconds=60, max_entries=2, max_bytes=2**30)
+    for key in "abc":
+        store.set(key, make_payload(key))
+    assert store.get("a") is None
+    assert len(store.cache) == 2
+
+
+def test_get_parts_returns_requested_parts_only():
+    store = InMemorySessionStore(ttl_seconds=60)
+    payload = make_payload("parts")
+    store.set("parts", payload)
+    parts = store.get_parts("parts", ("preview", "options"))
+    assert parts == {"preview": payload.preview, "options": payload.options}
+    assert store.get_parts("missing", ("preview",)) is None
+
+
+def test_disk_store_shares_sessions_and_expires(tmp_path):
+    now = [1000.0]
+    store = DiskSessionStore(str(tmp_path), ttl_seconds=60, timer=lambda: now[0], sweep_interval=3600)
+    other_worker = DiskSessionStore(str(tmp_path), ttl_seconds=60, timer=lambda: now[0])
+    payload = make_payload("disk")
+    store.set("disk", payload)
+    os.utime(tmp_path / "disk.session", (now[0], now[0]))
+    assert other_worker.get("disk") == payload
+    assert other_worker.get_parts("disk", ("preview",)) == {"preview": payload.preview}
+    assert store.get_parts("../disk", ("preview",)) is None
+    assert store.stats()["entries"] == 1
+
+    store.set("stale", payload)
+    os.utime(tmp_path / "stale.session", (now[0] - 120, now[0] - 120))
+    assert store.sweep() == 1
+    now[0] += 61
+    assert store.get("disk") is None
+    assert not (tmp_path / "disk.session").exists()
+    assert store.stats()["expirations"] == 2
+
+
+@pytest.mark.parametrize("compression", ["zlib", "none"])
+def test_disk_store_drops_corrupted_files(tmp_path, compression):
+    store = DiskSessionStore(str(tmp_path), ttl_seconds=60, compression=compression)
+    store.set("broken", make_payload("broken"))
+    path = tmp_path / "broken.session"
+    data = path.read_bytes()
+    flipped = bytearray(data)
+    for index in range(60, len(flipped), 97):
+        flipped[index] ^= 0x5A
+
+    for damaged in (data[: len(data) // 2], data[:-7], bytes(flipped), b""):
+        path.write_bytes(damaged)
+        assert store.get("broken") is None
+        assert not path.exists()
+
+
+def test_disk_store_keeps_its_directory_private(tmp_path, monkeypatch):
+    directory = tmp_path / "sessions"
+    directory.mkdir(mode=0o755)
+    directory.chmod(0o755)
+    DiskSessionStore(str(directory), ttl_seconds=60)
+    assert stat.S_IMODE(directory.stat().st_mode) == 0o700
+
+    monkeypatch.setattr(os, "getuid", lambda: directory.stat().st_uid + 1)
+    with pytest.raises(PermissionError):
+        DiskSessionStore(str(directory), ttl_seconds=60)
@@ -0,0 +1,51 @@
+import asyncio
+from datetime import date
+
+from cachetools import Cache
+from test_sections import build_multi_student_workbook
+
+from backend.core import session_sweeper, sessions
+from backend.core.models import CurrentReportOptions
+from backend.core.parsing.quarter_parser import QuarterReportParser
+from backend.core.services import report_builder
+from backend.core.services.report_builder import AggregateCache, build_session_payload
+from backend.core.session_sweeper import SessionSweeper
+
+OPTIONS = CurrentReportOptions(date_from=date(2025, 9, 1), date_to=date(2025, 9, 30))
+
+
+def test_sweeper_purges_expired_sessions_and_counts_lookups(monkeypatch):
+    now = [0.0]
+    store = sessions.InMemorySessionStore(ttl_seconds=10, timer=lambda: now[0])
+    monkeypatch.setattr(sessions, "_session_store", store)
+    monkeypatch.setattr(sessions, "session_lookups", sessions.SessionLookups())
+    aggregates = AggregateCache(max_entries=8, ttl_seconds=10, timer=lambda: now[0])
+    monkeypatch.setattr(report_builder, "aggregate_cache", aggregates)
+    monkeypatch.setattr(session_sweeper, "aggregate_cache", aggregates)
+    workbook = QuarterReportParser().parse_workbook(build_multi_student_workbook())
+    store.set("old", build_session_payload(workbook, OPTIONS, "old"))
+    now[0] = 5.0
+    store.set("new", build_session_payload(workbook, OPTIONS, "new"))
+    now[0] = 12.0
+    sweeper = SessionSweeper(interval_seconds=0.01)
+
+    async def scenario():
+        removed = await sweeper.sweep_once()
+        found = await sessions.aget_session_parts("new", "preview", purpose="preview")
+        missing = await sessions.aget_session_parts("old", "labels", "options", purpose="export")
+        sweeper.start()
+        await asyncio.sleep(0.05)
+        await sweeper.stop()
+        return removed, found, missing
+
+    removed, found, missing = asyncio.run(scenario())
+    assert removed == 1 and found is not None and missing is None
+    assert store.stats()["entries"] == 1 and store.stats()["expirations"] == 1
+    assert Cache.__len__(aggregates.cache) == 1  # dropped by the sweep, not just hidden
+    assert aggregates.get(("old", OPTIONS.date_from, OPTIONS.date_to)) is None
+    assert sessions.session_lookups.snapshot() == {
+        "preview": {"hits": 1, "misses": 0},
+        "export": {"hits": 0, "misses": 1},
+    }
+    snapshot = sweeper.snapshot()
+    assert snapshot["runs"] >= 2 and snapshot["removed"] == 1 and not snapshot["running"]
@@ -0,0 +1,53 @@
+from io import BytesIO
+
+import pytest
+from openpyxl import Workbook
+
+from backend.core.parsing.quarter_parser import QuarterReportParser
+
+
+def build_workbook_with_data_sheet_last() -> bytes:
+    wb = Workbook()
+    wb.active.title = "Титул"
+    wb.active['A1'] = 'Ведомость успеваемости'
+    notes = wb.create_sheet("Примечания")
+    for row in range(1, 30):
+        notes.cell(row=row, column=1, value=f'Примечание {row}')
+    ws = wb.create_sheet("Данные")
+    ws['A1'] = 'Учебный год: 2025/2026'
+    ws['A2'] = 'Ученик: Иванов Иван'
+    ws['A3'] = 'Предмет'
+    ws['B3'] = 'Сентябрь'
+    ws['B4'] = 1
+    ws['A5'] = 'Математика'
+    ws['B5'] = '5'
+
+    stream = BytesIO()
+    wb.save(stream)
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize("read_only", [False, True])
+def test_each_sheet_is_read_once(monkeypatch, read_only):
+    parser = QuarterReportParser(read_only=read_only)
+    visited = []
+    original = parser._iter_sheet_rows
+
+    def tracking_iter(sheet):
+        visited.append(sheet.title)
+        return original(sheet)
+
+    monkeypatch.setattr(parser, "_iter_sheet_rows", tracking_iter)
+    workbook = parser.parse_workbook(build_workbook_with_data_sheet_last())
+
+    assert visited == ["Титул", "Примечания", "Данные"]
+    assert [entry.grades for entry in workbook.students[0].entries] == [[5]]
+
+
+def test_missing_header_raises():
+    wb = Workbook()
+    wb.active['A1'] = 'Пустая выгрузка'
+    stream = BytesIO()
+    wb.save(stream)
+    with pytest.raises(ValueError):
+        QuarterReportParser().parse_workbook(stream.getvalue())
@@ -1,4 +1,4 @@
-from backend.core.parsing.quarter_parser import ATTENDANCE_DEFAULT, QuarterReportParser
+from backend.core.parsing.quarter_parser import ATTENDANCE_DEFAULT, CellTokens, QuarterReportParser, tokenize_cell
 
 
 def test_tokenize_grade_variations():
@@ -16,3 +16,11 @@ def test_tokenize_grade_variations():
     grades, attendance, warnings, multiple = parser._tokenize_cell("3 Н", set(ATTENDANCE_DEFAULT))
     assert grades == [3]
     assert attendance == ["Н"]
+
+
+def test_tokenize_cell_is_memoized_and_structured():
+    codes = frozenset(ATTENDANCE_DEFAULT)
+    first = tokenize_cell("Н 7", codes)
+    assert first == CellTokens(grades=(), attendance=("Н",), warnings=(("invalid_grade", "7"),), multiple=True)
+    assert tokenize_cell("Н 7", codes) is first
+    assert tokenize_cell("Н 7", codes | {"7"}).attendance == ("Н", "7")
@@ -0,0 +1,70 @@
+import asyncio
+import os
+from datetime import date
+
+from test_sections import build_multi_student_workbook
+
+from backend.api import reports
+from backend.core.jobs import STATUS_DONE, STATUS_FAILED, STATUS_RUNNING, DiskJobBackend, JobStore, get_job_store
+from backend.core.models import CurrentReportOptions
+from backend.core.parsing.quarter_parser import QuarterReportParser
+from backend.core.progress import PHASE_LABELS, PHASE_SECTIONS
+from backend.core.services.report_builder import build_current_report
+from backend.core.sessions import get_session
+from backend.core.uploads import SpooledUpload
+
+OPTIONS = CurrentReportOptions(date_from=date(2025, 9, 1), date_to=date(2025, 9, 30))
+
+
+def test_progress_reported_from_parser_and_builder_loops():
+    events = []
+    workbook = QuarterReportParser().parse_workbook(
+        build_multi_student_workbook(), lambda *event: events.append(event)
+    )
+    build_current_report(workbook, OPTIONS, lambda *event: events.append(event))
+
+    assert [event for event in events if event[0] == PHASE_SECTIONS] == [
+        (PHASE_SECTIONS, 0, 2),
+        (PHASE_SECTIONS, 1, 2),
+        (PHASE_SECTIONS, 2, 2),
+    ]
+    assert events[-1] == (PHASE_LABELS, 2, 2)
+
+
+def test_upload_job_runs_in_background_and_stores_session():
+    async def scenario(content):
+        upload = SpooledUpload("report.xlsx")
+        upload.write(content)
+        job_id = reports._start_upload_job(upload, OPTIONS)
+        await asyncio.gather(*reports._background_tasks)
+        return get_job_store().get(job_id)
+
+    job = asyncio.run(scenario(build_multi_student_workbook()))
+    assert job.status == STATUS_DONE
+    assert (job.done, job.total) == (2, 2)
+    assert get_session(job.session_token).preview.session_id == job.session_token
+
+    failed = asyncio.run(scenario(b"not an xlsx"))
+    assert failed.status == STATUS_FAILED
+    assert failed.error
+
+
+def test_jobs_are_visible_to_other_workers_through_the_disk_backend(tmp_path):
+    now = [1000.0]
+    worker = JobStore(shared=DiskJobBackend(str(tmp_path), ttl_seconds=60, timer=lambda: now[0]), publish_interval=60)
+    other = JobStore(shared=DiskJobBackend(str(tmp_path), ttl_seconds=60, timer=lambda: now[0]))
+
+    job = worker.create()
+    assert other.get(job.job_id).status == job.status
+    worker.update(job.job_id, status=STATUS_RUNNING, phase=PHASE_SECTIONS, done=0, total=5)
+    worker.update(job.job_id, status=STATUS_RUNNING, phase=PHASE_SECTIONS, done=3, total=5)
+    # bare progress is throttled, status and phase changes are not
+    assert (other.get(job.job_id).phase, other.get(job.job_id).done) == (PHASE_SECTIONS, 0)
+    worker.finish(job.job_id, "token")
+    assert (other.get(job.job_id).status, other.get(job.job_id).session_token) == (STATUS_DONE, "token")
+
+    assert other.get("../" + job.job_id) is None
+    path = tmp_path / f"{job.job_id}.job"
+    os.utime(path, (now[0] - 120, now[0] - 120))
+    assert other.get(job.job_id) is None
+    assert other.sweep() == 1 and not path.exists()
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from backend.core.uploads import SpooledUpload, UploadError, UploadReceiver, UploadTooLarge
+
+BOUNDARY = "----quarter-labels"
+
+
+def multipart_body(file_bytes: bytes, **fields: str) -> bytes:
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    parts.append(
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="file"; filename="report.xlsx"\r\n'
+        f"Content-Type: application/octet-stream\r\n\r\n".encode()
+        + file_bytes
+        + b"\r\n"
+    )
+    parts.append(f"--{BOUNDARY}--\r\n".encode())
+    return b"".join(parts)
+
+
+def make_request(body: bytes, chunk_size: int, consumed: list) -> Request:
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+
+    async def receive():
+        chunk = chunks[len(consumed)]
+        consumed.append(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": len(consumed) < len(chunks)}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/reports/current/upload",
+        "headers": [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())],
+    }
+    return Request(scope, receive)
+
+
+def test_receiver_streams_file_and_fields():
+    payload = bytes(range(256)) * 40
+    consumed = []
+    receiver = UploadReceiver(max_bytes=len(payload))
+    upload = asyncio.run(
+        receiver.receive(make_request(multipart_body(payload, date_from="2025-09-01"), 1000, consumed))
+    )
+    try:
+        assert upload.filename == "report.xlsx"
+        assert upload.source() == payload
+        assert receiver.fields == {"date_from": "2025-09-01"}
+    finally:
+        upload.close()
+
+
+def test_receiver_aborts_as_soon_as_limit_is_exceeded():
+    consumed = []
+    receiver = UploadReceiver(max_bytes=4096)
+    request = make_request(multipart_body(b"x" * 100_000), 1024, consumed)
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(receiver.receive(request))
+    assert len(consumed) <= 6
+
+
+def test_receiver_rejects_malformed_multipart_body():
+    body = f"--{BOUNDARY}\r\nnot a header line\r\n\r\nxx\r\n--{BOUNDARY}--\r\n".encode()
+    receiver = UploadReceiver()
+    with pytest.raises(UploadError, match="multipart"):
+        asyncio.run(receiver.receive(make_request(body, 1024, [])))
+    assert receiver.upload is None
+
+
+def test_spooled_upload_rolls_over_to_named_file():
+    upload = SpooledUpload("report.xlsx", spool_bytes=10)
+    upload.write(b"12345")
+    assert upload.source() == b"12345"
+    upload.write(b"6789012345")
+    path = upload.source()
+    assert upload.rolled_to_disk
+    with open(path, "rb") as handle:
+        assert handle.read() == b"123456789012345"
+    upload.close()
@@ -0,0 +1,55 @@
+from datetime import date
+
+import pytest
+
+from backend.benchmarks.synthetic import build_report_workbook
+from backend.core.models import CurrentReportOptions
+from backend.core.parsing.quarter_parser import QuarterReportParser
+from backend.core.services import report_builder
+from backend.core.services.report_builder import aggregate_workbook, build_current_report
+from backend.core.services.vector_aggregation import WorkbookFrame, aggregate_periods
+
+PERIODS = [
+    (date(2025, 9, 1), date(2025, 10, 31)),
+    (date(2025, 9, 15), date(2025, 9, 21)),
+    (date(2025, 10, 3), date(2025, 10, 3)),
+    (date(2025, 11, 1), date(2025, 11, 30)),
+]
+
+
+@pytest.fixture(scope="module")
+def workbook():
+    return QuarterReportParser(read_only=True).parse_workbook(build_report_workbook(12, months=2, fill_ratio=0.5))
+
+
+def test_frame_matches_loop_aggregation(workbook):
+    expected = [aggregate_workbook(workbook, date_from, date_to) for date_from, date_to in PERIODS]
+    assert aggregate_periods(workbook, PERIODS) == expected
+
+
+def test_pair_stats_agree_with_labels(workbook):
+    date_from, date_to = PERIODS[0]
+    stats = WorkbookFrame(workbook).pair_stats(date_from, date_to, weak_threshold=3.8)
+    labels, _ = build_current_report(
+        workbook, CurrentReportOptions(date_from=date_from, date_to=date_to, weak_threshold=3.8)
+    )
+    by_pair = {(row.fio, row.subject): row for row in stats.itertuples()}
+    assert len(by_pair) == sum(len(label.subjects) for label in labels)
+    for label in labels:
+        for subject in label.subjects:
+            row = by_pair[(label.fio, subject.name)]
+            assert (row.count, row.sum, row.mean, row.is_weak) == (
+                len(subject.grades),
+                sum(subject.grades),
+                subject.average,
+                subject.is_weak,
+            )
+
+
+def test_numpy_engine_builds_identical_report(workbook, monkeypatch):
+    options = CurrentReportOptions(date_from=PERIODS[0][0], date_to=PERIODS[0][1], subject_sort="avg_desc")
+    expected_labels, expected_preview = build_current_report(workbook, options)
+    monkeypatch.setattr(report_builder, "AGGREGATION_ENGINE", "numpy")
+    labels, preview = build_current_report(workbook, options)
+    assert [label.json() for label in labels] == [label.json() for label in expected_labels]
+    assert preview.json() == expected_preview.json()
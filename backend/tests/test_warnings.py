@@ -0,0 +1,60 @@
+from datetime import date
+
+from backend.benchmarks.synthetic import build_report_workbook
+from backend.core.models import (
+    WARNING_INVALID_GRADE,
+    WARNING_MULTIPLE_TOKENS,
+    CurrentReportOptions,
+    WarningRecord,
+    WarningTable,
+)
+from backend.core.parsing.quarter_parser import QuarterReportParser
+from backend.core.services.report_builder import (
+    WARNING_SAMPLES,
+    build_current_report,
+    build_session_payload,
+    ordered_sections,
+    warning_page,
+)
+from backend.core.session_codec import decode_part, encode_parts
+
+
+def test_warning_table_renders_records_on_access():
+    table = WarningTable("Иванов Иван")
+    table.add(WARNING_INVALID_GRADE, "Алгебра", 7, 3, "0")
+    table.add(WARNING_MULTIPLE_TOKENS, "Алгебра", 7, 3)
+    table.add(WARNING_MULTIPLE_TOKENS, "Физика", 8, 4)
+
+    assert table.record(0) == WarningRecord(WARNING_INVALID_GRADE, "Алгебра", 7, 3, "0")
+    assert table[0] == "[Иванов Иван] Алгебра: invalid_grade 0 (row=7, col=3)"
+    assert table[-1] == "[Иванов Иван] Физика: multiple_tokens_in_cell (row=8, col=4)"
+    assert table.counts() == {WARNING_INVALID_GRADE: 1, WARNING_MULTIPLE_TOKENS: 2}
+    assert table.positions(WARNING_MULTIPLE_TOKENS) == [1, 2]
+    assert WarningTable.from_dict(table.to_dict()) == table
+    assert WarningTable.validate(["legacy message"])[0] == "legacy message"
+
+
+def test_preview_reports_counts_and_capped_samples():
+    workbook = QuarterReportParser().parse_workbook(build_report_workbook(students=4, fill_ratio=0.6))
+    options = CurrentReportOptions(date_from=date(2025, 9, 1), date_to=date(2025, 10, 31))
+    labels, preview = build_current_report(workbook, options)
+
+    sections = ordered_sections(workbook)
+    assert preview.warning_total == sum(len(section.warnings) for section in sections)
+    for position, (student, label, section) in enumerate(zip(preview.students, labels, sections)):
+        assert student.warning_total == len(section.warnings) > WARNING_SAMPLES
+        assert student.warning_counts == section.warnings.counts()
+        assert student.warnings == label.warnings == list(section.warnings)[:WARNING_SAMPLES]
+
+        page = warning_page(workbook, position, WARNING_MULTIPLE_TOKENS, offset=1, limit=2)
+        assert page["total"] == student.warning_counts[WARNING_MULTIPLE_TOKENS]
+        expected = [message for message in section.warnings if "multiple_tokens_in_cell" in message][1:3]
+        assert [item["message"] for item in page["items"]] == expected
+
+    payload = build_session_payload(workbook, options, session_id="")
+    parts = encode_parts(payload)
+    decoded = decode_part("workbook", parts["workbook"])
+    assert [section.warnings.to_dict() for section in decoded.students] == [
+        section.warnings.to_dict() for section in workbook.students
+    ]
+    assert decode_part("preview", parts["preview"]) == payload.preview
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.core.workers import WorkerPool, WorkerPoolSaturated
+
+
+def test_worker_pool_runs_off_loop_and_records_timings():
+    pool = WorkerPool(kind="thread", size=2, queue_depth=0)
+
+    async def scenario():
+        return await pool.run(threading.get_ident)
+
+    try:
+        worker_thread = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+    assert worker_thread != threading.get_ident()
+    snapshot = pool.snapshot()
+    assert snapshot["execution"]["get_ident"]["count"] == 1
+    assert snapshot["queue_wait"]["get_ident"]["count"] == 1
+
+
+def test_worker_pool_rejects_when_saturated():
+    pool = WorkerPool(kind="thread", size=1, queue_depth=1)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(WorkerPoolSaturated) as excinfo:
+            await pool.run(release.wait)
+        release.set()
+        await asyncio.gather(*blocked)
+        return excinfo.value
+
+    try:
+        error = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+    assert error.retry_after >= 1
+    assert pool.snapshot()["rejected"] == 1
+    assert pool.snapshot()["queued"] == 0
+
+
+def test_worker_pool_reports_start_when_a_worker_is_free():
+    pool = WorkerPool(kind="thread", size=1, queue_depth=2)
+    release = threading.Event()
+    started = []
+
+    async def scenario():
+        first = pool.submit(release.wait, on_start=lambda: started.append("first"))
+        second = pool.submit(release.wait, on_start=lambda: started.append("second"))
+        assert started == ["first"]
+        tasks = [asyncio.ensure_future(first), asyncio.ensure_future(second)]
+        await asyncio.sleep(0.05)
+        assert started == ["first"]
+        release.set()
+        await asyncio.gather(*tasks)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+    assert started == ["first", "second"]
+
+
+def test_cancelled_callers_do_not_free_busy_slots():
+    pool = WorkerPool(kind="thread", size=1, queue_depth=1)
+    release = threading.Event()
+    started = []
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.submit(release.wait))
+        queued = asyncio.ensure_future(pool.submit(release.wait, on_start=lambda: started.append("queued")))
+        await asyncio.sleep(0.01)
+        # the client of the queued request goes away: its task never runs
+        queued.cancel()
+        await asyncio.sleep(0.01)
+        assert (pool.pending, pool.snapshot()["queued"]) == (1, 0)
+
+        # the client of the running one goes away too, but the worker stays busy
+        running.cancel()
+        await asyncio.sleep(0.01)
+        assert (pool.pending, pool.snapshot()["in_flight"]) == (1, 1)
+        waiting = asyncio.ensure_future(pool.submit(release.wait, on_start=lambda: started.append("next")))
+        assert pool.snapshot()["queued"] == 1
+        with pytest.raises(WorkerPoolSaturated):
+            pool.submit(release.wait)
+
+        release.set()
+        await waiting
+        return queued.cancelled(), running.cancelled()
+
+    try:
+        cancelled = asyncio.run(scenario())
+    finally:
+        release.set()
+        pool.shutdown()
+    assert cancelled == (True, True)
+    assert started == ["next"]
+    assert pool.pending == 0 and pool.snapshot()["queued"] == 0